@@ -14,7 +14,7 @@ class Ball:
     y : int
         The y-coordinate of the ball's position.
     pos : Vector2
-        The position of the ball as a pygame.Vector2 object.
+        The position of the ball as a pygame.Vector2 object. Created from x and y when it is read.
     vx : int
         The x-component of the ball's velocity.
     vy : int
@@ -34,8 +34,12 @@ class Ball:
     -------
     move(dt: float) -> None
         Moves the ball based on its velocity and speed.
-    check_collision(paddle: Paddle, bricks: list[Brick], balls: list) -> Paddle | Brick | None
-        Checks for collisions with the paddle, bricks, and other balls. Returns the object that was hit.
+    check_collision(paddle: Paddle, bricks: list[Brick]) -> Paddle | Brick | None
+        Checks for collisions with the paddle and bricks. Returns the object that was hit.
+    time_of_impact(dx: float, dy: float, left: float, top: float, right: float, bottom: float) -> tuple[float, str] | None
+        Calculates when the ball's centre, moving by (dx, dy), enters the given box.
+    sweep(dx: float, dy: float, paddle: Paddle, bricks: list[Brick], window_size: int = None) -> tuple[float, Paddle | Brick | None, str] | None
+        Finds the first paddle, brick or window edge hit while the ball moves by (dx, dy).
     bounce(direction: str) -> None
         Bounces the ball in the specified direction.
     handle_edge_bounce(game_manager: GameManager, window_size: int) -> None
@@ -46,10 +50,12 @@ class Ball:
         Begins the ball's movement in the straight upward direction.
     """
 
+    # Balls are created and moved in large numbers, so they are stored without a per-object __dict__
+    __slots__ = ("x", "y", "vx", "vy", "radius", "color", "speed", "is_dead", "death_disabled")
+
     def __init__(self, x: int, y: int, vx: int, vy: int, radius: int, color: str, speed=300):
         self.x = x
         self.y = y
-        self.pos = Vector2(self.x, self.y)
         self.vx = vx   # X-component of the ball's velocity
         self.vy = vy   # Y-component of the ball's velocity
         self.radius = radius
@@ -58,6 +64,14 @@ class Ball:
         self.is_dead = False   # Indicates if the ball is dead, which happens when it is out of bounds.
         self.death_disabled = False   # Indicates if the ball has death disabled (will bounce off the bottom of the screen)
 
+    """
+    The position of the ball as a pygame.Vector2 object.
+    It is only created when it is read, so moving the ball does not allocate a new vector every step.
+    """
+    @property
+    def pos(self) -> Vector2:
+        return Vector2(self.x, self.y)
+
     """
     Moves the ball based on its velocity and speed.
 
@@ -73,18 +87,18 @@ class Ball:
     Raises
     ------
     ValueError
-        If dt is less than 0.
+        If dt is negative.
     """
     def move(self, dt: float) -> None:
         if dt < 0:
-            raise ValueError("dt must be greater than 0")
+            raise ValueError("dt must not be negative")
 
         self.x += self.speed * self.vx * dt
         self.y += self.speed * self.vy * dt
-        self.pos = Vector2(self.x, self.y)
 
     """
-    Checks for collisions with the paddle, bricks, and other balls. Returns the object that was hit.
+    Checks for collisions with the paddle and bricks. Returns the object that was hit.
+    Collisions with other balls are handled by BallCollider.
 
     Parameters
     ----------
@@ -92,21 +106,19 @@ class Ball:
         The paddle object to check for collision with.
     bricks : list[Brick]
         The list of brick objects to check for collision with.
-    balls : list[Ball]
-        The list of ball objects to check for collision with.
     
     Returns
     -------
-    Paddle | Brick | Ball | None
+    Paddle | Brick | None
         Returns the paddle if a collision with it is detected, the brick if a collision with it is detected,
-        the ball if a collision with it is detected, or None if no collision is detected.
+        or None if no collision is detected.
         In other words, the object that was hit is returned.
 
     Raises
     ------
     None
     """
-    def check_collision(self, paddle: Paddle, bricks: list[Brick], balls: list) -> Paddle | Brick | None:
+    def check_collision(self, paddle: Paddle, bricks: list[Brick]) -> Paddle | Brick | None:
         # If the ball collides with the paddle, return the paddle object
         if (self.x + self.radius >= paddle.x and self.x - self.radius <= paddle.x + paddle.width and
                 self.y + self.radius >= paddle.y and self.y - self.radius <= paddle.y + paddle.height):
@@ -118,16 +130,142 @@ class Ball:
                     self.y + self.radius >= brick.y and self.y - self.radius <= brick.y + brick.height):
                 return brick
         
-        # If the ball collides with another ball, return the ball object
-        # NOTE: Currently not being used. Ball to ball collisions are not implemented.
-        for ball in balls:
-            if ball != self and (self.x + self.radius >= ball.x - ball.radius and self.x - self.radius <= ball.x + ball.radius and
-                    self.y + self.radius >= ball.y - ball.radius and self.y - self.radius <= ball.y + ball.radius):
-                return ball
-        
         # If no collision is found, return None.
         return None
     
+    """
+    Calculates when the ball's centre, moving by (dx, dy) from its current position, enters the given box.
+    The box should be the object's bounding box expanded by the ball's radius,
+    so that entering it is the same as the ball's bounding box touching the object.
+
+    Parameters
+    ----------
+    dx : float
+        The distance the ball moves along the x-axis.
+    dy : float
+        The distance the ball moves along the y-axis.
+    left : float
+        The left edge of the box.
+    top : float
+        The top edge of the box.
+    right : float
+        The right edge of the box.
+    bottom : float
+        The bottom edge of the box.
+
+    Returns
+    -------
+    tuple[float, str] | None
+        The fraction of the movement (between 0 and 1) at which the ball enters the box, and the bounce direction given by the contact normal ("x", "y" or "xy" for an exact corner hit).
+        None if the ball does not enter the box during the movement, or is already inside it.
+
+    Raises
+    ------
+    None
+    """
+    def time_of_impact(self, dx: float, dy: float, left: float, top: float, right: float, bottom: float) -> tuple[float, str] | None:
+        # Find the interval of the movement during which the ball is between the left and right edges of the box
+        if dx == 0:
+            if not left <= self.x <= right:
+                return None
+            x_entry, x_exit = -math.inf, math.inf
+        else:
+            x_entry, x_exit = sorted(((left - self.x) / dx, (right - self.x) / dx))
+
+        # Find the interval of the movement during which the ball is between the top and bottom edges of the box
+        if dy == 0:
+            if not top <= self.y <= bottom:
+                return None
+            y_entry, y_exit = -math.inf, math.inf
+        else:
+            y_entry, y_exit = sorted(((top - self.y) / dy, (bottom - self.y) / dy))
+
+        # The ball is inside the box when it is inside both intervals
+        entry = max(x_entry, y_entry)
+        exit = min(x_exit, y_exit)
+
+        # Ignore boxes that are not reached during this movement, and boxes the ball is already inside (it is moving out of them)
+        if entry > exit or entry < 0 or entry > 1:
+            return None
+
+        # The last axis to be entered is the side that was hit
+        if x_entry > y_entry:
+            return entry, "x"
+        elif y_entry > x_entry:
+            return entry, "y"
+        return entry, "xy"
+
+    """
+    Finds the first paddle, brick or window edge hit while the ball moves by (dx, dy).
+    The edges are the same as in handle_edge_bounce: the left, right and top edges, and the bottom edge if the ball's death is disabled.
+    A ball that is already past an edge and moving further out hits it at once.
+
+    Parameters
+    ----------
+    dx : float
+        The distance the ball moves along the x-axis.
+    dy : float
+        The distance the ball moves along the y-axis.
+    paddle : Paddle
+        The paddle object to check for collision with.
+    bricks : list[Brick]
+        The list of brick objects to check for collision with.
+    window_size : int, optional
+        The size of the window whose edges the ball can hit (default is None, the edges are not checked).
+
+    Returns
+    -------
+    tuple[float, Paddle | Brick | None, str] | None
+        The fraction of the movement at which the first hit happens, the object that was hit (None for a window edge),
+        and the bounce direction.
+        None if nothing is hit during the movement.
+
+    Raises
+    ------
+    None
+    """
+    def sweep(self, dx: float, dy: float, paddle: Paddle, bricks: list[Brick], window_size: int = None) -> tuple[float, Paddle | Brick | None, str] | None:
+        first_hit = None
+
+        for obj in [paddle, *bricks]:
+            hit = self.time_of_impact(dx, dy, obj.x - self.radius, obj.y - self.radius,
+                                      obj.x + obj.width + self.radius, obj.y + obj.height + self.radius)
+
+            # Keep the earliest hit
+            if hit is not None and (first_hit is None or hit[0] < first_hit[0]):
+                first_hit = (hit[0], obj, hit[1])
+
+        if window_size is None:
+            return first_hit
+
+        # The ball's centre reaches an edge when it is one radius away from it
+        x_time = None
+        if dx < 0:
+            x_time = max((self.radius - self.x) / dx, 0)
+        elif dx > 0:
+            x_time = max((window_size - self.radius - self.x) / dx, 0)
+
+        y_time = None
+        if dy < 0:
+            y_time = max((self.radius - self.y) / dy, 0)
+        elif dy > 0 and self.death_disabled:
+            y_time = max((window_size - self.radius - self.y) / dy, 0)
+
+        # Keep the earliest edge that is reached during the movement. Both edges are hit at once in a corner.
+        edge_hit = None
+        if x_time is not None and x_time <= 1:
+            edge_hit = (x_time, None, "x")
+        if y_time is not None and y_time <= 1:
+            if edge_hit is None or y_time < x_time:
+                edge_hit = (y_time, None, "y")
+            elif y_time == x_time:
+                edge_hit = (x_time, None, "xy")
+
+        if edge_hit is not None and (first_hit is None or edge_hit[0] < first_hit[0]):
+            first_hit = edge_hit
+
+        return first_hit
+
     """
     Bounces the ball in the specified direction.
 
@@ -0,0 +1,409 @@
+import numpy as np
+from Ball import Ball
+
+"""
+Bounces every ball in the given arrays off the edges of the window, in place.
+This is the vectorized version of Ball.handle_edge_bounce and gives the same result for each ball.
+
+Parameters
+----------
+x, y : np.ndarray
+    The positions of the balls.
+vx, vy : np.ndarray
+    The velocity directions of the balls.
+radius : np.ndarray
+    The radii of the balls.
+death_disabled : np.ndarray
+    Flags for the balls that bounce off the bottom edge instead of dying.
+window_size : int
+    The size of the window to check for edge collisions.
+
+Returns
+-------
+wall_hits, dead : tuple[np.ndarray, np.ndarray]
+    Masks of the balls that bounced off a wall, and of the balls that escaped through the bottom edge.
+
+Raises
+------
+None
+"""
+def edge_bounce(x, y, vx, vy, radius, death_disabled, window_size: int) -> tuple[np.ndarray, np.ndarray]:
+    # Define ball edge coordinates
+    left_edge = x - radius
+    right_edge = x + radius
+    top_edge = y - radius
+    bottom_edge = y + radius
+
+    # Each ball only takes the first matching case, in the same order as Ball.handle_edge_bounce
+    top_left = (left_edge <= 0) & (top_edge <= 0)
+    top_right = ~top_left & (right_edge >= window_size) & (top_edge <= 0)
+    remaining = ~(top_left | top_right)
+    left = remaining & (left_edge <= 0)
+    remaining &= ~left
+    right = remaining & (right_edge >= window_size)
+    remaining &= ~right
+    top = remaining & (top_edge <= 0)
+    remaining &= ~top
+    bottom = remaining & (bottom_edge >= window_size) & death_disabled
+    remaining &= ~bottom
+    dead = remaining & (top_edge >= window_size) & ~death_disabled
+
+    # Bounce the balls and move them back to the edge they hit
+    flip_x = top_left | top_right | left | right
+    flip_y = top_left | top_right | top | bottom
+    vx[flip_x] = -vx[flip_x]
+    vy[flip_y] = -vy[flip_y]
+
+    to_left = top_left | left
+    to_right = top_right | right
+    x[to_left] = radius[to_left]
+    x[to_right] = window_size - radius[to_right]
+
+    to_top = top_left | top_right | top
+    y[to_top] = radius[to_top]
+    y[bottom] = window_size - radius[bottom]
+
+    # Move balls that have escaped the screen back to the center
+    escaped = (bottom_edge < 0) | (right_edge < 0) | (left_edge > window_size)
+    x[escaped] = window_size / 2
+    y[escaped] = window_size / 2
+
+    return flip_x | flip_y, dead
+
+
+def batch_property(name: str, cast):
+    # Attribute of a BallView that reads and writes its slot in the batch arrays
+    def get(view):
+        return cast(getattr(view.batch, name)[view.index])
+
+    def set(view, value):
+        getattr(view.batch, name)[view.index] = value
+
+    return property(get, set)
+
+
+class BallView(Ball):
+    """
+    Ball-compatible view of one ball stored in a BallBatch.
+    Reading or writing an attribute reads or writes the ball's slot in the batch arrays,
+    so the renderer, modifiers and the scalar collision code can use it like a normal Ball.
+
+    Attributes
+    ----------
+    batch : BallBatch
+        The batch the ball is stored in.
+    index : int
+        The ball's slot in the batch arrays.
+    """
+
+    x = batch_property("x", float)
+    y = batch_property("y", float)
+    vx = batch_property("vx", float)
+    vy = batch_property("vy", float)
+    speed = batch_property("speed", float)
+    radius = batch_property("radius", float)
+    is_dead = batch_property("is_dead", bool)
+    death_disabled = batch_property("death_disabled", bool)
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch, index: int):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def color(self):
+        return self.batch.colors[self.index]
+
+    @color.setter
+    def color(self, value):
+        self.batch.colors[self.index] = value
+
+    def move(self, dt: float) -> None:
+        if dt < 0:
+            raise ValueError("dt must not be negative")
+
+        i = self.index
+        self.batch.x[i] += self.batch.speed[i] * self.batch.vx[i] * dt
+        self.batch.y[i] += self.batch.speed[i] * self.batch.vy[i] * dt
+
+
+class BallBatch:
+    """
+    Structure-of-arrays storage for the balls in the game.
+    Positions, velocities, speeds, radii and flags are kept in NumPy arrays so that moving, edge bouncing,
+    removing dead balls and capping the speed can be done for every ball at once.
+
+    The batch behaves like the list of balls it replaces: it can be iterated, indexed, appended to and removed from.
+    The items are BallView objects, which can be used anywhere a Ball is expected.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        The positions of the balls.
+    vx, vy : np.ndarray
+        The velocity directions of the balls.
+    speed : np.ndarray
+        The speeds of the balls.
+    radius : np.ndarray
+        The radii of the balls.
+    is_dead : np.ndarray
+        Flags for the balls that have fallen off the screen.
+    death_disabled : np.ndarray
+        Flags for the balls that bounce off the bottom of the screen.
+    colors : list[str]
+        The colors of the balls.
+    views : list[BallView]
+        The views of the balls, in order.
+
+    Methods
+    -------
+    append(ball: Ball) -> None
+        Adds a ball to the end of the batch.
+    remove(ball: BallView) -> None
+        Removes a ball from the batch.
+    move(dt: float) -> None
+        Moves every ball based on its velocity and speed.
+    handle_edge_bounce(game_manager: GameManager, window_size: int) -> None
+        Bounces every ball off the edges of the window.
+    remove_dead() -> int
+        Removes every dead ball from the batch.
+    cap_speed(max_speed: float) -> None
+        Limits the speed of every ball.
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "speed", "radius", "is_dead", "death_disabled")
+
+    def __init__(self, balls=(), capacity: int = 8):
+        self.count = 0
+        self.colors = []
+        self.views = []
+
+        # Allocate the arrays
+        for name in self.FIELDS:
+            dtype = bool if name in ("is_dead", "death_disabled") else float
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+        for ball in balls:
+            self.append(ball)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __contains__(self, ball):
+        return ball in self.views
+
+    def __repr__(self):
+        return f'BallBatch({self.count} balls)'
+
+    """
+    Adds a ball to the end of the batch. The arrays double in size when they are full.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball to add. Its values are copied into the batch.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def append(self, ball: Ball) -> None:
+        # Grow the arrays if they are full
+        if self.count == len(self.x):
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                grown = np.zeros(len(array) * 2, dtype=array.dtype)
+                grown[:self.count] = array[:self.count]
+                setattr(self, name, grown)
+
+        # Copy the ball's values into the next free slot
+        for name in self.FIELDS:
+            getattr(self, name)[self.count] = getattr(ball, name)
+        self.colors.append(ball.color)
+
+        self.views.append(BallView(self, self.count))
+        self.count += 1
+
+    """
+    Removes a ball from the batch. The order of the remaining balls is kept.
+    The removed view is moved to its own batch, so it still holds its values.
+
+    Parameters
+    ----------
+    ball : BallView
+        The ball to remove.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the ball is not in the batch.
+    """
+    def remove(self, ball: BallView) -> None:
+        if ball not in self.views:
+            raise ValueError("ball is not in the batch")
+
+        keep = np.ones(self.count, dtype=bool)
+        keep[ball.index] = False
+        self.compact(keep)
+
+    """
+    Removes every dead ball from the batch.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    removed : int
+        The number of balls that were removed.
+
+    Raises
+    ------
+    None
+    """
+    def remove_dead(self) -> int:
+        dead = self.is_dead[:self.count]
+        removed = int(np.count_nonzero(dead))
+
+        if removed > 0:
+            self.compact(~dead)
+
+        return removed
+
+    """
+    Keeps only the balls selected by a mask, moving them to the front of the arrays in their current order.
+
+    Parameters
+    ----------
+    keep : np.ndarray
+        Mask of the balls to keep.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def compact(self, keep: np.ndarray) -> None:
+        kept = int(np.count_nonzero(keep))
+
+        # Detach the views of the removed balls, so they keep their values
+        for view, keep_ball in zip(self.views, keep):
+            if not keep_ball:
+                detached = BallBatch([view], capacity=1)
+                view.batch, view.index = detached, 0
+
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+
+        self.colors = [color for color, keep_ball in zip(self.colors, keep) if keep_ball]
+        self.views = [view for view in self.views if view.batch is self]
+        self.count = kept
+
+        # Point the remaining views at their new slots
+        for index, view in enumerate(self.views):
+            view.index = index
+
+    """
+    Moves every ball based on its velocity and speed.
+
+    Parameters
+    ----------
+    dt : float
+        The time delta to move the balls in relation to.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If dt is negative.
+    """
+    def move(self, dt: float) -> None:
+        if dt < 0:
+            raise ValueError("dt must not be negative")
+
+        n = self.count
+        self.x[:n] += self.speed[:n] * self.vx[:n] * dt
+        self.y[:n] += self.speed[:n] * self.vy[:n] * dt
+
+    """
+    Bounces every ball that is not dead off the edges of the window, and marks the balls that escaped through the bottom as dead.
+    The wall hit sound is played once for each ball that bounced.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The GameManager object that manages the game state and objects.
+    window_size : int
+        The size of the window to check for edge collisions.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If window_size is less than or equal to 0.
+    TypeError
+        If window_size is not an integer.
+    """
+    def handle_edge_bounce(self, game_manager, window_size: int) -> None:
+        if window_size <= 0:
+            raise ValueError("window_size must be greater than 0")
+        if not type(window_size) == int:
+            raise TypeError("window_size must be an integer")
+
+        n = self.count
+        alive = ~self.is_dead[:n]
+
+        # Boolean indexing makes copies, so bounce the alive balls and write the results back
+        x, y, vx, vy = self.x[:n][alive], self.y[:n][alive], self.vx[:n][alive], self.vy[:n][alive]
+        wall_hits, dead = edge_bounce(x, y, vx, vy, self.radius[:n][alive], self.death_disabled[:n][alive], window_size)
+
+        self.x[:n][alive], self.y[:n][alive], self.vx[:n][alive], self.vy[:n][alive] = x, y, vx, vy
+        self.is_dead[:n][alive] = dead
+
+        for _ in range(int(np.count_nonzero(wall_hits))):
+            game_manager.sound_manager.play_wall_hit_sound()
+
+    """
+    Limits the speed of every ball.
+
+    Parameters
+    ----------
+    max_speed : float
+        The highest speed a ball can have.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def cap_speed(self, max_speed: float) -> None:
+        np.minimum(self.speed[:self.count], max_speed, out=self.speed[:self.count])
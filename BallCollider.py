@@ -0,0 +1,167 @@
+import math
+
+class BallCollider:
+    """
+    Handles collisions between balls.
+    A sort-and-sweep broadphase sorts the balls by their left edge and only pairs up balls whose x-extents overlap,
+    so a screen full of balls does not need a check for every pair. The remaining pairs are checked as circles
+    and bounced off each other.
+
+    A bounce only changes the directions of the balls, not their speeds, so every ball keeps the speed the level and the modifiers gave it.
+
+    Attributes
+    ----------
+    pairs_tested : int
+        The number of pairs checked as circles in the last update, i.e. the pairs that passed the broadphase.
+    pairs_resolved : int
+        The number of pairs that collided and were bounced in the last update.
+    total_pairs_tested : int
+        The number of pairs checked as circles since the collider was created.
+    total_pairs_resolved : int
+        The number of pairs bounced since the collider was created.
+
+    Methods
+    -------
+    find_pairs(balls: list[Ball]) -> list[tuple[Ball, Ball]]
+        Finds the pairs of balls whose bounding boxes overlap.
+    resolve(ball: Ball, other: Ball) -> bool
+        Bounces two balls off each other if they are colliding.
+    handle_collisions(balls: list[Ball]) -> None
+        Finds and resolves all collisions between the balls.
+    """
+
+    def __init__(self):
+        self.pairs_tested = 0
+        self.pairs_resolved = 0
+        self.total_pairs_tested = 0
+        self.total_pairs_resolved = 0
+
+    """
+    Finds the pairs of balls whose bounding boxes overlap, using sort and sweep along the x-axis.
+
+    Parameters
+    ----------
+    balls : list[Ball]
+        The balls to check.
+
+    Returns
+    -------
+    pairs : list[tuple[Ball, Ball]]
+        The pairs of balls whose bounding boxes overlap.
+
+    Raises
+    ------
+    None
+    """
+    def find_pairs(self, balls) -> list:
+        pairs = []
+        active = []   # Balls whose x-extent can still overlap the next ball in the sweep
+
+        for ball in sorted(balls, key=lambda ball: ball.x - ball.radius):
+            left = ball.x - ball.radius
+
+            # Balls that end before this one starts cannot overlap it, or any ball after it
+            active = [other for other in active if other.x + other.radius >= left]
+
+            for other in active:
+                # The x-extents overlap, check the y-extents
+                if abs(ball.y - other.y) <= ball.radius + other.radius:
+                    pairs.append((other, ball))
+
+            active.append(ball)
+
+        return pairs
+
+    """
+    Bounces two balls off each other if they are colliding and moving towards each other.
+    A ball that is moving towards the other ball has its direction mirrored along the line between their centres,
+    the same way a ball bounces off a wall, and keeps its speed.
+    Overlapping balls are also pushed apart so they do not stay stuck together.
+
+    Parameters
+    ----------
+    ball : Ball
+        The first ball.
+    other : Ball
+        The second ball.
+
+    Returns
+    -------
+    bool
+        True if the balls collided, False otherwise.
+
+    Raises
+    ------
+    None
+    """
+    def resolve(self, ball, other) -> bool:
+        dx = other.x - ball.x
+        dy = other.y - ball.y
+        distance = math.hypot(dx, dy)
+        min_distance = ball.radius + other.radius
+
+        # Balls at the same position (e.g. just spawned) have no collision normal
+        if distance >= min_distance or distance == 0:
+            return False
+
+        # Unit normal from the first ball to the second
+        nx = dx / distance
+        ny = dy / distance
+
+        # Push the balls apart along the normal
+        overlap = (min_distance - distance) / 2
+        ball.x -= nx * overlap
+        ball.y -= ny * overlap
+        other.x += nx * overlap
+        other.y += ny * overlap
+
+        # Velocities of the balls (the velocity components are directions, scaled by speed)
+        ball_vx, ball_vy = ball.vx * ball.speed, ball.vy * ball.speed
+        other_vx, other_vy = other.vx * other.speed, other.vy * other.speed
+
+        # Only bounce balls that are moving towards each other
+        approach = (ball_vx - other_vx) * nx + (ball_vy - other_vy) * ny
+        if approach <= 0:
+            return False
+
+        # Mirror the direction of each ball that moves towards the other one. The normal points from the first ball to the second.
+        ball_normal = ball.vx * nx + ball.vy * ny
+        if ball_normal > 0:
+            ball.vx -= 2 * ball_normal * nx
+            ball.vy -= 2 * ball_normal * ny
+
+        other_normal = other.vx * nx + other.vy * ny
+        if other_normal < 0:
+            other.vx -= 2 * other_normal * nx
+            other.vy -= 2 * other_normal * ny
+
+        return True
+
+    """
+    Finds and resolves all collisions between the balls, and updates the counters.
+
+    Parameters
+    ----------
+    balls : list[Ball]
+        The balls in the game.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def handle_collisions(self, balls) -> None:
+        self.pairs_tested = 0
+        self.pairs_resolved = 0
+
+        for ball, other in self.find_pairs(balls):
+            self.pairs_tested += 1
+
+            if self.resolve(ball, other):
+                self.pairs_resolved += 1
+
+        self.total_pairs_tested += self.pairs_tested
+        self.total_pairs_resolved += self.pairs_resolved
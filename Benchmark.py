@@ -0,0 +1,376 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from Controller import Autopilot
+from Profiling import create_headless_game
+
+# The number of Extravaganza modifiers activated in the extravaganza scenario. Each one adds 5 balls to the first ball.
+EXTRAVAGANZA_COUNT = 10
+
+# The level of the high durability scenario. The durability of the bricks is LevelManager.hit_multiplier, which is the level.
+HIGH_LEVEL = 10
+
+# The number of steps between Extra Brick Row modifiers in the extra rows scenario
+ROW_INTERVAL = 120
+
+# The metrics of a scenario, and whether a higher value is better. Used to find regressions.
+METRICS = {
+    "steps_per_second": True,
+    "p50_us": False,
+    "p99_us": False,
+    "alloc_bytes_per_step": False,
+}
+
+"""
+Sets up the level 1 scenario: the full wall of level 1 and one ball.
+
+Parameters
+----------
+seed : int
+    Seed for the random number generator.
+ball_backend : str
+    How the balls are stored, "objects" or "batch".
+
+Returns
+-------
+GameManager
+    The started game.
+
+Raises
+------
+None
+"""
+def setup_level_1(seed: int, ball_backend: str):
+    return create_headless_game(seed, ball_backend)
+
+"""
+Sets up the extravaganza scenario: several Extravaganza modifiers are activated at once, so there are over 50 balls
+that cannot die, all at the maximum speed.
+The modifiers last longer than any run, so the balls keep their speed.
+
+Parameters
+----------
+seed : int
+    Seed for the random number generator.
+ball_backend : str
+    How the balls are stored, "objects" or "batch".
+
+Returns
+-------
+GameManager
+    The started game.
+
+Raises
+------
+None
+"""
+def setup_extravaganza(seed: int, ball_backend: str):
+    game_manager = create_headless_game(seed, ball_backend)
+    prototype = next(modifier for modifier in game_manager.modifiers if modifier.name == "Extravaganza")
+
+    for _ in range(EXTRAVAGANZA_COUNT):
+        # Modifiers are activated from the dropped modifiers list, as if the paddle caught them
+        modifier = game_manager.modifier_factory.create(prototype)
+        modifier.x = game_manager.WINDOW_SIZE / 2
+        modifier.y = game_manager.WINDOW_SIZE / 2
+        modifier.time_remaining = 3600
+        game_manager.dropped_modifiers.append(modifier)
+        modifier.activate(game_manager)
+
+    # The speed is capped at the end of the first update, the same as in the game
+    for ball in game_manager.balls:
+        ball.speed = min(ball.speed, game_manager.MAX_BALL_SPEED)
+
+    return game_manager
+
+"""
+Sets up the high durability scenario: the full wall of a high level, where every brick takes
+LevelManager.hit_multiplier hits to destroy, and the ball is as fast as the level makes it.
+
+Parameters
+----------
+seed : int
+    Seed for the random number generator.
+ball_backend : str
+    How the balls are stored, "objects" or "batch".
+
+Returns
+-------
+GameManager
+    The started game.
+
+Raises
+------
+None
+"""
+def setup_high_level(seed: int, ball_backend: str):
+    game_manager = create_headless_game(seed, ball_backend)
+    for _ in range(HIGH_LEVEL - 1):
+        game_manager.level_manager.increase_level()
+
+    # Start the level again, with bricks and a ball for the new level
+    game_manager.reset(new_level=True)
+    game_manager.balls[0].begin()
+    game_manager.game_started = True
+
+    return game_manager
+
+"""
+Drops an Extra Brick Row modifier onto the paddle every ROW_INTERVAL steps, so it is caught and pushes a row
+during the next update. Used by the extra rows scenario.
+
+Parameters
+----------
+game_manager : GameManager
+    The game.
+step : int
+    The number of steps since the scenario was set up.
+
+Returns
+-------
+None
+
+Raises
+------
+None
+"""
+def drop_brick_row(game_manager, step: int) -> None:
+    if step % ROW_INTERVAL != 0:
+        return
+
+    paddle = game_manager.paddle
+    prototype = next(modifier for modifier in game_manager.modifiers if modifier.name == "Extra Brick Row")
+    modifier = game_manager.modifier_factory.create(prototype)
+    modifier.x = paddle.x + paddle.width / 2
+    modifier.y = paddle.y
+    game_manager.dropped_modifiers.append(modifier)
+
+# The scenarios, by name: the function that sets up the game, and a function that changes the game before each step, or None
+SCENARIOS = {
+    "level_1": (setup_level_1, None),
+    "extravaganza": (setup_extravaganza, None),
+    "high_level": (setup_high_level, None),
+    "extra_rows": (setup_level_1, drop_brick_row),
+}
+
+"""
+Plays a scenario with the autopilot and calls a function around every update.
+The autopilot's input is applied before the update and is not measured. If the game is lost or the level is won,
+the scenario is set up again, so every update is an update of the scenario, e.g. the extravaganza scenario always has its balls.
+The game is played the same way every time for the same seed.
+
+Parameters
+----------
+name : str
+    The name of the scenario.
+steps : int
+    The number of updates to measure.
+warmup : int
+    The number of updates before the measured updates.
+seed : int
+    Seed for the random number generator.
+ball_backend : str
+    How the balls are stored, "objects" or "batch".
+measure : Callable[[Callable[[], None]], None]
+    Function that is given the update of each measured step, and calls it.
+
+Returns
+-------
+None
+
+Raises
+------
+None
+"""
+def play_scenario(name: str, steps: int, warmup: int, seed: int, ball_backend: str, measure) -> None:
+    setup, before_step = SCENARIOS[name]
+    game_manager = setup(seed, ball_backend)
+    level = game_manager.level_manager.current_level
+    autopilot = Autopilot()
+    step = 0
+
+    for i in range(warmup + steps):
+        if game_manager.lost_game or game_manager.level_manager.current_level != level:
+            game_manager = setup(seed, ball_backend)
+            autopilot = Autopilot()
+            step = 0
+
+        if before_step is not None:
+            before_step(game_manager, step)
+        game_manager.apply_input(autopilot.get_input(game_manager))
+        step += 1
+
+        if i < warmup:
+            game_manager.update()
+        else:
+            measure(game_manager.update)
+
+"""
+Runs a scenario and measures its updates: how many updates run per second, the median and 99th percentile time of an update,
+and the memory allocated per update.
+The memory is measured in a second run of the same steps, since tracing allocations slows down every update.
+
+Parameters
+----------
+name : str
+    The name of the scenario.
+steps : int, optional
+    The number of updates to measure (default is 2000).
+warmup : int, optional
+    The number of updates before the measured updates (default is 240).
+seed : int, optional
+    Seed for the random number generator (default is 1).
+ball_backend : str, optional
+    How the balls are stored, "objects" or "batch" (default is "objects").
+
+Returns
+-------
+dict[str, float]
+    "steps_per_second": the number of updates per second,
+    "p50_us": the median time of an update in microseconds,
+    "p99_us": the 99th percentile time of an update in microseconds,
+    "alloc_bytes_per_step": the average peak of memory allocated during an update, the same as Profiling.update_allocations.
+
+Raises
+------
+ValueError
+    If the scenario does not exist, or steps is less than 2.
+"""
+def run_scenario(name: str, steps: int = 2000, warmup: int = 240, seed: int = 1, ball_backend: str = "objects") -> dict:
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {name}")
+    if steps < 2:
+        raise ValueError("steps must be at least 2")
+
+    times = []
+
+    def time_update(update) -> None:
+        start = time.perf_counter_ns()
+        update()
+        times.append(time.perf_counter_ns() - start)
+
+    play_scenario(name, steps, warmup, seed, ball_backend, time_update)
+
+    peak_total = 0
+
+    def trace_update(update) -> None:
+        nonlocal peak_total
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        update()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+
+    tracemalloc.start()
+    play_scenario(name, steps, warmup, seed, ball_backend, trace_update)
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(times, n=100)
+
+    return {
+        "steps_per_second": steps / (sum(times) / 1e9),
+        "p50_us": percentiles[49] / 1000,
+        "p99_us": percentiles[98] / 1000,
+        "alloc_bytes_per_step": peak_total / steps,
+    }
+
+"""
+Compares the results of a run with a baseline, and returns the metrics that got worse by more than the threshold.
+Scenarios that are not in both are skipped.
+
+Parameters
+----------
+results : dict[str, dict[str, float]]
+    The metrics of each scenario in this run.
+baseline : dict[str, dict[str, float]]
+    The metrics of each scenario in the baseline.
+threshold : float
+    How much worse a metric can get before it is a regression, as a fraction of the baseline, e.g. 0.1 for 10%.
+
+Returns
+-------
+list[tuple[str, str, float, float]]
+    The scenario, metric, baseline value and new value of each regression.
+
+Raises
+------
+None
+"""
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            old = baseline[name].get(metric)
+            new = metrics[metric]
+            if old is None:
+                continue
+
+            if higher_is_better:
+                worse = new < old * (1 - threshold)
+            else:
+                # A metric that was 0, such as the allocations, regresses as soon as it is above 0
+                worse = new > old * (1 + threshold)
+
+            if worse:
+                regressions.append((name, metric, old, new))
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times headless GameManager.update in fixed scenarios.")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"Scenarios to run: {', '.join(SCENARIOS)} (default is all)")
+    parser.add_argument("--steps", type=int, default=2000, help="Number of measured updates per scenario (default is 2000)")
+    parser.add_argument("--warmup", type=int, default=240, help="Number of updates before the measured updates (default is 240)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the games (default is 1)")
+    parser.add_argument("--ball-backend", choices=("objects", "batch"), default="objects", help="How the balls are stored (default is objects)")
+    parser.add_argument("--save", metavar="FILE", help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the results with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression threshold, as a fraction of the baseline (default is 0.1)")
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+
+    results = {}
+    print(f"{'scenario':14}{'steps/s':>10}{'p50 (us)':>10}{'p99 (us)':>10}{'alloc (B)':>11}")
+    for name in args.scenarios:
+        metrics = run_scenario(name, args.steps, args.warmup, args.seed, args.ball_backend)
+        results[name] = metrics
+        print(f"{name:14}{metrics['steps_per_second']:10.0f}{metrics['p50_us']:10.1f}{metrics['p99_us']:10.1f}"
+              f"{metrics['alloc_bytes_per_step']:11.1f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({
+                "steps": args.steps,
+                "warmup": args.warmup,
+                "seed": args.seed,
+                "ball_backend": args.ball_backend,
+                "python": platform.python_version(),
+                "scenarios": results,
+            }, file, indent=4)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+        if (baseline["steps"], baseline["seed"], baseline["ball_backend"]) != (args.steps, args.seed, args.ball_backend):
+            print("Warning: the baseline was run with different steps, seed or ball backend")
+
+        regressions = find_regressions(results, baseline["scenarios"], args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.1f} -> {new:.1f}")
+
+        if len(regressions) > 0:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
@@ -1,14 +1,35 @@
 class Brick:
 
+    # A level has hundreds of bricks, so they are stored without a per-object __dict__
+    __slots__ = ("x", "grid", "row", "offset_y", "width", "height", "color", "durability", "hits")
+
     def __init__(self, x, y, color, width=437/22, height=7, durability=1):
         self.x = x
-        self.y = y
+        self.grid = None   # The BrickGrid the brick is stored in, if any
+        self.row = None   # The brick's row id in the grid. The grid turns it into a y-coordinate.
+        self.offset_y = y   # The y-coordinate, or the offset from the top of its row when the brick is in a grid
         self.width = width
         self.height = height
         self.color = color
         self.durability = durability
         self.hits = 0
 
+    @property
+    def y(self):
+        if self.grid is None:
+            return self.offset_y
+        return self.grid.row_y(self.row) + self.offset_y
+
+    @y.setter
+    def y(self, value):
+        # Moving a brick that is in a grid moves it to the cell at its new position
+        grid = self.grid
+        if grid is not None:
+            grid.remove(self)
+        self.offset_y = value
+        if grid is not None:
+            grid.append(self)
+
     def __str__(self):
         return "Brick at x: " + str(self.x) + " y: " + str(self.y)
     
@@ -17,6 +38,9 @@ class Brick:
     
     def damage(self):
         self.hits += 1
+        # The brick is drawn with less alpha, so its cell has to be redrawn
+        if self.grid is not None:
+            self.grid.mark_dirty(self)
 
     def is_destroyed(self):
         return self.hits >= self.durability
\ No newline at end of file
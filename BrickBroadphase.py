@@ -0,0 +1,116 @@
+import numpy as np
+from BallBatch import BallBatch
+
+class BrickBroadphase:
+    """
+    Batch collision kernel that finds every ball-paddle and ball-brick overlap in one NumPy pass.
+    The brick bounding boxes are kept in contiguous arrays, in the same order as BrickGrid.query returns the bricks,
+    so the first overlapping brick of a ball is the same brick Ball.check_collision would return.
+
+    Attributes
+    ----------
+    bricks : list[Brick]
+        The bricks in the arrays, in array order.
+    left, top, right, bottom : np.ndarray
+        The edges of the brick bounding boxes.
+    grid : BrickGrid | None
+        The BrickGrid the arrays were built from.
+    version : int | None
+        The version of the grid the arrays were built from.
+
+    Methods
+    -------
+    sync(brick_grid: BrickGrid) -> None
+        Rebuilds the arrays if the bricks in the grid have changed since they were built.
+    contacts(balls: list[Ball] | BallBatch, paddle: Paddle) -> tuple[np.ndarray, np.ndarray]
+        Finds the object each ball collides with.
+    """
+
+    def __init__(self):
+        self.bricks = []
+        self.left = self.top = self.right = self.bottom = np.zeros(0)
+        self.grid = None
+        self.version = None
+
+    """
+    Rebuilds the arrays if the bricks in the grid have changed (added, removed or moved) since they were built.
+
+    Parameters
+    ----------
+    brick_grid : BrickGrid
+        The grid holding the bricks in the game.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def sync(self, brick_grid) -> None:
+        if brick_grid is self.grid and brick_grid.version == self.version:
+            return
+
+        self.bricks = brick_grid.bricks()
+        self.left = np.array([brick.x for brick in self.bricks], dtype=float)
+        self.top = np.array([brick.y for brick in self.bricks], dtype=float)
+        self.right = self.left + np.array([brick.width for brick in self.bricks], dtype=float)
+        self.bottom = self.top + np.array([brick.height for brick in self.bricks], dtype=float)
+
+        self.grid = brick_grid
+        self.version = brick_grid.version
+
+    """
+    Finds the object each ball collides with, using the same rules as Ball.check_collision:
+    the paddle takes priority, otherwise the first overlapping brick is used.
+
+    Parameters
+    ----------
+    balls : list[Ball] | BallBatch
+        The balls to check. The arrays of a BallBatch are used directly.
+    paddle : Paddle
+        The paddle object to check for collision with.
+
+    Returns
+    -------
+    ball_indices, targets : tuple[np.ndarray, np.ndarray]
+        The indices of the balls that collide with something, in ball order,
+        and for each of them the index of the brick it hit, or -1 if it hit the paddle.
+
+    Raises
+    ------
+    None
+    """
+    def contacts(self, balls, paddle) -> tuple[np.ndarray, np.ndarray]:
+        # Get the ball positions and radii as arrays
+        if isinstance(balls, BallBatch):
+            x, y, radius = balls.x[:balls.count], balls.y[:balls.count], balls.radius[:balls.count]
+        else:
+            x = np.fromiter((ball.x for ball in balls), dtype=float, count=len(balls))
+            y = np.fromiter((ball.y for ball in balls), dtype=float, count=len(balls))
+            radius = np.fromiter((ball.radius for ball in balls), dtype=float, count=len(balls))
+
+        ball_left, ball_right = x - radius, x + radius
+        ball_top, ball_bottom = y - radius, y + radius
+
+        # Balls overlapping the paddle
+        paddle_hit = ((ball_right >= paddle.x) & (ball_left <= paddle.x + paddle.width) &
+                      (ball_bottom >= paddle.y) & (ball_top <= paddle.y + paddle.height))
+
+        targets = np.full(len(x), -2)
+        targets[paddle_hit] = -1
+
+        # Overlap matrix of every ball against every brick, for the balls that did not hit the paddle
+        candidates = np.flatnonzero(~paddle_hit)
+        if len(self.bricks) > 0 and len(candidates) > 0:
+            overlap = ((ball_right[candidates, None] >= self.left) & (ball_left[candidates, None] <= self.right) &
+                       (ball_bottom[candidates, None] >= self.top) & (ball_top[candidates, None] <= self.bottom))
+
+            # The first overlapping brick of each ball
+            first = overlap.argmax(axis=1)
+            has_brick = overlap[np.arange(len(candidates)), first]
+            targets[candidates[has_brick]] = first[has_brick]
+
+        ball_indices = np.flatnonzero(targets != -2)
+        return ball_indices, targets[ball_indices]
@@ -0,0 +1,463 @@
+import math
+
+class BrickGrid:
+    """
+    Store for the bricks in the game, backed by a dense 2D grid of cells with one brick per cell.
+    The cells are CELL_WIDTH x CELL_HEIGHT pixels, which matches the grid used by GameManager.generate_bricks,
+    so finding, adding and removing a brick, and counting the bricks that are left, take constant time.
+    It is also the spatial index used for collisions: a ball only has to be tested against the bricks in the few cells its bounding box overlaps.
+
+    The grid can be used like the list of bricks it replaces: it can be iterated, appended to, removed from, and len() gives the number of bricks.
+
+    The rows are kept in a ring buffer. Every row has a fixed id, and the id of the row at the top of the screen is stored in top_row.
+    A brick stores its row id and gets its y-coordinate from the grid, so pushing a new row on top only has to decrease top_row,
+    no matter how many bricks are already on screen.
+
+    Attributes
+    ----------
+    CELL_WIDTH : int
+        The width of a grid cell in pixels.
+    CELL_HEIGHT : int
+        The height of a grid cell in pixels.
+    columns : int
+        The number of columns in the grid.
+    ring : list[list[Brick | None] | None]
+        Ring buffer with the cells of the grid, row by row. The row with id r is stored at index r % len(ring).
+    top_row : int
+        The id of the row at the top of the screen (y = 0).
+    row_count : int
+        The number of rows in the grid. Rows are added when a brick is placed below the last row.
+    count : int
+        The number of bricks in the grid.
+    version : int
+        Counter that is increased every time a brick is added, removed or moved.
+        Used by code that caches the brick layout to know when it is out of date.
+    dirty_cells : set[tuple[int, int]]
+        The cells, as (column, row id), whose brick has been added, removed or damaged since take_dirty_cells was last called.
+        Used by code that draws the bricks to only redraw the cells that changed.
+
+    Methods
+    -------
+    cell_of(brick: Brick) -> tuple[int, int]
+        Returns the column and row of the cell a brick is in.
+    row_y(row_id: int) -> int
+        Returns the y-coordinate of the top of a row.
+    row(row: int) -> list[Brick | None]
+        Returns the cells of a row.
+    get(column: int, row: int) -> Brick | None
+        Returns the brick in a cell.
+    append(brick: Brick) -> None
+        Adds a brick to the cell it is in.
+    remove(brick: Brick) -> None
+        Removes a brick from the grid.
+    add_rows(row_count: int) -> None
+        Adds empty rows at the bottom until the grid has row_count rows.
+    place(brick: Brick, column: int, row: int) -> None
+        Puts a brick in a cell that is known to be free, without the checks of append.
+    push_row() -> None
+        Moves every brick in the grid down by one row, adding an empty row at the top.
+    mark_dirty(brick: Brick) -> None
+        Marks the cell of a brick as changed, e.g. after it has been damaged.
+    take_dirty_cells() -> set[tuple[int, int]]
+        Returns the changed cells and starts a new, empty set.
+    query(left: float, top: float, right: float, bottom: float) -> list[Brick]
+        Returns the bricks in the cells overlapped by the given bounding box.
+    bricks() -> list[Brick]
+        Returns every brick in the grid, in the same order as query returns them.
+    """
+
+    CELL_WIDTH = 22
+    CELL_HEIGHT = 10
+
+    def __init__(self, columns: int, bricks=()):
+        if columns <= 0:
+            raise ValueError("columns must be greater than 0")
+
+        self.columns = columns
+        self.ring = [None] * 16
+        self.top_row = 0
+        self.row_count = 0
+        self.count = 0
+        self.version = 0
+        self.dirty_cells = set()
+
+        for brick in bricks:
+            self.append(brick)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.bricks())
+
+    def __contains__(self, brick):
+        column, row = self.cell_of(brick)
+        return self.get(column, row) is brick
+
+    def __repr__(self):
+        return f'BrickGrid({self.columns} columns, {self.row_count} rows, {self.count} bricks)'
+
+    """
+    Returns the column and row (counted from the top of the screen) of the cell a brick is in, based on its top left corner.
+
+    Parameters
+    ----------
+    brick : Brick
+        The brick to find the cell of.
+
+    Returns
+    -------
+    column, row : tuple[int, int]
+        The column and row of the brick's cell.
+
+    Raises
+    ------
+    None
+    """
+    def cell_of(self, brick) -> tuple[int, int]:
+        return math.floor(brick.x / self.CELL_WIDTH), math.floor(brick.y / self.CELL_HEIGHT)
+
+    """
+    Returns the y-coordinate of the top of a row.
+
+    Parameters
+    ----------
+    row_id : int
+        The id of the row.
+
+    Returns
+    -------
+    int
+        The y-coordinate of the top of the row.
+
+    Raises
+    ------
+    None
+    """
+    def row_y(self, row_id: int) -> int:
+        return (row_id - self.top_row) * self.CELL_HEIGHT
+
+    """
+    Returns the cells of a row.
+
+    Parameters
+    ----------
+    row : int
+        The row, counted from the top of the screen. Must be less than row_count.
+
+    Returns
+    -------
+    list[Brick | None]
+        The cells of the row.
+
+    Raises
+    ------
+    None
+    """
+    def row(self, row: int) -> list:
+        return self.ring[(self.top_row + row) % len(self.ring)]
+
+    """
+    Returns the brick in a cell.
+
+    Parameters
+    ----------
+    column : int
+        The column of the cell.
+    row : int
+        The row of the cell.
+
+    Returns
+    -------
+    Brick | None
+        The brick in the cell, or None if the cell is empty or outside the grid.
+
+    Raises
+    ------
+    None
+    """
+    def get(self, column: int, row: int):
+        if 0 <= column < self.columns and 0 <= row < self.row_count:
+            return self.row(row)[column]
+        return None
+
+    """
+    Adds a brick to the cell it is in. Rows are added to the grid if the brick is below the last row.
+
+    Parameters
+    ----------
+    brick : Brick
+        The brick to add.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the brick does not fit inside a single cell of the grid, or the cell already holds a brick.
+    """
+    def append(self, brick) -> None:
+        column, row = self.cell_of(brick)
+
+        if not 0 <= column < self.columns or row < 0:
+            raise ValueError("brick is outside the grid")
+        if (brick.x + brick.width >= (column + 1) * self.CELL_WIDTH or
+                brick.y + brick.height >= (row + 1) * self.CELL_HEIGHT):
+            raise ValueError("brick does not fit inside a single cell")
+
+        # Add empty rows at the bottom until the brick's row exists
+        self.add_rows(row + 1)
+
+        cells = self.row(row)
+        if cells[column] is not None:
+            raise ValueError("cell already holds a brick")
+
+        cells[column] = brick
+        self.count += 1
+        self.dirty_cells.add((column, self.top_row + row))
+
+        # The brick's y-coordinate now comes from its row
+        brick.offset_y = brick.y - row * self.CELL_HEIGHT
+        brick.row = self.top_row + row
+        brick.grid = self
+        self.version += 1
+
+    """
+    Adds empty rows at the bottom of the grid until it has row_count rows.
+
+    Parameters
+    ----------
+    row_count : int
+        The number of rows the grid should have.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def add_rows(self, row_count: int) -> None:
+        while self.row_count < row_count:
+            self.grow_ring()
+            self.ring[(self.top_row + self.row_count) % len(self.ring)] = [None] * self.columns
+            self.row_count += 1
+
+    """
+    Puts a brick in a cell without the checks of append, e.g. when restoring a grid from a snapshot where every brick's cell is known.
+    The row must exist and the cell must be empty. The brick keeps its offset_y as the offset from the top of the row,
+    and the cell is not marked as changed.
+
+    Parameters
+    ----------
+    brick : Brick
+        The brick to add.
+    column : int
+        The column of the cell.
+    row : int
+        The row of the cell, counted from the top of the screen.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def place(self, brick, column: int, row: int) -> None:
+        self.row(row)[column] = brick
+        self.count += 1
+
+        brick.row = self.top_row + row
+        brick.grid = self
+        self.version += 1
+
+    """
+    Removes a brick from the grid.
+
+    Parameters
+    ----------
+    brick : Brick
+        The brick to remove.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the brick is not in the grid.
+    """
+    def remove(self, brick) -> None:
+        column, row = self.cell_of(brick)
+
+        if self.get(column, row) is not brick:
+            raise ValueError("brick is not in the grid")
+
+        self.row(row)[column] = None
+        self.count -= 1
+        self.version += 1
+        self.dirty_cells.add((column, self.top_row + row))
+
+        # The brick keeps its current y-coordinate
+        brick.offset_y = brick.y
+        brick.row = None
+        brick.grid = None
+
+    """
+    Moves every brick in the grid down by one row, adding an empty row at the top.
+    Only the id of the top row changes, the bricks themselves are not touched.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def push_row(self) -> None:
+        self.grow_ring()
+
+        self.top_row -= 1
+        self.ring[self.top_row % len(self.ring)] = [None] * self.columns
+        self.row_count += 1
+
+        self.version += 1
+
+    """
+    Marks the cell of a brick as changed, e.g. after it has been damaged and has to be drawn with a different alpha.
+
+    Parameters
+    ----------
+    brick : Brick
+        The brick that changed.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def mark_dirty(self, brick) -> None:
+        column, row = self.cell_of(brick)
+        self.dirty_cells.add((column, self.top_row + row))
+
+    """
+    Returns the cells that changed since the last call, and starts a new, empty set.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    dirty_cells : set[tuple[int, int]]
+        The changed cells, as (column, row id).
+
+    Raises
+    ------
+    None
+    """
+    def take_dirty_cells(self) -> set:
+        dirty_cells = self.dirty_cells
+        self.dirty_cells = set()
+        return dirty_cells
+
+    """
+    Doubles the size of the ring buffer if it is full, so one more row can be added.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def grow_ring(self) -> None:
+        if self.row_count < len(self.ring):
+            return
+
+        ring = [None] * (len(self.ring) * 2)
+        for row_id in range(self.top_row, self.top_row + self.row_count):
+            ring[row_id % len(ring)] = self.ring[row_id % len(self.ring)]
+        self.ring = ring
+
+    """
+    Returns the bricks in the cells overlapped by a bounding box.
+    The bricks are returned column by column, top to bottom, which is the same order GameManager.generate_bricks creates them in.
+
+    Parameters
+    ----------
+    left : float
+        The left edge of the bounding box.
+    top : float
+        The top edge of the bounding box.
+    right : float
+        The right edge of the bounding box.
+    bottom : float
+        The bottom edge of the bounding box.
+
+    Returns
+    -------
+    bricks : list[Brick]
+        The bricks that might overlap the bounding box.
+
+    Raises
+    ------
+    None
+    """
+    def query(self, left: float, top: float, right: float, bottom: float) -> list:
+        # Only the cells inside the grid can hold bricks
+        first_column = max(math.floor(left / self.CELL_WIDTH), 0)
+        last_column = min(math.floor(right / self.CELL_WIDTH), self.columns - 1)
+        first_row = max(math.floor(top / self.CELL_HEIGHT), 0)
+        last_row = min(math.floor(bottom / self.CELL_HEIGHT), self.row_count - 1)
+
+        rows = [self.row(row) for row in range(first_row, last_row + 1)]
+
+        found = []
+        for column in range(first_column, last_column + 1):
+            for cells in rows:
+                brick = cells[column]
+                if brick is not None:
+                    found.append(brick)
+
+        return found
+
+    """
+    Returns every brick in the grid.
+    The bricks are returned column by column, top to bottom, the same as query.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    bricks : list[Brick]
+        All bricks in the grid.
+
+    Raises
+    ------
+    None
+    """
+    def bricks(self) -> list:
+        rows = [self.row(row) for row in range(self.row_count)]
+        return [cells[column] for column in range(self.columns) for cells in rows if cells[column] is not None]
@@ -0,0 +1,223 @@
+import pygame
+
+class BrickLayer:
+    """
+    Off-screen surface with all bricks drawn on it, on the black background of the game.
+    The whole layer is only drawn when the brick grid is replaced (e.g. on a new level). After that, only the cells of bricks that were
+    damaged, destroyed or added are redrawn, and pushing a new row on top scrolls the layer down instead of redrawing it.
+    The layer is then blitted to the canvas as one surface, so the cost of drawing the bricks depends on the number of bricks that changed,
+    not on the number of bricks on screen.
+
+    Every brick is drawn with the same alpha as before (based on its remaining durability), using surfaces that are cached per color,
+    size and remaining durability instead of being created for every brick each frame.
+
+    Attributes
+    ----------
+    size : tuple[int, int]
+        The size of the layer in pixels.
+    surface : pygame.Surface
+        The layer with the bricks drawn on it.
+    grid : BrickGrid | None
+        The brick grid the layer was drawn from.
+    bricks : tuple[BrickState, ...] | None
+        The brick snapshot the layer was drawn from, when it is drawn from snapshots instead of a grid.
+    top_row : int
+        The id of the grid's top row when the layer was last updated. Used to find how many rows have been pushed since.
+    variants : dict[tuple, pygame.Surface]
+        Cached brick surfaces, keyed by (color, width, height, durability, hits).
+    cells_redrawn : int
+        The number of cells redrawn in the last update.
+    dirty_rects : list[pygame.Rect]
+        The areas of the layer that changed in the last update. Used to only copy those areas to the screen.
+
+    Methods
+    -------
+    update(grid: BrickGrid) -> None
+        Brings the layer up to date with the bricks in the grid.
+    update_from_snapshot(bricks: tuple[BrickState, ...]) -> None
+        Brings the layer up to date with the bricks in a snapshot.
+    redraw() -> None
+        Draws the whole layer from scratch.
+    draw_cell(column: int, row_id: int) -> None
+        Redraws a single cell of the grid.
+    variant(brick: Brick) -> pygame.Surface
+        Returns the cached surface a brick is drawn with.
+    """
+
+    def __init__(self, size: tuple[int, int]):
+        self.size = size
+        self.surface = pygame.Surface(size)
+        self.grid = None
+        self.bricks = None
+        self.top_row = 0
+        self.variants = {}
+        self.cells_redrawn = 0
+        self.dirty_rects = []
+
+    """
+    Brings the layer up to date with the bricks in the grid.
+
+    Parameters
+    ----------
+    grid : BrickGrid
+        The bricks in the game.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def update(self, grid) -> None:
+        self.dirty_rects = []
+
+        # A new grid (e.g. a new level) is drawn from scratch
+        if grid is not self.grid:
+            self.grid = grid
+            self.bricks = None
+            self.redraw()
+            return
+
+        # Scroll the layer down by the rows that have been pushed on top, and clear the new rows
+        pushed_rows = self.top_row - grid.top_row
+        if pushed_rows > 0:
+            height = pushed_rows * grid.CELL_HEIGHT
+            self.surface.scroll(0, height)
+            self.surface.fill("black", pygame.Rect(0, 0, self.size[0], height))
+            self.top_row = grid.top_row
+            self.dirty_rects.append(self.surface.get_rect())
+
+        dirty_cells = grid.take_dirty_cells()
+        for column, row_id in dirty_cells:
+            self.draw_cell(column, row_id)
+
+        self.cells_redrawn = len(dirty_cells)
+
+    """
+    Brings the layer up to date with the bricks in a snapshot.
+    Used when the game is updated on another thread, so the grid cannot be read while drawing.
+    Snapshots share their bricks while no brick changes, so the layer is only drawn again when a different tuple of bricks is given.
+
+    Parameters
+    ----------
+    bricks : tuple[BrickState, ...]
+        The bricks in the snapshot.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def update_from_snapshot(self, bricks) -> None:
+        self.dirty_rects = []
+        self.cells_redrawn = 0
+
+        if bricks is self.bricks:
+            return
+
+        self.grid = None
+        self.bricks = bricks
+        self.surface.fill("black")
+
+        for brick in bricks:
+            self.surface.blit(self.variant(brick), (brick.x, brick.y))
+
+        self.cells_redrawn = len(bricks)
+        self.dirty_rects = [self.surface.get_rect()]
+
+    """
+    Draws the whole layer from scratch, from the bricks in the grid.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def redraw(self) -> None:
+        self.surface.fill("black")
+        self.top_row = self.grid.top_row
+
+        # Every brick is drawn now, so earlier changes do not have to be redrawn
+        self.grid.take_dirty_cells()
+
+        for brick in self.grid:
+            self.surface.blit(self.variant(brick), (brick.x, brick.y))
+
+        self.cells_redrawn = len(self.grid)
+        self.dirty_rects = [self.surface.get_rect()]
+
+    """
+    Redraws a single cell of the grid: clears it, and draws the brick that is in it now, if any.
+
+    Parameters
+    ----------
+    column : int
+        The column of the cell.
+    row_id : int
+        The id of the cell's row.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def draw_cell(self, column: int, row_id: int) -> None:
+        grid = self.grid
+        y = grid.row_y(row_id)
+
+        # Cells below the layer are not visible
+        if y >= self.size[1]:
+            return
+
+        rect = pygame.Rect(column * grid.CELL_WIDTH, y, grid.CELL_WIDTH, grid.CELL_HEIGHT)
+        self.surface.fill("black", rect)
+        self.dirty_rects.append(rect)
+
+        brick = grid.get(column, row_id - grid.top_row)
+        if brick is not None:
+            self.surface.blit(self.variant(brick), (brick.x, brick.y))
+
+    """
+    Returns the surface a brick is drawn with: filled with its color, with transparency based on its remaining durability.
+    The surface is created the first time it is needed and cached.
+
+    Parameters
+    ----------
+    brick : Brick | BrickState
+        The brick to draw.
+
+    Returns
+    -------
+    pygame.Surface
+        The surface to blit for the brick.
+
+    Raises
+    ------
+    None
+    """
+    def variant(self, brick) -> pygame.Surface:
+        key = (brick.color, brick.width, brick.height, brick.durability, brick.hits)
+
+        surface = self.variants.get(key)
+        if surface is None:
+            surface = pygame.Surface((brick.width, brick.height))
+            surface.fill(brick.color)
+            surface.set_alpha(255 * ((brick.durability - brick.hits) / brick.durability))
+            self.variants[key] = surface
+
+        return surface
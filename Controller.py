@@ -0,0 +1,288 @@
+import math
+from PlayerInput import PlayerInput
+
+class Controller:
+    """
+    Plays a game instead of the keyboard. Before every step, the game asks the controller for its input,
+    as the same PlayerInput flags Main.react_to_user_input gets from the pressed keys, so a controller can play a headless game
+    with GameManager.step, or the window by setting Main.controller.
+    This controller does nothing. Subclasses override get_input.
+
+    Methods
+    -------
+    get_input(game_manager: GameManager) -> int
+        Returns the input for the next step of the game.
+    """
+
+    """
+    Returns the input for the next step of the game.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The game being played.
+
+    Returns
+    -------
+    int
+        The input, as PlayerInput flags.
+
+    Raises
+    ------
+    None
+    """
+    def get_input(self, game_manager) -> int:
+        return PlayerInput.NONE
+
+
+class Autopilot(Controller):
+    """
+    Plays a game by predicting where the next ball lands and moving the paddle there, e.g. for benchmarks and soak tests
+    that need games which last many levels without a player.
+
+    The landing point of a falling ball is found by following its velocity down to the paddle, folding the path back into the window
+    at the side walls, the same way Ball.handle_edge_bounce bounces the ball.
+    The paddle is then placed so the ball bounces towards the target, using the angle model of Ball.paddle_hit:
+    the further from the middle of the paddle the ball hits, the flatter it bounces.
+    The target brick is picked once per fall, so the grid is not searched every step.
+
+    The autopilot has no randomness, so a seeded game played by it is always played the same way.
+
+    Attributes
+    ----------
+    max_angle : int
+        The maximum bounce angle off the paddle, in degrees. The same as in GameManager.handle_paddle_collision.
+    max_offset : float
+        The furthest from the middle of the paddle the autopilot lets the ball hit, as a fraction of half the paddle width.
+        Kept below 1 so the ball still hits the paddle if the prediction is a little off.
+    min_offset : float
+        The closest to the middle of the paddle the autopilot lets the ball hit, as a fraction of half the paddle width.
+        A ball that bounces straight up can go up and down an empty column forever, so every bounce gets some sideways speed.
+    aim : bool
+        Whether to aim at the bricks. If False, the ball is caught with the middle of the paddle.
+    restart : bool
+        Whether to restart the game when it is lost, so a game can run unattended for as long as needed.
+    target : tuple[float, float] | None
+        The centre of the brick the autopilot is aiming at.
+    falling : bool
+        Whether the followed ball was falling in the last step.
+
+    Methods
+    -------
+    get_input(game_manager: GameManager) -> int
+        Returns the input for the next step of the game.
+    predict_landing(ball: Ball, paddle: Paddle, window_size: int) -> tuple[float, float, float, float] | None
+        Predicts when and where a ball reaches the paddle.
+    choose_target(bricks: BrickGrid, x: float) -> tuple[float, float] | None
+        Picks the brick to aim at.
+    paddle_centre(landing_x: float, landing_y: float, paddle: Paddle, left: float, right: float) -> float
+        Returns where the middle of the paddle should be to bounce the ball towards the target.
+    """
+
+    def __init__(self, max_angle: int = 45, max_offset: float = 0.8, min_offset: float = 0.1, aim: bool = True, restart: bool = False):
+        if max_angle <= 0:
+            raise ValueError("max_angle must be greater than 0")
+        if max_offset < 0 or max_offset >= 1:
+            raise ValueError("max_offset must be at least 0 and less than 1")
+        if min_offset < 0 or min_offset > max_offset:
+            raise ValueError("min_offset must be at least 0 and at most max_offset")
+
+        self.max_angle = max_angle
+        self.max_offset = max_offset
+        self.min_offset = min_offset
+        self.aim = aim
+        self.restart = restart
+        self.target = None
+        self.falling = False
+
+    """
+    Returns the input for the next step of the game: launch the ball if the game has not started,
+    otherwise move the paddle towards the point where it bounces the next ball towards the target.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The game being played.
+
+    Returns
+    -------
+    int
+        The input, as PlayerInput flags.
+
+    Raises
+    ------
+    None
+    """
+    def get_input(self, game_manager) -> int:
+        if game_manager.lost_game:
+            return PlayerInput.RESTART if self.restart else PlayerInput.NONE
+        if not game_manager.game_started:
+            return PlayerInput.LAUNCH
+
+        paddle = game_manager.paddle
+        window_size = game_manager.WINDOW_SIZE
+
+        # Follow the ball that reaches the paddle first
+        landing = None
+        for ball in game_manager.balls:
+            prediction = self.predict_landing(ball, paddle, window_size)
+            if prediction is not None and (landing is None or prediction[0] < landing[0]):
+                landing = prediction
+
+        if landing is None:
+            # No ball is falling. Wait under the lowest ball.
+            self.falling = False
+            if len(game_manager.balls) == 0:
+                return PlayerInput.NONE
+            target_centre = max(game_manager.balls, key=lambda ball: ball.y).x
+        else:
+            time, landing_x, landing_y, radius = landing
+
+            # Pick a new target every time a ball starts falling
+            if not self.falling:
+                self.target = self.choose_target(game_manager.bricks, landing_x) if self.aim else None
+            self.falling = True
+
+            target_centre = self.paddle_centre(landing_x, landing_y, paddle, radius, window_size - radius)
+
+        # The paddle cannot leave the window
+        target_centre = min(max(target_centre, paddle.width / 2), window_size - paddle.width / 2)
+        centre = paddle.x + paddle.width / 2
+
+        # Stop within one step of the target, so the paddle does not shake around it
+        tolerance = 300 * game_manager.dt
+
+        if target_centre < centre - tolerance:
+            return PlayerInput.LEFT
+        if target_centre > centre + tolerance:
+            return PlayerInput.RIGHT
+        return PlayerInput.NONE
+
+    """
+    Predicts when and where a falling ball reaches the top of the paddle.
+    The ball moves in a straight line, and its path is folded back into the window every time it reaches a side wall.
+    The ball cannot hit anything else on the way down, since the bricks are above it.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball.
+    paddle : Paddle
+        The paddle.
+    window_size : int
+        The size of the window.
+
+    Returns
+    -------
+    tuple[float, float, float, float] | None
+        The time until the ball reaches the paddle, the x- and y-coordinates of the ball's centre when it does, and the ball's radius.
+        None if the ball is not falling or is already below the top of the paddle.
+
+    Raises
+    ------
+    None
+    """
+    def predict_landing(self, ball, paddle, window_size: int):
+        if ball.vy <= 0 or ball.speed <= 0:
+            return None
+
+        landing_y = paddle.y - ball.radius
+        if ball.y > landing_y:
+            return None
+
+        time = (landing_y - ball.y) / (ball.vy * ball.speed)
+        x = ball.x + ball.vx * ball.speed * time
+
+        # Fold the path back between the walls. The centre of the ball bounces at radius and at window_size - radius.
+        left = ball.radius
+        width = window_size - 2 * ball.radius
+        if width > 0:
+            x = (x - left) % (2 * width)
+            if x > width:
+                x = 2 * width - x
+            x += left
+
+        return time, x, landing_y, ball.radius
+
+    """
+    Picks where to aim: the lowest brick of the column with the fewest bricks, closest to where the ball lands if several columns
+    have as few. This empties the columns one by one, and the ball then gets above the wall through the empty columns.
+
+    Parameters
+    ----------
+    bricks : BrickGrid
+        The bricks in the game.
+    x : float
+        The x-coordinate where the ball lands.
+
+    Returns
+    -------
+    tuple[float, float] | None
+        The centre of the brick, or None if there are no bricks.
+
+    Raises
+    ------
+    None
+    """
+    def choose_target(self, bricks, x: float):
+        if len(bricks) == 0:
+            return None
+
+        # The number of bricks and the lowest brick of each column
+        counts = [0] * bricks.columns
+        lowest = [None] * bricks.columns
+        for brick in bricks:
+            column, row = bricks.cell_of(brick)
+            counts[column] += 1
+            if lowest[column] is None or brick.y > lowest[column].y:
+                lowest[column] = brick
+
+        columns = [column for column in range(bricks.columns) if counts[column] > 0]
+        column = min(columns, key=lambda column: (counts[column], abs(lowest[column].x - x)))
+
+        brick = lowest[column]
+        return brick.x + brick.width / 2, brick.y + brick.height / 2
+
+    """
+    Returns where the middle of the paddle should be when the ball lands, to bounce the ball towards the target.
+    Ball.paddle_hit bounces the ball at 90 - max_angle * offset degrees, where offset is where the ball hits the paddle,
+    from -1 at the left edge to 1 at the right edge, so the offset for the angle towards the target is (90 - angle) / max_angle.
+    A target that is too far to the side to be hit directly can be hit off a side wall, by aiming at its mirror image behind the wall.
+    The target or mirror image that needs the smallest offset is used.
+
+    Parameters
+    ----------
+    landing_x, landing_y : float
+        The position of the ball's centre when it reaches the paddle.
+    paddle : Paddle
+        The paddle.
+    left, right : float
+        The x-coordinates where the ball's centre bounces off the left and right walls.
+
+    Returns
+    -------
+    float
+        The x-coordinate of the middle of the paddle.
+
+    Raises
+    ------
+    None
+    """
+    def paddle_centre(self, landing_x: float, landing_y: float, paddle, left: float, right: float) -> float:
+        if self.target is None:
+            return landing_x
+
+        target_x, target_y = self.target
+
+        offset = None
+        for image_x in (target_x, 2 * left - target_x, 2 * right - target_x):
+            # The angle of the straight line from the landing point to the target, in the same convention as Ball.paddle_hit
+            angle = math.degrees(math.atan2(landing_y - target_y, image_x - landing_x))
+            image_offset = (90 - angle) / self.max_angle
+            if offset is None or abs(image_offset) < abs(offset):
+                offset = image_offset
+
+        # Keep the offset between min_offset and max_offset, on the side of the target
+        offset = math.copysign(min(max(abs(offset), self.min_offset), self.max_offset), offset)
+
+        return landing_x - offset * paddle.width / 2
@@ -0,0 +1,513 @@
+import heapq
+import math
+from time import perf_counter
+from GameManager import GameManager
+from Paddle import Paddle
+from PlayerInput import PlayerInput
+
+class EventSimulation:
+    """
+    Event-driven simulation of a game for headless runs.
+    Between bounces every ball and falling modifier moves in a straight line, so the time of its next wall, brick or paddle contact
+    can be calculated directly. The upcoming contacts are kept in a priority queue, and the simulation jumps straight from one contact
+    to the next instead of stepping the game every dt.
+
+    The paddle is treated as standing still during a run, and paddle width changes are applied at once instead of gradually.
+    The random modifier drop from the top of the screen is rolled once per update in GameManager.update,
+    so it has no equivalent here and is not used.
+
+    Attributes
+    ----------
+    game_manager : GameManager
+        The game being simulated.
+    time : float
+        The simulated time in seconds since the simulation was created.
+    queue : list[tuple[float, int, str, object, int, tuple]]
+        Heap of upcoming events, as (time, sequence number, kind, object, version, data).
+    versions : dict[object, int]
+        The current event version of each scheduled object. Events with an older version are out of date and are skipped.
+    scheduled_drops : set[Modifier]
+        The dropped modifiers that have an event in the queue. Modifiers dropped during a run are not in it yet.
+    events_processed : int
+        The number of events handled since the simulation was created.
+
+    Methods
+    -------
+    reschedule() -> None
+        Clears the queue and schedules the next event of every ball and modifier.
+    schedule_ball(ball: Ball) -> None
+        Schedules the next wall, brick or paddle contact of a ball.
+    schedule_modifier(modifier: Modifier, missed: bool = False) -> None
+        Schedules the next event of a dropped or active modifier.
+    advance(dt: float) -> None
+        Moves every ball and modifier in a straight line and updates the timers.
+    run(duration: float, max_events: int = 1000000) -> int
+        Simulates the game for the given time, or until the level ends or a life is lost.
+    """
+
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.time = 0.0
+        self.queue = []
+        self.versions = {}
+        self.scheduled_drops = set()
+        self.sequence = 0   # Breaks ties between events at the same time, in the order they were scheduled
+        self.events_processed = 0
+
+    """
+    Adds an event to the queue, replacing any earlier event of the same object.
+
+    Parameters
+    ----------
+    time : float
+        The simulated time of the event.
+    kind : str
+        The kind of event: "ball", "drop" (dropped modifier) or "expire" (active modifier).
+    obj : object
+        The ball or modifier the event belongs to.
+    data : tuple
+        Extra information needed to handle the event.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def push(self, time: float, kind: str, obj, data: tuple) -> None:
+        version = self.versions.get(obj, 0) + 1
+        self.versions[obj] = version
+        self.sequence += 1
+        heapq.heappush(self.queue, (time, self.sequence, kind, obj, version, data))
+
+    """
+    Clears the queue and schedules the next event of every ball and modifier.
+    Called at the start of every run, and whenever something changes that can affect all balls (e.g. a modifier is activated).
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def reschedule(self) -> None:
+        self.queue = []
+        self.versions = {}
+        self.scheduled_drops = set()
+
+        for ball in self.game_manager.balls:
+            self.schedule_ball(ball)
+        for modifier in self.game_manager.dropped_modifiers + self.game_manager.active_modifiers:
+            self.schedule_modifier(modifier)
+
+    """
+    Schedules the next wall, brick or paddle contact of a ball.
+    The wall contacts use the same edges as Ball.handle_edge_bounce, and the brick and paddle contacts are found with Ball.sweep.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball to schedule.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def schedule_ball(self, ball) -> None:
+        window_size = self.game_manager.WINDOW_SIZE
+        velocity_x = ball.speed * ball.vx
+        velocity_y = ball.speed * ball.vy
+
+        # A ball that is not moving has no events
+        if velocity_x == 0 and velocity_y == 0:
+            self.versions[ball] = self.versions.get(ball, 0) + 1
+            return
+
+        # Find the first edge of the window the ball reaches
+        wall_time, wall = math.inf, None
+        if velocity_x < 0:
+            wall_time, wall = (ball.x - ball.radius) / -velocity_x, "left"
+        elif velocity_x > 0:
+            wall_time, wall = (window_size - ball.radius - ball.x) / velocity_x, "right"
+
+        if velocity_y < 0:
+            edge_time, edge = (ball.y - ball.radius) / -velocity_y, "top"
+        elif ball.death_disabled:
+            edge_time, edge = (window_size - ball.radius - ball.y) / velocity_y, "bottom"
+        else:
+            # The ball dies once its top edge has left the screen
+            edge_time, edge = (window_size + ball.radius - ball.y) / velocity_y, "death"
+
+        if velocity_y != 0 and edge_time < wall_time:
+            wall_time, wall = edge_time, edge
+
+        wall_time = max(wall_time, 0)
+
+        # Find the first brick or paddle contact before the ball reaches the edge
+        dx = velocity_x * wall_time
+        dy = velocity_y * wall_time
+        nearby_bricks = self.game_manager.bricks.query(min(ball.x, ball.x + dx) - ball.radius, min(ball.y, ball.y + dy) - ball.radius,
+                                                       max(ball.x, ball.x + dx) + ball.radius, max(ball.y, ball.y + dy) + ball.radius)
+        hit = ball.sweep(dx, dy, self.game_manager.paddle, nearby_bricks)
+
+        if hit is not None:
+            time_of_impact, collision_object, direction = hit
+            self.push(self.time + wall_time * time_of_impact, "ball", ball, (collision_object, direction))
+        else:
+            self.push(self.time + wall_time, "ball", ball, (None, wall))
+
+    """
+    Schedules the next event of a modifier.
+    A dropped modifier's next event is reaching the top of the paddle, or leaving the screen if it has passed or missed the paddle.
+    An active modifier's next event is running out of time.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The modifier to schedule.
+    missed : bool, optional
+        Whether the modifier has reached the top of the paddle without being caught (default is False).
+        Its next event is then always leaving the screen, since the time to the top of the paddle is 0 again.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def schedule_modifier(self, modifier, missed: bool = False) -> None:
+        if modifier in self.game_manager.active_modifiers:
+            self.push(self.time + max(modifier.time_remaining, 0), "expire", modifier, ())
+            return
+
+        self.scheduled_drops.add(modifier)
+        paddle = self.game_manager.paddle
+        catch_time = (paddle.y - modifier.radius - modifier.y) / modifier.fall_speed
+
+        if catch_time >= 0 and not missed:
+            self.push(self.time + catch_time, "drop", modifier, ("catch",))
+        else:
+            out_time = (self.game_manager.WINDOW_SIZE + modifier.radius - modifier.y) / modifier.fall_speed
+            self.push(self.time + max(out_time, 0), "drop", modifier, ("out",))
+
+    """
+    Moves every ball and dropped modifier in a straight line, and updates the timers and scores.
+
+    Parameters
+    ----------
+    dt : float
+        The time to move forward, in seconds.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def advance(self, dt: float) -> None:
+        game_manager = self.game_manager
+        self.time += dt
+
+        for ball in game_manager.balls:
+            ball.move(dt)
+        for modifier in game_manager.dropped_modifiers:
+            modifier.fall(dt)
+        for modifier in game_manager.active_modifiers:
+            modifier.time_remaining -= dt
+
+        if game_manager.game_started:
+            game_manager.elapsed_time += dt
+            game_manager.level_manager.time_spent += dt
+
+        game_manager.level_points = game_manager.calculate_score()
+
+    """
+    Handles a ball event: bounces the ball off the wall, brick or paddle it reached, or removes it if it left the screen.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball the event belongs to.
+    collision_object : Paddle | Brick | None
+        The brick or paddle that was reached, or None for a window edge.
+    direction : str
+        The bounce direction for bricks and the paddle, or the edge that was reached.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def handle_ball_event(self, ball, collision_object, direction: str) -> None:
+        game_manager = self.game_manager
+        window_size = game_manager.WINDOW_SIZE
+
+        if collision_object is None:
+            # Put the ball exactly on the edge, so Ball.handle_edge_bounce sees the contact despite rounding errors
+            match direction:
+                case "left":
+                    ball.x = ball.radius
+                case "right":
+                    ball.x = window_size - ball.radius
+                case "top":
+                    ball.y = ball.radius
+                case "bottom":
+                    ball.y = window_size - ball.radius
+                case "death":
+                    ball.y = window_size + ball.radius
+
+            ball.handle_edge_bounce(game_manager, window_size)
+
+            if ball.is_dead:
+                # Remove the dead ball. If all balls are dead, the game is reset.
+                game_manager.balls.remove(ball)
+                if len(game_manager.balls) <= 0:
+                    game_manager.reset()
+                return
+
+        elif isinstance(collision_object, Paddle):
+            if direction == "y" and ball.vy > 0:
+                ball.paddle_hit(45, collision_object)
+            else:
+                ball.bounce(direction)
+            game_manager.sound_manager.play_paddle_hit_sound()
+
+        elif collision_object not in game_manager.bricks:
+            # The brick was destroyed by another ball, find the ball's new next event
+            pass
+
+        else:
+            game_manager.handle_brick_collision(ball, collision_object, direction)
+
+        self.schedule_ball(ball)
+
+    """
+    Handles a modifier event: activates a dropped modifier that reached the paddle, removes one that left the screen,
+    or deactivates an active modifier that ran out of time.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of event: "drop" or "expire".
+    modifier : Modifier
+        The modifier the event belongs to.
+    data : tuple
+        For drop events, whether the modifier reached the paddle ("catch") or left the screen ("out").
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def handle_modifier_event(self, kind: str, modifier, data: tuple) -> None:
+        game_manager = self.game_manager
+
+        if kind == "expire":
+            modifier.time_remaining = 0
+            game_manager.expire_modifier(modifier)
+        elif data[0] == "catch":
+            # Put the modifier exactly on the top of the paddle, so Modifier.is_caught sees the contact despite rounding errors
+            modifier.y = game_manager.paddle.y - modifier.radius
+
+            if not modifier.is_caught(game_manager.paddle):
+                # Missed the paddle, it will fall off the screen
+                self.schedule_modifier(modifier, missed=True)
+                return
+
+            game_manager.catch_modifier(modifier)
+        else:
+            # The factory can hand the modifier out again for the next drop, which is scheduled as a new one.
+            # Its version is kept, so no older event of the modifier can be mistaken for an event of the new drop.
+            self.scheduled_drops.discard(modifier)
+            game_manager.remove_dropped_modifier(modifier)
+            return
+
+        # Apply the paddle width change at once, keeping the paddle centred
+        paddle = game_manager.paddle
+        paddle.x -= (paddle.base_width - paddle.width) / 2
+        paddle.width = paddle.base_width
+
+        # Cap ball speed
+        for ball in game_manager.balls:
+            ball.speed = min(ball.speed, game_manager.MAX_BALL_SPEED)
+
+        # Modifiers can add balls, change their speed or move the bricks, so every ball's next event can change
+        self.reschedule()
+
+    """
+    Simulates the game for the given time, jumping from event to event.
+    The run stops early if the level ends or a life is lost, since the game then waits for the player to start again.
+
+    Parameters
+    ----------
+    duration : float
+        The time to simulate, in seconds.
+    max_events : int, optional
+        The maximum number of events to handle (default is 1000000).
+
+    Returns
+    -------
+    events : int
+        The number of events handled.
+
+    Raises
+    ------
+    ValueError
+        If duration is less than 0.
+    """
+    def run(self, duration: float, max_events: int = 1000000) -> int:
+        if duration < 0:
+            raise ValueError("duration must not be negative")
+
+        game_manager = self.game_manager
+        if not game_manager.game_started:
+            return 0
+
+        end_time = self.time + duration
+        events = 0
+        self.reschedule()
+
+        while self.queue and events < max_events:
+            time, _, kind, obj, version, data = self.queue[0]
+            if time > end_time:
+                break
+
+            heapq.heappop(self.queue)
+
+            # Skip events that have been replaced by a newer one
+            if self.versions.get(obj) != version:
+                continue
+
+            self.advance(time - self.time)
+            events += 1
+
+            if kind == "ball":
+                self.handle_ball_event(obj, *data)
+            else:
+                self.handle_modifier_event(kind, obj, data)
+
+            # The level was won or a life was lost, the game waits for the player
+            if not game_manager.game_started:
+                break
+
+            # Schedule modifiers dropped by destroyed bricks
+            for modifier in game_manager.dropped_modifiers:
+                if modifier not in self.scheduled_drops:
+                    self.schedule_modifier(modifier)
+
+        # Move the rest of the way if the run was not cut short
+        if game_manager.game_started and events < max_events:
+            self.advance(end_time - self.time)
+
+        self.events_processed += events
+        return events
+
+
+"""
+Plays the same headless game with an event simulation and with GameManager.step, and compares the two runs.
+Nobody moves the paddle, and the ball is launched again every time a life is lost or a level is won, until the game is lost
+or the duration has been simulated. The step run uses swept collisions, which find the same contacts as the events.
+The games use random numbers differently (e.g. GameManager.update rolls for a random drop every update), so they are not expected
+to end in the same state, but the event simulation has to reach the end of the duration, and take fewer events than the step run takes steps.
+
+Parameters
+----------
+seed : int
+    Seed of the game.
+duration : float, optional
+    The time to simulate, in seconds (default is 60).
+dt : float, optional
+    The time step of the step run, in seconds (default is 1 / 240).
+
+Returns
+-------
+dict[str, object]
+    For each run ("events" and "steps"), the number of events or steps, the simulated time ("..._time"),
+    the real time it took in seconds ("..._seconds"), and the lives and bricks left at the end ("..._lives", "..._bricks").
+    "stalled": whether the event simulation ran out of events, as many as the step run's steps, before the end of the duration.
+
+Raises
+------
+ValueError
+    If duration is less than 0 or dt is not greater than 0.
+"""
+def compare_with_steps(seed: int, duration: float = 60, dt: float = 1 / 240) -> dict:
+    if duration < 0:
+        raise ValueError("duration must not be negative")
+    if dt <= 0:
+        raise ValueError("dt must be greater than 0")
+
+    max_steps = round(duration / dt)
+
+    # Step the game
+    game_manager = GameManager.create_headless(seed)
+    game_manager.collision_mode = "swept"
+    start = perf_counter()
+    steps = 0
+    while steps < max_steps and not game_manager.lost_game:
+        game_manager.step(dt, PlayerInput.NONE if game_manager.game_started else PlayerInput.LAUNCH)
+        steps += 1
+    step_seconds = perf_counter() - start
+    step_game = game_manager
+
+    # Simulate the same game with events, with no more events than the step run took steps
+    game_manager = GameManager.create_headless(seed)
+    simulation = EventSimulation(game_manager)
+    start = perf_counter()
+    events = 0
+    while simulation.time < duration and not game_manager.lost_game and events < max_steps:
+        if not game_manager.game_started:
+            game_manager.apply_input(PlayerInput.LAUNCH)
+        events += simulation.run(duration - simulation.time, max_steps - events)
+    event_seconds = perf_counter() - start
+
+    return {
+        "steps": steps,
+        "step_time": steps * dt,
+        "step_seconds": step_seconds,
+        "step_lives": step_game.lives,
+        "step_bricks": len(step_game.bricks),
+        "events": events,
+        "event_time": simulation.time,
+        "event_seconds": event_seconds,
+        "event_lives": game_manager.lives,
+        "event_bricks": len(game_manager.bricks),
+        "stalled": simulation.time < duration and not game_manager.lost_game,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    failed = False
+    for seed in range(int(sys.argv[1]) if len(sys.argv) > 1 else 5):
+        result = compare_with_steps(seed)
+        status = "STALLED" if result["stalled"] else "ok"
+        failed = failed or result["stalled"]
+        print(f"seed {seed}: {result['steps']} steps in {result['step_seconds']:.2f} s, lives {result['step_lives']}, bricks {result['step_bricks']} | "
+              f"{result['events']} events to {result['event_time']:.2f} s in {result['event_seconds']:.2f} s, "
+              f"lives {result['event_lives']}, bricks {result['event_bricks']}: {status}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,94 @@
+class FixedTimestep:
+    """
+    Accumulator that turns variable frame times into a whole number of fixed-size simulation steps.
+    The simulation always advances by step_dt, so its results do not depend on the frame rate.
+    Left-over time is carried to the next frame and is used to interpolate the rendered positions between the last two steps.
+
+    Attributes
+    ----------
+    step_rate : int
+        The number of simulation steps per second.
+    step_dt : float
+        The length of a simulation step in seconds.
+    max_frame_time : float
+        The longest frame time that is simulated. Longer frames (e.g. after the window has been dragged) are cut to this,
+        so the simulation does not have to run hundreds of steps to catch up.
+    accumulator : float
+        Frame time that has not been simulated yet.
+
+    Methods
+    -------
+    advance(frame_dt: float) -> int
+        Adds the time of a frame to the accumulator and returns the number of steps to simulate.
+    reset() -> None
+        Discards any time that has not been simulated yet.
+    """
+
+    def __init__(self, step_rate: int = 240, max_frame_time: float = 0.25):
+        if step_rate <= 0:
+            raise ValueError("step_rate must be greater than 0")
+        if max_frame_time <= 0:
+            raise ValueError("max_frame_time must be greater than 0")
+
+        self.step_rate = step_rate
+        self.step_dt = 1 / step_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    """
+    Interpolation factor between the previous and the current simulation step.
+    0 means the rendered state is the previous step, 1 means it is the current step.
+    """
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step_dt
+
+    """
+    Adds the time of a frame to the accumulator and returns the number of whole steps that fit in it.
+    The time of those steps is removed from the accumulator.
+
+    Parameters
+    ----------
+    frame_dt : float
+        The time the last frame took, in seconds.
+
+    Returns
+    -------
+    steps : int
+        The number of simulation steps to run this frame.
+
+    Raises
+    ------
+    ValueError
+        If frame_dt is less than 0.
+    """
+    def advance(self, frame_dt: float) -> int:
+        if frame_dt < 0:
+            raise ValueError("frame_dt must not be negative")
+
+        self.accumulator += min(frame_dt, self.max_frame_time)
+
+        steps = 0
+        while self.accumulator >= self.step_dt:
+            self.accumulator -= self.step_dt
+            steps += 1
+
+        return steps
+
+    """
+    Discards any time that has not been simulated yet.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def reset(self) -> None:
+        self.accumulator = 0.0
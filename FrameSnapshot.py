@@ -0,0 +1,159 @@
+from collections import namedtuple
+
+# Copy of the state of a brick that is needed to draw it
+BrickState = namedtuple("BrickState", ["x", "y", "width", "height", "color", "durability", "hits"])
+
+
+class FrameSnapshot:
+    """
+    Everything that is drawn during a game at the end of a simulation step: the positions of the moving objects
+    (paddle, balls and dropped modifiers), the bricks, and the values shown in the HUD.
+    Two snapshots are interpolated to render the game between simulation steps.
+    A snapshot is not changed after it has been created, so it can be drawn on one thread while the game is updated on another.
+
+    Balls are keyed by their object, so the same ball can be found in both snapshots. Dropped modifiers are keyed by their id,
+    since a modifier object that left the game can be reused for a new drop in the same step.
+    Objects that only exist in the newer snapshot are drawn at their current position.
+
+    Attributes
+    ----------
+    paddle : tuple[float, float, float, float]
+        The x, y, width and height of the paddle.
+    balls : dict[Ball, tuple[float, float, float]]
+        The x, y and radius of each ball.
+    modifiers : dict[int, tuple[float, float, float, str]]
+        The x, y, radius and color of each dropped modifier.
+    bricks : tuple[BrickState, ...] | None
+        The bricks, if they were captured. A snapshot shares the tuple of the snapshot before it if no brick changed.
+    level : int
+        The current level.
+    lives : int
+        The lives left.
+    score : int
+        The total score, including the points of the current level.
+    elapsed_time : float
+        The time since the game started.
+    time_spent : float
+        The time spent on the current level. 0 until the level has been started.
+    active_modifiers : tuple[tuple[str, float], ...]
+        The name and remaining time of each active modifier.
+
+    Methods
+    -------
+    capture(game_manager: GameManager, bricks: tuple[BrickState, ...] | None = None) -> FrameSnapshot
+        Creates a snapshot of the current state of the game.
+    capture_bricks(brick_grid: BrickGrid) -> tuple[BrickState, ...]
+        Copies the state of every brick in a grid.
+    interpolate(previous: FrameSnapshot, alpha: float) -> FrameSnapshot
+        Creates a snapshot between a previous snapshot and this one.
+    """
+
+    def __init__(self, paddle: tuple, balls: dict, modifiers: dict, bricks: tuple = None, level: int = 1, lives: int = 0,
+                 score: int = 0, elapsed_time: float = 0, time_spent: float = 0, active_modifiers: tuple = ()):
+        self.paddle = paddle
+        self.balls = balls
+        self.modifiers = modifiers
+        self.bricks = bricks
+        self.level = level
+        self.lives = lives
+        self.score = score
+        self.elapsed_time = elapsed_time
+        self.time_spent = time_spent
+        self.active_modifiers = active_modifiers
+
+    """
+    Creates a snapshot of the current state of the game.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The GameManager object that manages the game state and objects.
+    bricks : tuple[BrickState, ...] | None, optional
+        The bricks to store in the snapshot, from capture_bricks (default is None, the bricks are not stored).
+
+    Returns
+    -------
+    FrameSnapshot
+        The snapshot of the current state.
+
+    Raises
+    ------
+    None
+    """
+    @classmethod
+    def capture(cls, game_manager, bricks: tuple = None) -> "FrameSnapshot":
+        paddle = game_manager.paddle
+
+        return cls(
+            (paddle.x, paddle.y, paddle.width, paddle.height),
+            {ball: (ball.x, ball.y, ball.radius) for ball in game_manager.balls},
+            {modifier.id: (modifier.x, modifier.y, modifier.radius, modifier.color) for modifier in game_manager.dropped_modifiers},
+            bricks,
+            game_manager.level_manager.current_level,
+            game_manager.lives,
+            game_manager.level_points + game_manager.total_points,
+            game_manager.elapsed_time,
+            game_manager.level_manager.time_spent,
+            tuple((modifier.name, modifier.time_remaining) for modifier in game_manager.active_modifiers),
+        )
+
+    """
+    Copies the state of every brick in a grid.
+
+    Parameters
+    ----------
+    brick_grid : BrickGrid
+        The bricks in the game.
+
+    Returns
+    -------
+    tuple[BrickState, ...]
+        The state of every brick.
+
+    Raises
+    ------
+    None
+    """
+    @staticmethod
+    def capture_bricks(brick_grid) -> tuple:
+        return tuple(BrickState(brick.x, brick.y, brick.width, brick.height, brick.color, brick.durability, brick.hits)
+                     for brick in brick_grid)
+
+    """
+    Creates a snapshot between a previous snapshot and this one.
+
+    Parameters
+    ----------
+    previous : FrameSnapshot
+        The snapshot of the step before this one.
+    alpha : float
+        How far to go from the previous snapshot to this one, from 0 (previous) to 1 (this).
+
+    Returns
+    -------
+    FrameSnapshot
+        The interpolated snapshot.
+
+    Raises
+    ------
+    None
+    """
+    def interpolate(self, previous: "FrameSnapshot", alpha: float) -> "FrameSnapshot":
+        def lerp(old, new):
+            return old + (new - old) * alpha
+
+        paddle = tuple(lerp(old, new) for old, new in zip(previous.paddle, self.paddle))
+
+        balls = {}
+        for ball, (x, y, radius) in self.balls.items():
+            old = previous.balls.get(ball)
+            balls[ball] = (x, y, radius) if old is None else (lerp(old[0], x), lerp(old[1], y), radius)
+
+        modifiers = {}
+        for modifier_id, (x, y, radius, color) in self.modifiers.items():
+            old = previous.modifiers.get(modifier_id)
+            modifiers[modifier_id] = (x, y, radius, color) if old is None else (lerp(old[0], x), lerp(old[1], y), radius, color)
+
+        # Everything else is shown as it is in this snapshot
+        return FrameSnapshot(paddle, balls, modifiers, self.bricks, self.level, self.lives, self.score,
+                             self.elapsed_time, self.time_spent, self.active_modifiers)
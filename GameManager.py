@@ -1,10 +1,14 @@
-from SoundManager import SoundManager
+from SoundManager import SoundManager, NullSoundManager
 from LevelManager import LevelManager
 from Brick import Brick
 from Paddle import Paddle
 from Ball import Ball
+from BrickGrid import BrickGrid
+from BallCollider import BallCollider
+from PlayerInput import PlayerInput
+from ModifierFactory import ModifierFactory
 import random
-from copy import deepcopy
+import math
 
 class GameManager:
     """
@@ -21,10 +25,33 @@ class GameManager:
         Size of the game window.
     MODIFIER_DROP_RATE : float
         Chance to drop a modifier each time a brick is destroyed.
+    RANDOM_DROP_CHANCE : int
+        While no modifier is falling, a modifier is dropped from the top with a chance of 1 in RANDOM_DROP_CHANCE each update.
+    MAX_SWEEP_HITS : int
+        Maximum number of hits resolved for a single ball in one update when using swept collisions.
+    VECTORIZED_KERNEL_MIN_BALLS : int
+        Number of balls from which the "auto" collision kernel switches to the vectorized kernel.
     dt : float
         Time delta for the game loop.
+    collision_mode : str
+        How ball collisions are detected. "discrete" checks the end position of each move,
+        "swept" finds the time of impact along the move so fast balls cannot pass through bricks or the paddle.
+    ball_backend : str
+        How the balls are stored. "objects" keeps a list of Ball objects,
+        "batch" keeps them in a NumPy BallBatch so moving, edge bouncing and speed capping are done for all balls at once.
+    collision_kernel : str
+        How discrete collisions are found. "scalar" checks each ball against the nearby bricks in the brick grid,
+        "vectorized" checks all balls against all bricks in one NumPy pass, "auto" picks based on the number of balls.
+    brick_broadphase : BrickBroadphase | None
+        Brick arrays used by the vectorized collision kernel. Created the first time the kernel is used.
+    ball_collisions : bool
+        Flag to check if balls bounce off each other.
+    ball_collider : BallCollider
+        Finds and resolves collisions between balls, and counts the pairs tested and resolved.
     modifiers : list[Modifier]
-        List of modifiers to be used in the game.
+        List of modifiers to be used in the game. Dropped modifiers are copies of these.
+    modifier_factory : ModifierFactory
+        Creates the dropped modifiers from the modifiers list, and recycles them when they leave the game.
     level_points : int
         Points for the current level.
     total_points : int
@@ -39,6 +66,10 @@ class GameManager:
         Flag to check if the game has been lost.
     dropped_modifiers : list[Modifier]
         List of dropped modifiers in the game.
+    modifiers_dropped : dict[str, int]
+        Number of modifiers dropped since the game started, by modifier name.
+    modifiers_caught : dict[str, int]
+        Number of modifiers caught by the paddle since the game started, by modifier name.
     active_modifiers : list[Modifier]
         List of active modifiers in the game.
     death_disabled : bool
@@ -47,36 +78,66 @@ class GameManager:
         Time elapsed since the game started.
     name_entered : bool
         Flag to check if the player has entered their name.
-    sound_manager : SoundManager
-        Sound manager to handle sound effects and music.
+    sound_manager : SoundManager | NullSoundManager
+        Sound manager to handle sound effects and music. A NullSoundManager in games without an audio device.
+    random : random.Random
+        Random number generator for everything random in the game. Games created with the same seed and given the same input play out the same.
+    log : Callable[[str], None]
+        Function used to report game events, such as dropped and activated modifiers. Does nothing in quiet games.
     level_manager : LevelManager
         Level manager to handle level state and progression.
     paddle : Paddle
         Paddle object for the player.
-    balls : list[Ball]
-        List of ball objects in the game.
-    bricks : list[Brick]
-        List of brick objects in the game.
+    balls : list[Ball] | BallBatch
+        List of ball objects in the game. A BallBatch when the batch ball backend is used.
+    bricks : BrickGrid
+        Grid of brick objects in the game. Also used to find the bricks near a ball.
     
     Methods
     -------
+    create_headless(seed: int | None = None, window_size: int = 500, **kwargs) -> GameManager
+        Create a quiet game with the default modifiers that runs without a window or audio device.
+    step(dt: float, inputs: int = PlayerInput.NONE) -> None
+        Apply the player's input and update the game state by dt, without needing a window.
+    apply_input(inputs: int) -> None
+        Move the paddle, launch the ball or restart the game based on the player's input.
+    snapshot() -> bytes
+        Pack the state of the game into a flat buffer.
+    restore(state: bytes) -> None
+        Restore the state of the game from a buffer made by snapshot.
     update() -> None
         Update the game state, including ball positions, dropped modifiers, and active modifiers.
     update_balls() -> None
         Update the position of the balls and check for collisions with edges.
+    update_balls_batch() -> None
+        Update the position of the balls stored in a BallBatch and check for collisions with edges.
+    move_ball_swept(ball: Ball) -> None
+        Move a ball through the current time step, resolving the paddle and brick hits along the way in order.
     update_dropped_modifiers() -> None
         Update the position of dropped modifiers and check for collisions with the paddle.
     update_active_modifiers() -> None
         Update the time remaining for active modifiers and deactivate them if time is up.
+    remove_dropped_modifier(modifier: Modifier) -> None
+        Remove a dropped modifier that left the screen from the game.
+    catch_modifier(modifier: Modifier) -> None
+        Activate a dropped modifier caught by the paddle and count it.
+    expire_modifier(modifier: Modifier) -> None
+        Deactivate an active modifier that ran out of time.
     update_paddle_width() -> None
         Update the paddle width based on the current width and base width.
     handle_ball_collisions() -> None
-        Handle ball collisions with the paddle, bricks, and other balls.
+        Handle ball collisions with the paddle and bricks.
+    handle_ball_collision(ball: Ball) -> None
+        Handle the collision of one ball with the paddle or a brick.
+    handle_ball_collisions_vectorized() -> None
+        Handle ball collisions with the paddle and bricks, using the vectorized collision kernel to find them.
+    handle_paddle_collision(ball: Ball) -> None
+        Handle the collision between a ball and the paddle.
     drop_random_modifier() -> None
         Drop a random modifier from the top of the screen.
     calculate_score() -> int
         Calculate the score based on elapsed time and maximum points.
-    handle_brick_collision(ball: Ball, brick: Brick) -> None
+    handle_brick_collision(ball: Ball, brick: Brick, direction: str = "y") -> None
         Handle the collision between a ball and a brick, including damage and dropping modifiers.
     drop_modifier_from_brick(brick: Brick) -> None
         Drop a modifier from a brick when it is destroyed.
@@ -90,9 +151,9 @@ class GameManager:
         Decrease the number of lives by 1 and check for game over.
     reset_all_modifiers() -> None
         Deactivate all active modifiers and clear the dropped modifiers list.
-    generate_objects() -> tuple[Paddle, list[Ball]]
+    generate_objects() -> tuple[Paddle, list[Ball] | BallBatch]
         Generate the paddle and balls for the game.
-    generate_bricks() -> list[Brick]
+    generate_bricks() -> BrickGrid
         Generate the bricks for the game in a grid pattern.
     win() -> None
         Handle the win condition, including resetting the game state and increasing the level.
@@ -100,18 +161,32 @@ class GameManager:
         Handle the lose condition, including resetting the game state and stopping the music.
     """
 
-    def __init__(self, modifiers, WINDOW_SIZE):
+    def __init__(self, modifiers, WINDOW_SIZE, ball_backend="objects", sound_manager=None, seed=None, quiet=False, level_manager=None):
         
         self.MAX_POINTS = 100000   # Maximum points for each level
         self.MAX_BALL_SPEED = 1500   # Speed cap for the ball
         self.WINDOW_SIZE = WINDOW_SIZE   # Size of the game window
         self.MODIFIER_DROP_RATE = 0.2  # 20% chance to drop a modifier each time a brick is destroyed
+        self.RANDOM_DROP_CHANCE = 500   # 1 in 500 chance each update to drop a modifier from the top when none are falling
+
+        self.MAX_SWEEP_HITS = 8   # Maximum number of hits resolved for one ball per update in swept collision mode
+        self.VECTORIZED_KERNEL_MIN_BALLS = 16   # Number of balls from which the "auto" collision kernel is vectorized
 
         if self.MODIFIER_DROP_RATE > 1 or self.MODIFIER_DROP_RATE < 0:
             raise ValueError("Modifier drop rate must be between 0 and 1")
 
         self.dt = 0.02   # Updated from the main loop. Set to 0.02 to avoid division by zero error when calculating FPS.
+        self.collision_mode = "discrete"   # "discrete" checks for collisions after moving, "swept" checks along the movement
+        self.ball_backend = ball_backend   # "objects" stores the balls in a list, "batch" stores them in NumPy arrays
+        self.collision_kernel = "scalar"   # "scalar", "vectorized" or "auto". Can be changed at runtime to compare them.
+        self.brick_broadphase = None   # Created when the vectorized collision kernel is first used
+        self.ball_collisions = False   # Flag to check if balls bounce off each other
+        self.ball_collider = BallCollider()   # Handles collisions between balls when ball_collisions is enabled
+
+        if self.ball_backend not in ("objects", "batch"):
+            raise ValueError("ball_backend must be 'objects' or 'batch'")
         self.modifiers = modifiers   # List of modifiers to be used in the game
+        self.modifier_factory = ModifierFactory()   # Copies modifiers when they are dropped, reusing the ones that left the game
         self.level_points = self.MAX_POINTS   # Points for the current level
         self.total_points = 0   # Total points accumulated in the game. Level points are added to this when the level is completed.
         self.lives = 3   # Number of lives left in the game
@@ -119,19 +194,178 @@ class GameManager:
         self.won_game = False   # Flag to check if the game has been won
         self.lost_game = False   # Flag to check if the game has been lost
         self.dropped_modifiers = []   # List of dropped modifiers in the game
+        self.modifiers_dropped = {}   # Number of dropped modifiers by name, used to measure how often each modifier is caught
+        self.modifiers_caught = {}   # Number of caught modifiers by name
         self.active_modifiers = []   # List of active modifiers in the game
         self.death_disabled = False   # Flag to check if the ball death is disabled (ball will bounce on bottom edge of the screen)
         self.elapsed_time = 0   # Time elapsed since the game started. Updated using dt in the update method.
         self.name_entered = False   # Flag to check if the player has entered their name
 
-        # Initialise sound manager and level manager
-        self.sound_manager = SoundManager()
-        self.level_manager = LevelManager()
+        self.random = random.Random(seed)   # Random number generator for the game. Seeded to make the game reproducible.
+        self.log = (lambda message: None) if quiet else print   # Reports game events. Quiet games report nothing.
+
+        # Initialise sound manager and level manager.
+        # A sound manager can be passed in, e.g. a NullSoundManager to run without an audio device,
+        # and a level manager, e.g. one with a different level progression.
+        self.sound_manager = sound_manager if sound_manager is not None else SoundManager()
+        self.level_manager = level_manager if level_manager is not None else LevelManager()
         
         # Initialise game objects
         self.paddle, self.balls = self.generate_objects()
         self.bricks = self.generate_bricks()
 
+    """
+    Create a quiet game with the default modifiers that runs without a window or audio device.
+    Used for automated runs, e.g. simulations and checking the scores of recorded games.
+
+    Parameters
+    ----------
+    seed : int | None, optional
+        Seed for the game's random number generator (default is None, a random seed).
+    window_size : int, optional
+        Size of the game window (default is 500).
+    **kwargs
+        Other arguments for the GameManager, e.g. ball_backend or level_manager.
+
+    Returns
+    -------
+    GameManager
+        The game.
+
+    Raises
+    ------
+    None
+    """
+    @classmethod
+    def create_headless(cls, seed: int = None, window_size: int = 500, **kwargs) -> "GameManager":
+        # Imported here, since Modifier imports GameManager
+        from Modifier import create_default_modifiers
+
+        game_manager = cls([], window_size, sound_manager=NullSoundManager(), seed=seed, quiet=True, **kwargs)
+        game_manager.modifiers = create_default_modifiers(game_manager.random)
+        return game_manager
+
+    """
+    Apply the player's input and update the game state by dt.
+    This runs the game logic without Main, e.g. for headless simulations. A game that is over only reacts to the restart input.
+
+    Parameters
+    ----------
+    dt : float
+        The time to update the game by, in seconds.
+    inputs : int, optional
+        The player's input, as PlayerInput flags (default is PlayerInput.NONE).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If dt is less than 0.
+    """
+    def step(self, dt: float, inputs: int = PlayerInput.NONE) -> None:
+        if dt < 0:
+            raise ValueError("dt must not be negative")
+
+        self.dt = dt
+        self.apply_input(inputs)
+
+        if not self.lost_game:
+            self.update()
+
+    """
+    Move the paddle, launch the ball or restart the game based on the player's input.
+    The paddle only moves once the game has started, and not past the edges of the screen.
+
+    Parameters
+    ----------
+    inputs : int
+        The player's input, as PlayerInput flags.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def apply_input(self, inputs: int) -> None:
+        # Get the x-coordinates for the paddle edges
+        paddle_left_edge = self.paddle.x
+        paddle_right_edge = self.paddle.x + self.paddle.width
+
+        if inputs & PlayerInput.LEFT:
+            if self.game_started:
+                # Move paddle if it is not at the edge of the screen
+                if paddle_left_edge > 0:
+                    self.paddle.move('left', self.dt)
+
+        if inputs & PlayerInput.RIGHT:
+            if self.game_started:
+                # Move paddle if it is not at the edge of the screen
+                if paddle_right_edge < self.WINDOW_SIZE:
+                    self.paddle.move('right', self.dt)
+
+        if inputs & PlayerInput.LAUNCH:
+            if not self.game_started:
+                # Start game
+                self.balls[0].begin()
+                self.game_started = True
+
+        if inputs & PlayerInput.RESTART:
+            # Restart game
+            self.reset(restart_game=True)
+
+    """
+    Pack the state of the game into a flat buffer: the paddle, balls, bricks, dropped and active modifiers, level manager,
+    scores, timers and the state of the random number generator.
+    Used to save checkpoints and rewind the game, e.g. to seek in a replay. Unlike deepcopy, the sound manager is not copied.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    bytes
+        The packed state.
+
+    Raises
+    ------
+    None
+    """
+    def snapshot(self) -> bytes:
+        # Imported here, since StateBuffer imports Modifier, which imports GameManager
+        from StateBuffer import pack_state
+
+        return pack_state(self)
+
+    """
+    Restore the state of the game from a buffer made by snapshot, of this game or another game with the same settings.
+    The game continues exactly as the game the state was packed from would have.
+
+    Parameters
+    ----------
+    state : bytes
+        The packed state.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If state is not a buffer made by snapshot.
+    """
+    def restore(self, state: bytes) -> None:
+        from StateBuffer import unpack_state
+
+        unpack_state(self, state)
+
     """
     Update the game state, including ball positions, dropped modifiers, and active modifiers.
     Runs every frame in the main loop.
@@ -171,18 +405,26 @@ class GameManager:
         # Update paddle width if it is shrinking or growing
         self.update_paddle_width()
 
-        # Handle ball collisions
-        self.handle_ball_collisions()
+        # Handle ball collisions. In swept mode they are already handled while the balls move.
+        if self.collision_mode == "discrete":
+            self.handle_ball_collisions()
+
+        # Bounce balls off each other
+        if self.ball_collisions:
+            self.ball_collider.handle_collisions(self.balls)
 
         # If there are no dropped modifiers, randomly drop a modifier from the top
         if len(self.dropped_modifiers) == 0 and self.game_started:
-            random_num = random.randint(1, 500)
+            random_num = self.random.randint(1, self.RANDOM_DROP_CHANCE)
             if random_num == 1:
                 self.drop_random_modifier()
 
         # Cap ball speed
-        for ball in self.balls:
-            ball.speed = min(ball.speed, self.MAX_BALL_SPEED)
+        if self.ball_backend == "batch":
+            self.balls.cap_speed(self.MAX_BALL_SPEED)
+        else:
+            for ball in self.balls:
+                ball.speed = min(ball.speed, self.MAX_BALL_SPEED)
 
         self.level_points = self.calculate_score()
 
@@ -202,15 +444,32 @@ class GameManager:
 
     Raises
     ------
-    None
+    ValueError
+        If the collision mode is not "discrete" or "swept".
     """
     def update_balls(self) -> None:
+        if self.collision_mode not in ("discrete", "swept"):
+            raise ValueError("collision_mode must be 'discrete' or 'swept'")
+
+        # Batched balls are moved all at once. Swept collisions need each ball to be moved on its own.
+        if self.ball_backend == "batch" and self.collision_mode == "discrete":
+            self.update_balls_batch()
+            return
+
+        balls = self.balls
 
         # A copy of self.balls is used (by adding [:] at the end) to avoid modifying the list while iterating over it
-        for ball in self.balls[:]:
+        for ball in balls[:]:
 
             # Update ball position
-            ball.move(self.dt)
+            if self.collision_mode == "swept":
+                self.move_ball_swept(ball)
+
+                # A brick hit can win the level, which replaces the balls. The remaining old balls should not be updated.
+                if self.balls is not balls:
+                    break
+            else:
+                ball.move(self.dt)
 
             if ball.is_dead:
                 # If the ball is dead, remove it from the game
@@ -220,10 +479,111 @@ class GameManager:
                 if len(self.balls) <= 0:
                     self.reset()
 
-            else:
-                # Handle collisions with edges
+            elif self.collision_mode == "discrete":
+                # Handle collisions with edges. In swept mode the ball already bounced off them while moving.
                 ball.handle_edge_bounce(self, self.WINDOW_SIZE)     
 
+    """
+    Update the position of the balls stored in a BallBatch.
+    Dead balls are removed and the remaining balls are bounced off the edges, the same as update_balls does for a list of balls.
+
+    If all balls are dead, reset the game.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def update_balls_batch(self) -> None:
+        # Update ball positions
+        self.balls.move(self.dt)
+
+        # Remove dead balls. If all balls are dead, reset the game.
+        if self.balls.remove_dead() > 0 and len(self.balls) <= 0:
+            self.reset()
+        else:
+            # Handle collisions with edges
+            self.balls.handle_edge_bounce(self, self.WINDOW_SIZE)
+
+    """
+    Move a ball through the current time step using swept collision detection.
+    The earliest paddle, brick or window edge hit along the movement is found, the ball is moved to the point of impact and bounced
+    using the contact normal, and the rest of the movement continues from there.
+    This is repeated until the ball has moved the whole time step, or MAX_SWEEP_HITS hits have been resolved.
+    The edges are part of the sweep, so the ball cannot cross one during a long time step, and Ball.handle_edge_bounce is not used.
+    A ball that can die is marked as dead once it has left the bottom of the screen, the same as in Ball.handle_edge_bounce.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball to move.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def move_ball_swept(self, ball: Ball) -> None:
+        time_left = self.dt
+
+        for _ in range(self.MAX_SWEEP_HITS):
+            dx = ball.speed * ball.vx * time_left
+            dy = ball.speed * ball.vy * time_left
+
+            # The ball is not moving, so it cannot hit anything
+            if dx == 0 and dy == 0:
+                break
+
+            # Only the bricks in the grid cells covered by the whole movement can be hit
+            nearby_bricks = self.bricks.query(min(ball.x, ball.x + dx) - ball.radius, min(ball.y, ball.y + dy) - ball.radius,
+                                                  max(ball.x, ball.x + dx) + ball.radius, max(ball.y, ball.y + dy) + ball.radius)
+
+            hit = ball.sweep(dx, dy, self.paddle, nearby_bricks, self.WINDOW_SIZE)
+
+            # If nothing is hit, move the rest of the way
+            if hit is None:
+                ball.move(time_left)
+                break
+
+            # Move the ball to the point of impact
+            time_of_impact, collision_object, direction = hit
+            ball.move(time_left * time_of_impact)
+            time_left -= time_left * time_of_impact
+
+            if collision_object is None:
+                # Hit an edge of the window
+                ball.bounce(direction)
+                self.sound_manager.play_wall_hit_sound()
+            elif isinstance(collision_object, Paddle):
+                if direction == "y" and ball.vy > 0:
+                    # Hit the top of the paddle, bounce using the paddle angle
+                    ball.paddle_hit(45, self.paddle)
+                else:
+                    # Hit the side of the paddle
+                    ball.bounce(direction)
+
+                self.sound_manager.play_paddle_hit_sound()
+            else:
+                self.handle_brick_collision(ball, collision_object, direction)
+
+                # Stop if the hit won the level, the game has been reset
+                if not self.game_started:
+                    break
+
+        # The ball dies once its top edge has left the screen
+        if ball.y - ball.radius >= self.WINDOW_SIZE and not ball.death_disabled:
+            ball.is_dead = True
+
     """
     Update the position of dropped modifiers, check for collisions with the paddle, and check for out of bounds.
 
@@ -250,11 +610,11 @@ class GameManager:
             
             # If the modifier is out of bounds, remove it from the game
             if modifier.is_out_of_bounds(self.WINDOW_SIZE):
-                self.dropped_modifiers.remove(modifier)
+                self.remove_dropped_modifier(modifier)
 
             # If the modifier is caught by the paddle, activate it
             elif modifier.is_caught(self.paddle):
-                modifier.activate(self)
+                self.catch_modifier(modifier)
 
     """
     Update the time remaining for active modifiers and deactivate them if time is up.
@@ -280,7 +640,71 @@ class GameManager:
 
             # If the time remaining of the modifier is less than or equal to 0, deactivate it
             if modifier.time_remaining <= 0:
-                modifier.deactivate(self)
+                self.expire_modifier(modifier)
+
+    """
+    Remove a dropped modifier that left the screen from the game, and give it back to the modifier factory.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The dropped modifier.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def remove_dropped_modifier(self, modifier) -> None:
+        self.dropped_modifiers.remove(modifier)
+        self.modifier_factory.release(modifier)
+
+    """
+    Activate a dropped modifier caught by the paddle, and count it in the modifiers caught.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The dropped modifier.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def catch_modifier(self, modifier) -> None:
+        self.modifiers_caught[modifier.name] = self.modifiers_caught.get(modifier.name, 0) + 1
+        modifier.activate(self)
+
+        # Modifiers without a duration take effect once and are not kept in the active modifiers list
+        if not modifier.time_remaining:
+            self.modifier_factory.release(modifier)
+
+    """
+    Deactivate an active modifier that ran out of time, and give it back to the modifier factory.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The active modifier.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def expire_modifier(self, modifier) -> None:
+        modifier.deactivate(self)
+        self.modifier_factory.release(modifier)
 
     """
     Check if the paddle width is shrinking or growing and update its width accordingly.
@@ -322,8 +746,8 @@ class GameManager:
                 self.paddle.width = self.paddle.base_width
 
     """
-    Handle ball collisions with the paddle, bricks, and other balls.
-    Check for collisions and handle them accordingly.
+    Handle ball collisions with the paddle and bricks.
+    Check for collisions and handle them accordingly. Collisions between balls are handled by the ball collider.
 
     Parameters
     ----------
@@ -335,30 +759,131 @@ class GameManager:
 
     Raises
     ------
-    None
+    ValueError
+        If the collision kernel is not "scalar", "vectorized" or "auto".
     """
     def handle_ball_collisions(self) -> None:
+        if self.collision_kernel not in ("scalar", "vectorized", "auto"):
+            raise ValueError("collision_kernel must be 'scalar', 'vectorized' or 'auto'")
+
+        # Use the vectorized kernel if selected, or if there are many balls in auto mode
+        if self.collision_kernel == "vectorized" or (self.collision_kernel == "auto" and len(self.balls) >= self.VECTORIZED_KERNEL_MIN_BALLS):
+            self.handle_ball_collisions_vectorized()
+            return
+
         for ball in self.balls:
+            self.handle_ball_collision(ball)
+
+    """
+    Handle the collision of one ball with the paddle or a brick.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball to check.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def handle_ball_collision(self, ball: Ball) -> None:
+        # Only the bricks in the grid cells overlapped by the ball can be hit
+        nearby_bricks = self.bricks.query(ball.x - ball.radius, ball.y - ball.radius, ball.x + ball.radius, ball.y + ball.radius)
+
+        # Get collision object for the ball (or none if no collision)
+        collision_object = ball.check_collision(self.paddle, nearby_bricks)
+
+        # If there is a collision object, handle the collision
+        if collision_object:
+
+            # If the collision object is the paddle, handle paddle collision
+            if isinstance(collision_object, Paddle):
+                self.handle_paddle_collision(ball)
 
-            # Get collision object for the ball (or none if no collision)
-            collision_object = ball.check_collision(self.paddle, self.bricks, self.balls)
+            # If the collision object is a brick, handle brick collision
+            elif isinstance(collision_object, Brick):
+                self.handle_brick_collision(ball, collision_object)
 
-            # If there is a collision object, handle the collision
-            if collision_object:
+    """
+    Handle ball collisions with the paddle and bricks, using the vectorized collision kernel to find them.
+    The collisions are handled in ball order, with the same result as handle_ball_collisions.
 
-                # If the collision object is the paddle, handle paddle collision
-                if isinstance(collision_object, Paddle):
+    Parameters
+    ----------
+    None
 
-                    # Handle paddle collision only if the ball is moving
-                    # This is to avoid the ball bouncing off the paddle before the game starts
-                    if ball.vy > 0 or ball.vx > 0:
-                        ball.paddle_hit(45, self.paddle)
+    Returns
+    -------
+    None
 
-                        self.sound_manager.play_paddle_hit_sound()
+    Raises
+    ------
+    None
+    """
+    def handle_ball_collisions_vectorized(self) -> None:
+        # NumPy is only needed for the vectorized kernel, so it is imported here
+        if self.brick_broadphase is None:
+            from BrickBroadphase import BrickBroadphase
+            self.brick_broadphase = BrickBroadphase()
+
+        # Find all collisions at once
+        self.brick_broadphase.sync(self.bricks)
+        ball_indices, targets = self.brick_broadphase.contacts(self.balls, self.paddle)
+
+        balls = self.balls
+        for ball_index, target in zip(ball_indices.tolist(), targets.tolist()):
+            ball = balls[ball_index]
+
+            if target == -1:
+                self.handle_paddle_collision(ball)
+                continue
+
+            brick = self.brick_broadphase.bricks[target]
+
+            if brick.is_destroyed():
+                # The brick was destroyed by an earlier ball in this update, so check the ball against the remaining nearby bricks
+                nearby_bricks = self.bricks.query(ball.x - ball.radius, ball.y - ball.radius, ball.x + ball.radius, ball.y + ball.radius)
+                brick = ball.check_collision(self.paddle, nearby_bricks)
+                if brick is None:
+                    continue
+
+            self.handle_brick_collision(ball, brick)
+
+            # If the hit won the level, the balls have been replaced and the contacts are out of date.
+            # handle_ball_collisions keeps checking the rest of the old balls against the new bricks, so the same is done here.
+            if self.balls is not balls:
+                for index in range(ball_index + 1, len(balls)):
+                    self.handle_ball_collision(balls[index])
+                break
 
-                # If the collision object is a brick, handle brick collision
-                elif isinstance(collision_object, Brick):
-                    self.handle_brick_collision(ball, collision_object)
+    """
+    Handle the collision between a ball and the paddle.
+    Bounce the ball off the paddle based on where it hit, and play sound effect.
+
+    Parameters
+    ----------
+    ball : Ball
+        The ball object that collided with the paddle.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def handle_paddle_collision(self, ball: Ball) -> None:
+        # Handle paddle collision only if the ball is moving
+        # This is to avoid the ball bouncing off the paddle before the game starts
+        if ball.vy > 0 or ball.vx > 0:
+            ball.paddle_hit(45, self.paddle)
+
+            self.sound_manager.play_paddle_hit_sound()
 
     """
     Drop a random modifier from the top of the screen.
@@ -380,10 +905,11 @@ class GameManager:
     def drop_random_modifier(self) -> None:
         
         # Make a copy of a random modifier and set its position to the top of the screen
-        modifier = deepcopy(random.choice(self.modifiers))
-        modifier.x = random.randint(0 + modifier.radius * 2, self.WINDOW_SIZE - modifier.radius * 2)
+        modifier = self.modifier_factory.create(self.random.choice(self.modifiers))
+        modifier.x = self.random.randint(0 + modifier.radius * 2, self.WINDOW_SIZE - modifier.radius * 2)
         modifier.y = 0 + modifier.radius
-        print(f'Dropped modifier: {modifier.name}')
+        self.log(f'Dropped modifier: {modifier.name}')
+        self.modifiers_dropped[modifier.name] = self.modifiers_dropped.get(modifier.name, 0) + 1
         self.dropped_modifiers.append(modifier)
 
     """
@@ -421,6 +947,8 @@ class GameManager:
         The ball object that collided with the brick.
     brick : Brick
         The brick object that was hit by the ball.
+    direction : str, optional
+        The direction to bounce the ball in (default is "y").
     
     Returns
     -------
@@ -431,7 +959,7 @@ class GameManager:
     ValueError
         If ball is not an instance of Ball or brick is not an instance of Brick.
     """
-    def handle_brick_collision(self, ball: Ball, brick: Brick) -> None:
+    def handle_brick_collision(self, ball: Ball, brick: Brick, direction: str = "y") -> None:
 
         if not isinstance(ball, Ball):
             raise ValueError("ball must be an instance of Ball")
@@ -445,8 +973,8 @@ class GameManager:
         # Play sound effect for brick hit
         self.sound_manager.play_brick_hit_sound()
 
-        # Bounce the ball off the brick in the vertical direction
-        ball.bounce("y")
+        # Bounce the ball off the brick, in the vertical direction unless the side of the brick was hit
+        ball.bounce(direction)
 
         # If the brick is destroyed, remove it from the game and check for win condition
         if brick.is_destroyed():
@@ -456,7 +984,7 @@ class GameManager:
                 self.win()
 
             # Randomly drop a modifier from the brick using the modifier drop rate
-            random_num = random.randint(1, round(1 / self.MODIFIER_DROP_RATE))
+            random_num = self.random.randint(1, round(1 / self.MODIFIER_DROP_RATE))
 
             if random_num == 1:
                 self.drop_modifier_from_brick(brick)
@@ -484,16 +1012,18 @@ class GameManager:
         if not isinstance(brick, Brick):
             raise ValueError("brick must be an instance of Brick")
 
-        # Create a copy of a randomly chosen modifier
-        modifier = deepcopy(random.choice(self.modifiers))
+        # Choose a random modifier. It is chosen even if none can be dropped, so the random numbers used by the game do not change.
+        prototype = self.random.choice(self.modifiers)
 
-        # Drop the modifier from the brick if there are less than 5 dropped modifiers.
+        # Drop a copy of the modifier from the brick if there are less than 5 dropped modifiers.
         if len(self.dropped_modifiers) < 5:
+            modifier = self.modifier_factory.create(prototype)
             modifier.set_brick(brick)
             modifier.move_to_brick()
 
-            print(f'Dropped modifier: {modifier.name}')
+            self.log(f'Dropped modifier: {modifier.name}')
 
+            self.modifiers_dropped[modifier.name] = self.modifiers_dropped.get(modifier.name, 0) + 1
             self.dropped_modifiers.append(modifier)
 
     """
@@ -559,6 +1089,8 @@ class GameManager:
         self.elapsed_time = 0
         self.level_manager.reset()
         self.total_points = 0
+        self.modifiers_dropped = {}
+        self.modifiers_caught = {}
 
         # Reset the level state
         self.reset_level_state()
@@ -635,8 +1167,11 @@ class GameManager:
         # A copy of self.active_modifiers is used (by adding [:] at the end) to avoid modifying the list while iterating over it
         for modifier in self.active_modifiers[:]:
             modifier.deactivate(self)
+            self.modifier_factory.release(modifier)
             
         # Clear the dropped modifiers list
+        for modifier in self.dropped_modifiers:
+            self.modifier_factory.release(modifier)
         self.dropped_modifiers = []
 
     """
@@ -671,6 +1206,12 @@ class GameManager:
         # Create a balls list with a ball object
         balls = [Ball(ball_starting_pos["x"], ball_starting_pos["y"], 0, 0, 5, "white", speed=self.level_manager.ball_speed)]
 
+        # Store the balls in NumPy arrays if the batch backend is used.
+        # NumPy is only needed for the batch backend, so it is imported here.
+        if self.ball_backend == "batch":
+            from BallBatch import BallBatch
+            balls = BallBatch(balls)
+
         return paddle, balls
     
     """
@@ -683,15 +1224,15 @@ class GameManager:
 
     Returns
     -------
-    bricks : list[Brick]
-        A list of brick objects created in a grid pattern.
+    bricks : BrickGrid
+        A grid of brick objects.
 
     Raises
     ------
     None
     """
-    def generate_bricks(self) -> list[Brick]:
-        bricks = []
+    def generate_bricks(self) -> BrickGrid:
+        bricks = BrickGrid(math.ceil(self.WINDOW_SIZE / BrickGrid.CELL_WIDTH))
         colors = ["red", "red", "orange", "orange", "green", "green", "yellow", "yellow"]
 
         # Create bricks in a grid pattern
@@ -704,7 +1245,7 @@ class GameManager:
                 # Durability is based on the level manager's hit multiplier
                 durability = 1 * self.level_manager.hit_multiplier
 
-                # Add the brick to the bricks list
+                # Add the brick to the bricks grid
                 bricks.append(Brick(x, y, color, durability=durability))
 
         return bricks
@@ -0,0 +1,260 @@
+import math
+from datetime import timedelta
+
+class TextWidget:
+    """
+    A line of text on the screen that keeps its rendered surface between frames.
+    The widget is bound to a value (e.g. the number of lives), and the text is only formatted and rendered again when the value changes
+    to something that is displayed differently.
+
+    Attributes
+    ----------
+    text_cache : TextCache
+        The cache used to render the text.
+    size : int
+        The font size.
+    color : str
+        The color of the text.
+    anchor : str
+        The point of the text's rect that is placed at the position, e.g. "topleft" or "center".
+    position : tuple[float, float]
+        The position of the anchor on the screen.
+    format : Callable[[object], str]
+        Function that turns the bound value into the displayed text.
+    value : object
+        The value the text was last formatted from.
+    text : str | None
+        The displayed text.
+    surface : pygame.Surface | None
+        The rendered text.
+    rect : pygame.Rect | None
+        The area of the screen the text is drawn to.
+    rebuilds : int
+        The number of times the text has been rendered.
+
+    Methods
+    -------
+    update(value: object) -> bool
+        Binds a new value to the widget, rendering the text again if the displayed text changes.
+    draw(canvas: pygame.Surface) -> pygame.Rect | None
+        Draws the text to the canvas.
+    """
+
+    def __init__(self, text_cache, size: int, color: str, anchor: str, position: tuple[float, float], format=str):
+        self.text_cache = text_cache
+        self.size = size
+        self.color = color
+        self.anchor = anchor
+        self.position = position
+        self.format = format
+        self.value = None
+        self.text = None
+        self.surface = None
+        self.rect = None
+        self.rebuilds = 0
+
+    """
+    Binds a new value to the widget. The text is formatted again only if the value changed,
+    and rendered again only if the formatted text changed.
+
+    Parameters
+    ----------
+    value : object
+        The value to display.
+
+    Returns
+    -------
+    bool
+        True if the text was rendered again, False otherwise.
+
+    Raises
+    ------
+    None
+    """
+    def update(self, value) -> bool:
+        if value == self.value and self.text is not None:
+            return False
+        self.value = value
+
+        text = self.format(value)
+        if text == self.text:
+            return False
+
+        self.text = text
+        self.surface = self.text_cache.render(text, self.size, self.color)
+        self.rect = self.surface.get_rect(**{self.anchor: self.position})
+        self.rebuilds += 1
+        return True
+
+    """
+    Draws the text to the canvas. Nothing is drawn before the widget has been given a value.
+
+    Parameters
+    ----------
+    canvas : pygame.Surface
+        The surface to draw the text to.
+
+    Returns
+    -------
+    pygame.Rect | None
+        The area of the canvas that was drawn to, or None if nothing was drawn.
+
+    Raises
+    ------
+    None
+    """
+    def draw(self, canvas):
+        if self.surface is None:
+            return None
+        return canvas.blit(self.surface, self.rect)
+
+
+class Hud:
+    """
+    The text shown during a game: the top bar (level, lives, score, FPS and timer) and the list of active modifiers.
+    Every line is a TextWidget, so a frame where nothing visible changed does not format or render any text.
+
+    Attributes
+    ----------
+    window_size : int
+        The size of the window in pixels.
+    level : TextWidget
+        The current level.
+    lives : TextWidget
+        The lives left.
+    score : TextWidget
+        The total score, including the points of the current level.
+    fps : TextWidget
+        The average FPS.
+    timer : TextWidget
+        The time since the game started.
+    modifier_lines : list[TextWidget]
+        One line per active modifier type, bound to the displayed name and the shortest remaining time.
+    fps_list : list[float]
+        The FPS of the last 30 frames.
+
+    Methods
+    -------
+    update(frame: FrameSnapshot, frame_dt: float) -> None
+        Updates the widgets with the game state in a snapshot.
+    update_modifier_lines(active_modifiers: tuple[tuple[str, float], ...]) -> None
+        Updates the lines of the active modifier list.
+    draw(canvas: pygame.Surface) -> list[pygame.Rect]
+        Draws all widgets to the canvas.
+    """
+
+    def __init__(self, text_cache, window_size: int):
+        self.text_cache = text_cache
+        self.window_size = window_size
+
+        # Top bar
+        self.level = TextWidget(text_cache, 12, "white", "topleft", (5, 4), lambda level: f'Level: {level}')
+        self.lives = TextWidget(text_cache, 12, "white", "center", (window_size / 4, 11), lambda lives: f'Lives: {lives}')
+        self.score = TextWidget(text_cache, 12, "white", "center", (window_size / 2, 11))
+        self.fps = TextWidget(text_cache, 12, "white", "center", (window_size / 4 * 3, 11), lambda fps: f'FPS: {fps}')
+        self.timer = TextWidget(text_cache, 12, "white", "topright", (window_size - 5, 4),
+                                lambda seconds: str(timedelta(seconds=seconds)).removeprefix('0:'))
+
+        # Active modifier list
+        self.modifier_lines = []
+
+        self.fps_list = []
+
+    """
+    Updates the widgets with the game state in a snapshot. Only the widgets whose displayed text changed are rendered again.
+    The HUD only reads the snapshot, so it can be drawn while the game is being updated on another thread.
+
+    Parameters
+    ----------
+    frame : FrameSnapshot
+        The game state to show.
+    frame_dt : float
+        The time the last frame took, in seconds.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def update(self, frame, frame_dt: float) -> None:
+        self.level.update(frame.level)
+        self.lives.update(frame.lives)
+        self.score.update(frame.score)
+        self.timer.update(math.floor(frame.elapsed_time))
+
+        # Calculate FPS using average from last 30 frames.
+        # Frames shorter than the clock's 1 ms resolution are measured as 0 and are left out.
+        if frame_dt > 0:
+            self.fps_list.append(1 / frame_dt)
+            if len(self.fps_list) > 30:
+                self.fps_list.pop(0)
+            self.fps.update(round(sum(self.fps_list) / len(self.fps_list), 1))
+
+        self.update_modifier_lines(frame.active_modifiers)
+
+    """
+    Updates the lines of the active modifier list.
+    Each line is bound to its displayed name and its remaining time rounded to the displayed 0.1 s,
+    so a line is only formatted again when one of them changes.
+
+    Parameters
+    ----------
+    active_modifiers : tuple[tuple[str, float], ...]
+        The name and remaining time of each active modifier.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def update_modifier_lines(self, active_modifiers) -> None:
+        # Group the remaining times of the active modifiers by their name, in the order they were activated
+        groups = {}
+        for name, time_remaining in active_modifiers:
+            groups.setdefault(name, []).append(time_remaining)
+
+        # Add lines for new modifier types, and remove lines for modifier types that are no longer active
+        while len(self.modifier_lines) < len(groups):
+            i = len(self.modifier_lines)
+            self.modifier_lines.append(TextWidget(self.text_cache, 12, "white", "bottomleft", (10, 150 + i * 15),
+                                                  lambda line: f'{line[0]}: {line[1]:.1f}s'))
+        del self.modifier_lines[len(groups):]
+
+        for line, (name, times_remaining) in zip(self.modifier_lines, groups.items()):
+            count = len(times_remaining)   # Number of active instances of the modifier
+            time_remaining = min(times_remaining)   # Shortest remaining time
+
+            # Format the display name, showing count if there is more than 1
+            display_name = f'{name} (x{count})' if count > 1 else name
+            line.update((display_name, round(time_remaining, 1)))
+
+    """
+    Draws all widgets to the canvas.
+
+    Parameters
+    ----------
+    canvas : pygame.Surface
+        The surface to draw the HUD to.
+
+    Returns
+    -------
+    list[pygame.Rect]
+        The areas of the canvas that were drawn to.
+
+    Raises
+    ------
+    None
+    """
+    def draw(self, canvas) -> list:
+        rects = []
+        for widget in (self.timer, self.fps, self.lives, self.level, self.score, *self.modifier_lines):
+            rect = widget.draw(canvas)
+            if rect is not None:
+                rects.append(rect)
+        return rects
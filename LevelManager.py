@@ -8,15 +8,23 @@ class LevelManager:
         The current level number.
     hit_multiplier : int
         The multiplier applied to the durability of the bricks.
-        Same as the current level number.
+        Starts at 1, increases by hit_multiplier_step for each level.
     ball_speed : int
         The initial speed of the balls.
-        Starts at 300, increases by 50 for each level.
+        Starts at base_ball_speed + ball_speed_step, increases by ball_speed_step for each level.
     max_time : int
         The maximum time allowed for the current level in seconds.
-        Starts at 120, increases by 120 for each level.
+        Starts at time_per_level, increases by time_per_level for each level.
     time_spent : int
         The time elapsed since the level started.
+    base_ball_speed : int
+        The ball speed before the first level's increase.
+    ball_speed_step : int
+        The increase in ball speed for each level.
+    time_per_level : int
+        The increase in the maximum time for each level.
+    hit_multiplier_step : int
+        The increase in the hit multiplier for each level.
 
     Methods
     -------
@@ -26,23 +34,28 @@ class LevelManager:
         Reset the level manager to its initial state, i.e. level 1.
     """
 
-    def __init__(self):
-        self.current_level = 1
-        self.hit_multiplier = self.current_level
-        self.ball_speed = 300 + self.current_level * 50
-        self.max_time = 120 * self.current_level
-        self.time_spent = 0
+    def __init__(self, base_ball_speed: int = 300, ball_speed_step: int = 50, time_per_level: int = 120, hit_multiplier_step: int = 1):
+        if time_per_level <= 0:
+            raise ValueError("time_per_level must be greater than 0")
+
+        # The progression can be changed to balance the levels, e.g. in simulations
+        self.base_ball_speed = base_ball_speed
+        self.ball_speed_step = ball_speed_step
+        self.time_per_level = time_per_level
+        self.hit_multiplier_step = hit_multiplier_step
+
+        self.reset()
 
     def increase_level(self) -> None:
         self.current_level += 1
-        self.hit_multiplier += 1
-        self.ball_speed += 50
-        self.max_time += 120
+        self.hit_multiplier += self.hit_multiplier_step
+        self.ball_speed += self.ball_speed_step
+        self.max_time += self.time_per_level
         self.time_spent = 0
 
     def reset(self) -> None:
         self.current_level = 1
         self.hit_multiplier = self.current_level
-        self.ball_speed = 300 + self.current_level * 50
-        self.max_time = 120 * self.current_level
+        self.ball_speed = self.base_ball_speed + self.current_level * self.ball_speed_step
+        self.max_time = self.time_per_level * self.current_level
         self.time_spent = 0
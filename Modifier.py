@@ -30,6 +30,8 @@ class Modifier:
         Indicates if the modifier is currently active.
     brick : Brick
         The brick that the modifier is associated with. This is the brick it will be dropped from.
+    id : int | None
+        The id of the drop, given by ModifierFactory. None for the prototypes in GameManager.modifiers.
     
     Methods
     -------
@@ -49,7 +51,10 @@ class Modifier:
         Deactivates the modifier. This method is called when the modifier's time limit is reached or when the game ends.
     """
 
-    def __init__(self, name: str, type: str, duration: float=None):
+    # Modifiers are copied every time one is dropped, so they are stored without a per-object __dict__
+    __slots__ = ("x", "y", "name", "type", "radius", "color", "fall_speed", "time_remaining", "is_active", "brick", "id")
+
+    def __init__(self, name: str, type: str, duration: float=None, rng=random):
         self.x = 0
         self.y = 0
         self.name = name
@@ -58,12 +63,13 @@ class Modifier:
         
         #self.color = "green" if type == "positive" else "red" if type == "negative" else "yellow" if type == "special" else "grey"
         colors = ["green", "red", "yellow", "blue", "purple"]
-        self.color = random.choice(colors)
+        self.color = rng.choice(colors)
 
         self.fall_speed = 120
         self.time_remaining = duration
         self.is_active = False
         self.brick = None
+        self.id = None
 
     """
     Sets the brick that the modifier is associated with.
@@ -264,8 +270,7 @@ class Modifier:
 
             case "Extra Brick Row":
                 # Move all bricks down 1 row (10 pixels)
-                for brick in game_manager.bricks:
-                    brick.y += 10
+                game_manager.bricks.push_row()
 
                 # Create a new row of bricks at the top of the screen
                 for i in range(0, game_manager.WINDOW_SIZE, 22):
@@ -274,7 +279,7 @@ class Modifier:
                 # Play the sound for a new row of bricks
                 game_manager.sound_manager.play_new_row_sound()
 
-        print(f'Activated modifier: {self.name}')
+        game_manager.log(f'Activated modifier: {self.name}')
 
     """
     Deactivates the modifier. This method is called when the modifier's time limit is reached or when the game ends.
@@ -332,4 +337,30 @@ class Modifier:
         if self in game_manager.active_modifiers:
             game_manager.active_modifiers.remove(self)
 
-        print(f'Deactivated modifier: {self.name}')
+        game_manager.log(f'Deactivated modifier: {self.name}')
+
+"""
+Creates one of each modifier in the game. Dropped modifiers are copies of these.
+
+Parameters
+----------
+rng : random.Random, optional
+    Random number generator used to pick the colors of the modifiers (default is the random module).
+
+Returns
+-------
+modifiers : list[Modifier]
+    The modifiers.
+
+Raises
+------
+None
+"""
+def create_default_modifiers(rng=random) -> list[Modifier]:
+    return [
+        Modifier("Fast Ball", "negative", duration=5, rng=rng),
+        Modifier("Wide Paddle", "positive", duration=10, rng=rng),
+        Modifier("Extra Ball", "positive", rng=rng),
+        Modifier("Extravaganza", "special", duration=5, rng=rng),
+        Modifier("Extra Brick Row", "negative", rng=rng),
+    ]
@@ -0,0 +1,119 @@
+class ModifierFactory:
+    """
+    Creates the modifiers that are dropped in the game from the prototypes in GameManager.modifiers, and recycles them.
+    A modifier is created by copying the fields of its prototype into a modifier from the pool, so nothing is allocated once the pool
+    has grown to the number of modifiers that are in play at once, and no references are shared with or copied from the prototype
+    beyond its plain values.
+    Modifiers are released back to the pool when they leave the game: when they fall out of bounds, when they are deactivated,
+    right after they are activated if they have no duration, and when the level is reset.
+    Every created modifier gets a new id, so a drop can be told apart from an earlier drop that used the same object.
+
+    Attributes
+    ----------
+    pool : list[Modifier]
+        The released modifiers that can be reused.
+    created : int
+        The number of modifiers that had to be allocated because the pool was empty.
+    reused : int
+        The number of modifiers taken from the pool.
+    next_id : int
+        The id given to the next modifier.
+
+    Methods
+    -------
+    create(prototype: Modifier) -> Modifier
+        Returns a modifier with the same values as the prototype, reusing a released modifier if there is one.
+    release(modifier: Modifier) -> None
+        Puts a modifier that is no longer in the game back in the pool.
+    assign_id(modifier: Modifier) -> None
+        Gives a modifier a new id.
+    """
+
+    def __init__(self):
+        self.pool = []
+        self.created = 0
+        self.reused = 0
+        self.next_id = 0
+
+    """
+    Returns a modifier with the same values as the prototype: name, type, radius, color, fall speed and duration.
+    The modifier is at (0, 0), is not active, is not associated with a brick and has a new id.
+
+    Parameters
+    ----------
+    prototype : Modifier
+        The modifier to copy.
+
+    Returns
+    -------
+    Modifier
+        The new modifier.
+
+    Raises
+    ------
+    None
+    """
+    def create(self, prototype):
+        if len(self.pool) > 0:
+            modifier = self.pool.pop()
+            self.reused += 1
+        else:
+            # Allocated without __init__, which would pick a random color
+            modifier = type(prototype).__new__(type(prototype))
+            self.created += 1
+
+        modifier.x = 0
+        modifier.y = 0
+        modifier.name = prototype.name
+        modifier.type = prototype.type
+        modifier.radius = prototype.radius
+        modifier.color = prototype.color
+        modifier.fall_speed = prototype.fall_speed
+        modifier.time_remaining = prototype.time_remaining
+        modifier.is_active = False
+        modifier.brick = None
+        self.assign_id(modifier)
+
+        return modifier
+
+    """
+    Puts a modifier that is no longer in the game back in the pool, so it can be reused by the next drop.
+    The modifier must not be used by the game after it has been released.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The modifier to release.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def release(self, modifier) -> None:
+        # Do not keep the destroyed brick alive while the modifier is in the pool
+        modifier.brick = None
+        self.pool.append(modifier)
+
+    """
+    Gives a modifier a new id, that no other modifier created by this factory has had.
+
+    Parameters
+    ----------
+    modifier : Modifier
+        The modifier to give an id.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def assign_id(self, modifier) -> None:
+        modifier.id = self.next_id
+        self.next_id += 1
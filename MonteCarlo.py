@@ -0,0 +1,335 @@
+import argparse
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+from Controller import Controller
+from GameManager import GameManager
+from LevelManager import LevelManager
+from PlayerInput import PlayerInput
+
+# The balance parameters of a simulation, and how long each game is simulated for.
+# The defaults are the values used in the game.
+SimulationParameters = namedtuple(
+    "SimulationParameters",
+    ["modifier_drop_rate", "random_drop_chance", "base_ball_speed", "ball_speed_step", "time_per_level", "hit_multiplier_step",
+     "max_game_time", "step_rate"],
+    defaults=[0.2, 500, 300, 50, 120, 1, 600, 240]
+)
+
+
+class ScriptedPaddle(Controller):
+    """
+    Plays a game by following the ball with the paddle, using the same input as a player.
+    The paddle follows the lowest falling ball, and aims a random distance from its centre so the ball bounces off at different angles.
+    The aim uses its own random number generator, so it does not change the random events of the game.
+
+    Attributes
+    ----------
+    random : random.Random
+        Random number generator for the aim.
+    aim : float
+        Where the paddle tries to catch the ball, as a fraction of its width from the centre (between -0.4 and 0.4).
+    falling : bool
+        Whether the followed ball was falling in the last step.
+
+    Methods
+    -------
+    get_input(game_manager: GameManager) -> int
+        Returns the input for the next step of the game.
+    """
+
+    def __init__(self, seed: int = None):
+        self.random = random.Random(seed)
+        self.aim = 0
+        self.falling = False
+
+    """
+    Returns the input for the next step of the game: launch the ball if the game has not started, otherwise move towards the ball.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The game being played.
+
+    Returns
+    -------
+    int
+        The input, as PlayerInput flags.
+
+    Raises
+    ------
+    None
+    """
+    def get_input(self, game_manager) -> int:
+        if not game_manager.game_started:
+            return PlayerInput.LAUNCH
+
+        balls = game_manager.balls
+        if len(balls) == 0:
+            return PlayerInput.NONE
+
+        # Follow the lowest falling ball, or the lowest ball if none are falling
+        ball = max(balls, key=lambda ball: (ball.vy > 0, ball.y))
+
+        # Pick a new aim every time a ball starts falling
+        falling = ball.vy > 0
+        if falling and not self.falling:
+            self.aim = self.random.uniform(-0.4, 0.4)
+        self.falling = falling
+
+        paddle = game_manager.paddle
+        target = ball.x - self.aim * paddle.width
+        centre = paddle.x + paddle.width / 2
+
+        # Stop within one step of the target, so the paddle does not shake around it
+        tolerance = 300 * game_manager.dt
+
+        if target < centre - tolerance:
+            return PlayerInput.LEFT
+        if target > centre + tolerance:
+            return PlayerInput.RIGHT
+        return PlayerInput.NONE
+
+
+"""
+Plays one headless game with a scripted paddle and collects its statistics.
+Runs in a worker process, so it only takes and returns plain values.
+
+The game is played until it is lost or max_game_time seconds of game time have passed.
+
+Parameters
+----------
+seed : int
+    Seed for the game and the scripted paddle.
+parameters : SimulationParameters, optional
+    The balance parameters to play with (default is SimulationParameters(), the values used in the game).
+
+Returns
+-------
+dict
+    "seed": the seed,
+    "levels_cleared": the number of levels cleared,
+    "lives_lost": the number of lives lost,
+    "score": the total score, including the points of the unfinished level,
+    "game_time": the game time played in seconds,
+    "game_over": True if all lives were lost, False if the game was stopped at max_game_time,
+    "levels": a (level, clear_time, lives_lost) tuple for every cleared level,
+    "modifiers_dropped": the number of dropped modifiers by name,
+    "modifiers_caught": the number of caught modifiers by name.
+
+Raises
+------
+ValueError
+    If modifier_drop_rate is not greater than 0 and at most 1, or random_drop_chance is less than 1.
+"""
+def simulate_game(seed: int, parameters: SimulationParameters = SimulationParameters()) -> dict:
+    if parameters.modifier_drop_rate <= 0 or parameters.modifier_drop_rate > 1:
+        raise ValueError("modifier_drop_rate must be greater than 0 and at most 1")
+    if parameters.random_drop_chance < 1:
+        raise ValueError("random_drop_chance must be at least 1")
+
+    level_manager = LevelManager(parameters.base_ball_speed, parameters.ball_speed_step,
+                                 parameters.time_per_level, parameters.hit_multiplier_step)
+    game_manager = GameManager.create_headless(seed, level_manager=level_manager)
+    game_manager.MODIFIER_DROP_RATE = parameters.modifier_drop_rate
+    game_manager.RANDOM_DROP_CHANCE = parameters.random_drop_chance
+
+    paddle = ScriptedPaddle(seed)
+    dt = 1 / parameters.step_rate
+    steps = round(parameters.max_game_time * parameters.step_rate)
+
+    levels = []
+    level = level_manager.current_level
+    level_start = 0
+    lives = game_manager.lives
+    level_lives_lost = 0
+    lives_lost = 0
+    game_time = 0
+
+    for i in range(steps):
+        game_manager.step(dt, paddle.get_input(game_manager))
+        game_time = (i + 1) * dt
+
+        if game_manager.lives < lives:
+            lives_lost += lives - game_manager.lives
+            level_lives_lost += lives - game_manager.lives
+        lives = game_manager.lives
+
+        # A level was cleared
+        if level_manager.current_level > level:
+            levels.append((level, game_time - level_start, level_lives_lost))
+            level = level_manager.current_level
+            level_start = game_time
+            level_lives_lost = 0
+
+        if game_manager.lost_game:
+            break
+
+    return {
+        "seed": seed,
+        "levels_cleared": len(levels),
+        "lives_lost": lives_lost,
+        "score": game_manager.total_points + game_manager.level_points,
+        "game_time": game_time,
+        "game_over": game_manager.lost_game,
+        "levels": levels,
+        "modifiers_dropped": game_manager.modifiers_dropped,
+        "modifiers_caught": game_manager.modifiers_caught,
+    }
+
+
+"""
+Plays many games in parallel, one per seed, spread over a pool of worker processes.
+The games do not share any state, so the simulation scales with the number of workers.
+The seeds are sent to the workers in chunks, so each worker plays many games per message.
+
+Parameters
+----------
+seeds : Iterable[int]
+    The seeds of the games to play.
+parameters : SimulationParameters, optional
+    The balance parameters to play with (default is SimulationParameters(), the values used in the game).
+workers : int | None, optional
+    The number of worker processes (default is None, one per CPU core).
+
+Returns
+-------
+list[dict]
+    The statistics of every game, in the order of the seeds. See simulate_game.
+
+Raises
+------
+ValueError
+    If workers is less than or equal to 0.
+"""
+def simulate_games(seeds, parameters: SimulationParameters = SimulationParameters(), workers: int = None) -> list:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be greater than 0")
+
+    seeds = list(seeds)
+
+    # About 4 chunks per worker, so workers that finish early can take over the rest of the games
+    chunksize = max(1, len(seeds) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(simulate_game, seeds, repeat(parameters), chunksize=chunksize))
+
+
+"""
+Turns the statistics of many games into columns, one NumPy array per column.
+There are three tables, with the table name as prefix of the column names:
+"game_" has one row per game, "level_" one row per cleared level and "modifier_" one row per game and modifier.
+The rows of the other tables can be matched to their game with the seed column.
+
+Parameters
+----------
+results : list[dict]
+    The statistics of the games, from simulate_game.
+
+Returns
+-------
+dict[str, np.ndarray]
+    The columns, by name.
+
+Raises
+------
+None
+"""
+def to_columns(results: list) -> dict:
+    modifier_names = sorted({name for result in results for name in result["modifiers_dropped"]})
+
+    columns = {
+        "game_seed": [], "game_levels_cleared": [], "game_lives_lost": [], "game_score": [], "game_time": [], "game_over": [],
+        "level_seed": [], "level_number": [], "level_clear_time": [], "level_lives_lost": [],
+        "modifier_seed": [], "modifier_name": [], "modifier_dropped": [], "modifier_caught": [],
+    }
+
+    for result in results:
+        columns["game_seed"].append(result["seed"])
+        columns["game_levels_cleared"].append(result["levels_cleared"])
+        columns["game_lives_lost"].append(result["lives_lost"])
+        columns["game_score"].append(result["score"])
+        columns["game_time"].append(result["game_time"])
+        columns["game_over"].append(result["game_over"])
+
+        for level, clear_time, lives_lost in result["levels"]:
+            columns["level_seed"].append(result["seed"])
+            columns["level_number"].append(level)
+            columns["level_clear_time"].append(clear_time)
+            columns["level_lives_lost"].append(lives_lost)
+
+        for name in modifier_names:
+            columns["modifier_seed"].append(result["seed"])
+            columns["modifier_name"].append(name)
+            columns["modifier_dropped"].append(result["modifiers_dropped"].get(name, 0))
+            columns["modifier_caught"].append(result["modifiers_caught"].get(name, 0))
+
+    dtypes = {"level_clear_time": float, "game_time": float, "game_over": bool, "modifier_name": str}
+    return {name: np.array(values, dtype=dtypes.get(name, np.int64)) for name, values in columns.items()}
+
+
+"""
+Prints a summary of the columns: the score distribution, the clear time per level and the catch rate per modifier.
+
+Parameters
+----------
+columns : dict[str, np.ndarray]
+    The columns, from to_columns.
+
+Returns
+-------
+None
+
+Raises
+------
+None
+"""
+def print_summary(columns: dict) -> None:
+    scores = columns["game_score"]
+    print(f'Games: {len(scores)}, game over: {columns["game_over"].sum()}')
+    print(f'Score: mean {scores.mean():.0f}, p10 {np.percentile(scores, 10):.0f}, '
+          f'p50 {np.percentile(scores, 50):.0f}, p90 {np.percentile(scores, 90):.0f}')
+    print(f'Levels cleared: mean {columns["game_levels_cleared"].mean():.2f}, max {columns["game_levels_cleared"].max()}')
+
+    for level in np.unique(columns["level_number"]):
+        clear_times = columns["level_clear_time"][columns["level_number"] == level]
+        lives_lost = columns["level_lives_lost"][columns["level_number"] == level]
+        print(f'  Level {level}: cleared {len(clear_times)} times, clear time p50 {np.percentile(clear_times, 50):.1f}s, '
+              f'lives lost {lives_lost.mean():.2f}')
+
+    for name in np.unique(columns["modifier_name"]):
+        rows = columns["modifier_name"] == name
+        dropped = columns["modifier_dropped"][rows].sum()
+        caught = columns["modifier_caught"][rows].sum()
+        print(f'  {name}: dropped {dropped}, caught {caught} ({caught / max(dropped, 1):.0%})')
+
+
+if __name__ == "__main__":
+    defaults = SimulationParameters()
+
+    parser = argparse.ArgumentParser(description="Play many headless games in parallel and collect balance statistics.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game, the others follow it")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU core)")
+    parser.add_argument("--output", default="montecarlo.npz", help="file the columns are saved to")
+    for name, default in zip(SimulationParameters._fields, defaults):
+        parser.add_argument(f'--{name.replace("_", "-")}', type=type(default), default=default)
+    args = parser.parse_args()
+
+    parameters = SimulationParameters(*(getattr(args, name) for name in SimulationParameters._fields))
+
+    start = time.perf_counter()
+    results = simulate_games(range(args.first_seed, args.first_seed + args.games), parameters, args.workers)
+    duration = time.perf_counter() - start
+
+    columns = to_columns(results)
+    np.savez_compressed(args.output, **columns)
+
+    print(f'Played {args.games} games in {duration:.1f}s, saved to {args.output}')
+    print_summary(columns)
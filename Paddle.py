@@ -24,6 +24,8 @@ class Paddle:
         'left' and 'right' are the only valid directions.
     """
 
+    __slots__ = ("x", "y", "width", "base_width", "height", "color")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
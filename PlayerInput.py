@@ -0,0 +1,66 @@
+import pygame
+
+class PlayerInput:
+    """
+    Bit flags for the player's input in one simulation step, combined with |.
+    Games driven by a script or a replay pass these to GameManager.step instead of pressed keys,
+    so the game logic can run without a window.
+
+    Attributes
+    ----------
+    NONE : int
+        No input.
+    LEFT : int
+        Move the paddle left.
+    RIGHT : int
+        Move the paddle right.
+    LAUNCH : int
+        Launch the ball if the game has not started.
+    RESTART : int
+        Restart the game.
+
+    Methods
+    -------
+    from_keys(keys: ScancodeWrapper) -> int
+        Converts the keys pressed on the keyboard to input flags.
+    """
+
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    LAUNCH = 4
+    RESTART = 8
+
+    """
+    Converts the keys pressed on the keyboard to input flags.
+    A and the left arrow move the paddle left, D and the right arrow move it right, W and the up arrow launch the ball,
+    and space restarts the game.
+
+    Parameters
+    ----------
+    keys : ScancodeWrapper
+        The pressed keys, from pygame.key.get_pressed.
+
+    Returns
+    -------
+    int
+        The input flags.
+
+    Raises
+    ------
+    None
+    """
+    @staticmethod
+    def from_keys(keys) -> int:
+        inputs = PlayerInput.NONE
+
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            inputs |= PlayerInput.LEFT
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            inputs |= PlayerInput.RIGHT
+        if keys[pygame.K_w] or keys[pygame.K_UP]:
+            inputs |= PlayerInput.LAUNCH
+        if keys[pygame.K_SPACE]:
+            inputs |= PlayerInput.RESTART
+
+        return inputs
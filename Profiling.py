@@ -0,0 +1,241 @@
+import time
+import tracemalloc
+from copy import deepcopy
+from GameManager import GameManager
+from Modifier import Modifier
+from Ball import Ball
+from Brick import Brick
+from Paddle import Paddle
+
+"""
+Measures the memory used by one entity, by creating many of them while tracemalloc is tracing.
+
+Parameters
+----------
+factory : Callable[[int], object]
+    Function that creates the i-th entity.
+count : int, optional
+    The number of entities to create (default is 10000).
+
+Returns
+-------
+float
+    The average number of bytes allocated per entity, including its attributes.
+
+Raises
+------
+ValueError
+    If count is less than or equal to 0.
+"""
+def entity_memory(factory, count: int = 10000) -> float:
+    if count <= 0:
+        raise ValueError("count must be greater than 0")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    # Keep the entities alive until the memory has been measured
+    entities = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    # Do not count the list holding the entities
+    return (after - before - entities.__sizeof__()) / count
+
+"""
+Measures the memory allocated by calling a function, e.g. moving a ball.
+The peak is measured on top of the memory in use before each call, so temporary objects that are freed again before the call returns are counted.
+
+Parameters
+----------
+function : Callable[[], object]
+    The function to call.
+calls : int, optional
+    The number of calls to measure (default is 10000).
+
+Returns
+-------
+float
+    The average peak number of bytes allocated during a call.
+
+Raises
+------
+ValueError
+    If calls is less than or equal to 0.
+"""
+def call_allocations(function, calls: int = 10000) -> float:
+    if calls <= 0:
+        raise ValueError("calls must be greater than 0")
+
+    peak_total = 0
+    tracemalloc.start()
+
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        function()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+
+    tracemalloc.stop()
+    return peak_total / calls
+
+"""
+Creates a quiet game that runs without a window or sound device, with the ball already launched.
+
+Parameters
+----------
+seed : int, optional
+    Seed for the random number generator (default is 1).
+ball_backend : str, optional
+    How the balls are stored, "objects" or "batch" (default is "objects").
+
+Returns
+-------
+GameManager
+    The started game.
+
+Raises
+------
+None
+"""
+def create_headless_game(seed: int = 1, ball_backend: str = "objects") -> GameManager:
+    game_manager = GameManager.create_headless(seed, ball_backend=ball_backend)
+    game_manager.dt = 1 / 240
+    game_manager.balls[0].begin()
+    game_manager.game_started = True
+
+    return game_manager
+
+"""
+Runs a game for a number of updates and measures the memory allocated during each update.
+The paddle follows the first ball so the game keeps going, and the game is restarted if a life is lost.
+
+Parameters
+----------
+game_manager : GameManager
+    The game to update.
+frames : int, optional
+    The number of updates to measure (default is 2000).
+
+Returns
+-------
+dict[str, float]
+    "peak_bytes_per_frame": the average peak of memory allocated during an update on top of the memory in use before it,
+    "retained_bytes_per_frame": the average memory still in use after an update, i.e. not freed again.
+
+Raises
+------
+ValueError
+    If frames is less than or equal to 0.
+"""
+def update_allocations(game_manager, frames: int = 2000) -> dict:
+    if frames <= 0:
+        raise ValueError("frames must be greater than 0")
+
+    paddle = game_manager.paddle
+    window_size = game_manager.WINDOW_SIZE
+
+    peak_total = 0
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(frames):
+        if not game_manager.game_started:
+            game_manager.balls[0].begin()
+            game_manager.game_started = True
+        if len(game_manager.balls) > 0:
+            paddle.x = min(max(game_manager.balls[0].x - paddle.width / 2, 0), window_size - paddle.width)
+
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        game_manager.update()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return {
+        "peak_bytes_per_frame": peak_total / frames,
+        "retained_bytes_per_frame": retained / frames,
+    }
+
+"""
+Measures how long it takes to snapshot and restore a game, compared to copying it with deepcopy.
+
+Parameters
+----------
+game_manager : GameManager
+    The game to copy.
+count : int, optional
+    The number of times each copy is made (default is 1000).
+
+Returns
+-------
+dict[str, float]
+    "snapshot_us": the average time of GameManager.snapshot in microseconds,
+    "restore_us": the average time of GameManager.restore in microseconds,
+    "deepcopy_us": the average time of deepcopy in microseconds, or None for the batch ball backend, which deepcopy cannot copy,
+    "snapshot_bytes": the size of the snapshot.
+
+Raises
+------
+ValueError
+    If count is less than or equal to 0.
+"""
+def snapshot_times(game_manager, count: int = 1000) -> dict:
+    if count <= 0:
+        raise ValueError("count must be greater than 0")
+
+    start = time.perf_counter()
+    for _ in range(count):
+        state = game_manager.snapshot()
+    snapshot_time = time.perf_counter() - start
+
+    # Restore into a separate game, so the measured game is not changed
+    copy = GameManager.create_headless(ball_backend=game_manager.ball_backend)
+    start = time.perf_counter()
+    for _ in range(count):
+        copy.restore(state)
+    restore_time = time.perf_counter() - start
+
+    # The views of a BallBatch refer back to the batch, which deepcopy cannot copy
+    deepcopy_time = None
+    if game_manager.ball_backend == "objects":
+        start = time.perf_counter()
+        for _ in range(count):
+            deepcopy(game_manager)
+        deepcopy_time = time.perf_counter() - start
+
+    return {
+        "snapshot_us": snapshot_time / count * 1e6,
+        "restore_us": restore_time / count * 1e6,
+        "deepcopy_us": deepcopy_time / count * 1e6 if deepcopy_time is not None else None,
+        "snapshot_bytes": len(state),
+    }
+
+
+if __name__ == "__main__":
+    print("Memory per entity (bytes)")
+    print(f"  Ball:     {entity_memory(lambda i: Ball(i, i, 0, -1, 5, 'white')):8.1f}")
+    print(f"  Brick:    {entity_memory(lambda i: Brick(i, i, 'red')):8.1f}")
+    print(f"  Paddle:   {entity_memory(lambda i: Paddle(i, i)):8.1f}")
+    print(f"  Modifier: {entity_memory(lambda i: Modifier('Extra Ball', 'positive')):8.1f}")
+
+    ball = Ball(250, 250, 0.6, -0.8, 5, "white")
+    paddle = Paddle(225, 480)
+    print("Allocations per call (bytes)")
+    print(f"  Ball.move:            {call_allocations(lambda: ball.move(1 / 240)):8.1f}")
+    print(f"  Ball.check_collision: {call_allocations(lambda: ball.check_collision(paddle, ())):8.1f}")
+
+    print("Allocations per update (bytes)")
+    for ball_backend in ("objects", "batch"):
+        allocations = update_allocations(create_headless_game(ball_backend=ball_backend))
+        print(f"  {ball_backend:8}  peak {allocations['peak_bytes_per_frame']:8.1f}  retained {allocations['retained_bytes_per_frame']:8.1f}")
+
+    print("Snapshot and restore (microseconds)")
+    for ball_backend in ("objects", "batch"):
+        times = snapshot_times(create_headless_game(ball_backend=ball_backend))
+        deepcopy_text = f"{times['deepcopy_us']:8.1f}" if times['deepcopy_us'] is not None else "     n/a"
+        print(f"  {ball_backend:8}  snapshot {times['snapshot_us']:8.1f}  restore {times['restore_us']:8.1f}  "
+              f"deepcopy {deepcopy_text}  size {times['snapshot_bytes']} bytes")
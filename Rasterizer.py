@@ -0,0 +1,379 @@
+import numpy as np
+from BrickGrid import BrickGrid
+
+# The RGB values pygame uses for the colors in the game
+COLORS = {
+    "white": (255, 255, 255),
+    "grey": (190, 190, 190),
+    "red": (255, 0, 0),
+    "orange": (255, 165, 0),
+    "yellow": (255, 255, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "purple": (160, 32, 240),
+}
+
+# The brightness of each color in a grayscale frame (ITU-R BT.601 luma)
+GRAY_LEVELS = {name: 0.299 * r + 0.587 * g + 0.114 * b for name, (r, g, b) in COLORS.items()}
+
+# The colors of the brick rows made by GameManager.generate_bricks, from the top
+BRICK_ROW_COLORS = ["red", "red", "orange", "orange", "green", "green", "yellow", "yellow"]
+
+
+class Rasterizer:
+    """
+    Draws the game into grayscale NumPy frames at a lower resolution than the window, without pygame, e.g. as observations for a bot.
+    Draws the same things as Main.draw_game_elements: the bricks (darker the more they have been damaged, the same alpha as BrickLayer),
+    the paddle, the balls and the dropped modifiers, on a black background.
+
+    Every object is drawn with the fraction of each pixel it covers, so objects that are smaller than a pixel are still visible.
+    The coverage of a rectangle is the product of its coverage along each axis, and a circle is drawn as the square with the same area.
+    The bricks do not overlap, so they are drawn together with one matrix product. The other objects are drawn over them.
+
+    A frame is written into a given uint8 array, so a training loop can reuse the same array every step.
+
+    Attributes
+    ----------
+    window_size : int
+        The size of the game window.
+    size : tuple[int, int]
+        The width and height of the frames in pixels.
+    scale : tuple[float, float]
+        The number of frame pixels per window pixel, horizontally and vertically.
+    x_edges, y_edges : np.ndarray
+        The window coordinates of the pixel edges, horizontally and vertically.
+    canvas : np.ndarray
+        Float frame the objects are blended into, with shape (height, width), reused for every frame.
+
+    Methods
+    -------
+    render(game_manager: GameManager, out: np.ndarray = None) -> np.ndarray
+        Draws a game into a frame.
+    render_many(game_managers: list[GameManager], out: np.ndarray = None) -> np.ndarray
+        Draws several games into a batch of frames.
+    render_vec(env: VecBreakout, out: np.ndarray = None) -> np.ndarray
+        Draws every game of a VecBreakout into a batch of frames at once.
+    coverage(starts: np.ndarray, ends: np.ndarray, edges: np.ndarray, scale: float) -> np.ndarray
+        Returns the fraction of each pixel covered by each span.
+    blend_box(canvas: np.ndarray, x: float, y: float, width: float, height: float, value: float) -> None
+        Blends a rectangle over a frame.
+    blend_circle(canvas: np.ndarray, x: float, y: float, radius: float, value: float) -> None
+        Blends a circle over a frame.
+    blend_boxes(canvas: np.ndarray, x: np.ndarray, y: np.ndarray, width: float, height: float) -> None
+        Blends one white rectangle over each frame of a batch.
+    window(starts: np.ndarray, lengths: np.ndarray, scale: float, pixel_count: int) -> np.ndarray
+        Returns the pixels along one axis that each span touches.
+    """
+
+    def __init__(self, window_size: int = 500, size: tuple[int, int] = (84, 84)):
+        if window_size <= 0:
+            raise ValueError("window_size must be greater than 0")
+        if size[0] <= 0 or size[1] <= 0:
+            raise ValueError("size must be greater than 0")
+
+        self.window_size = window_size
+        self.size = size
+        self.scale = (size[0] / window_size, size[1] / window_size)
+        self.x_edges = np.arange(size[0] + 1) / self.scale[0]
+        self.y_edges = np.arange(size[1] + 1) / self.scale[1]
+        self.canvas = np.zeros((size[1], size[0]), dtype=np.float32)
+
+    """
+    Draws a game into a frame.
+
+    Parameters
+    ----------
+    game_manager : GameManager
+        The game to draw.
+    out : np.ndarray, optional
+        The uint8 array of shape (height, width) to draw into (default is None, a new array is created).
+
+    Returns
+    -------
+    np.ndarray
+        The frame.
+
+    Raises
+    ------
+    ValueError
+        If out does not have the shape of a frame.
+    """
+    def render(self, game_manager, out: np.ndarray = None) -> np.ndarray:
+        width, height = self.size
+        if out is None:
+            out = np.empty((height, width), dtype=np.uint8)
+        if out.shape != (height, width):
+            raise ValueError("out must have the shape (height, width)")
+
+        canvas = self.canvas
+
+        # Bricks, with the alpha of BrickLayer: the fraction of their durability that is left
+        bricks = [(brick.x, brick.y, brick.width, brick.height, GRAY_LEVELS.get(brick.color, 255) * (brick.durability - brick.hits) / brick.durability)
+                  for brick in game_manager.bricks]
+        if len(bricks) > 0:
+            x, y, brick_width, brick_height, value = np.array(bricks, dtype=np.float32).T
+            x_coverage = self.coverage(x, x + brick_width, self.x_edges, self.scale[0])
+            y_coverage = self.coverage(y, y + brick_height, self.y_edges, self.scale[1])
+            np.matmul((y_coverage * value[:, None]).T, x_coverage, out=canvas)
+        else:
+            canvas.fill(0)
+
+        # Paddle, balls and dropped modifiers, drawn over the bricks
+        paddle = game_manager.paddle
+        self.blend_box(canvas, paddle.x, paddle.y, paddle.width, paddle.height, 255)
+
+        for ball in game_manager.balls:
+            self.blend_circle(canvas, ball.x, ball.y, ball.radius, 255)
+
+        for modifier in game_manager.dropped_modifiers:
+            self.blend_circle(canvas, modifier.x, modifier.y, modifier.radius, GRAY_LEVELS.get(modifier.color, 255))
+
+        # Round to the nearest level. Casting to uint8 rounds down, so 0.5 is added first.
+        np.add(canvas, 0.5, out=canvas)
+        np.copyto(out, canvas, casting="unsafe")
+        return out
+
+    """
+    Draws several games into a batch of frames, one after the other.
+
+    Parameters
+    ----------
+    game_managers : list[GameManager]
+        The games to draw.
+    out : np.ndarray, optional
+        The uint8 array of shape (len(game_managers), height, width) to draw into (default is None, a new array is created).
+
+    Returns
+    -------
+    np.ndarray
+        The frames.
+
+    Raises
+    ------
+    ValueError
+        If out does not have the shape of the batch of frames.
+    """
+    def render_many(self, game_managers, out: np.ndarray = None) -> np.ndarray:
+        width, height = self.size
+        if out is None:
+            out = np.empty((len(game_managers), height, width), dtype=np.uint8)
+        if out.shape != (len(game_managers), height, width):
+            raise ValueError("out must have the shape (number of games, height, width)")
+
+        for game_manager, frame in zip(game_managers, out):
+            self.render(game_manager, frame)
+
+        return out
+
+    """
+    Draws every game of a VecBreakout into a batch of frames at once.
+    The bricks of a VecBreakout are always in the cells of the brick grid, so the coverage of the cells is the same for every game,
+    and the bricks of all games are drawn with two matrix products.
+
+    Parameters
+    ----------
+    env : VecBreakout
+        The games to draw.
+    out : np.ndarray, optional
+        The uint8 array of shape (env.num_envs, height, width) to draw into (default is None, a new array is created).
+
+    Returns
+    -------
+    np.ndarray
+        The frames.
+
+    Raises
+    ------
+    ValueError
+        If out does not have the shape of the batch of frames.
+    """
+    def render_vec(self, env, out: np.ndarray = None) -> np.ndarray:
+        width, height = self.size
+        if out is None:
+            out = np.empty((env.num_envs, height, width), dtype=np.uint8)
+        if out.shape != (env.num_envs, height, width):
+            raise ValueError("out must have the shape (num_envs, height, width)")
+
+        # The coverage of the brick cells, by column and by row
+        columns = np.arange(env.columns) * BrickGrid.CELL_WIDTH
+        rows = (np.arange(env.BRICK_ROWS) + env.BRICK_FIRST_ROW) * BrickGrid.CELL_HEIGHT
+        x_coverage = self.coverage(columns, columns + env.BRICK_WIDTH, self.x_edges, self.scale[0])
+        y_coverage = self.coverage(rows, rows + env.BRICK_HEIGHT, self.y_edges, self.scale[1])
+
+        # The brightness of every brick, from its color and the fraction of its durability that is left
+        row_levels = np.array([GRAY_LEVELS[color] for color in BRICK_ROW_COLORS], dtype=np.float32)
+        values = env.bricks.astype(np.float32) * (row_levels[:, None] / env.hit_multiplier[:, None, None]).astype(np.float32)
+
+        # (num_envs, rows, columns) -> (num_envs, rows, width) -> (num_envs, height, width)
+        canvas = np.matmul(y_coverage.T, np.matmul(values, x_coverage))
+
+        # Paddles and balls, drawn over the bricks. A ball is the square with the same area as the circle.
+        self.blend_boxes(canvas, env.paddle_x, np.full(env.num_envs, float(env.paddle_y)), env.PADDLE_WIDTH, env.PADDLE_HEIGHT)
+        side = env.ball_radius * np.sqrt(np.pi)
+        self.blend_boxes(canvas, env.ball_x - side / 2, env.ball_y - side / 2, side, side)
+
+        # Round to the nearest level. Casting to uint8 rounds down, so 0.5 is added first.
+        np.add(canvas, 0.5, out=canvas)
+        np.copyto(out, canvas, casting="unsafe")
+        return out
+
+    """
+    Returns the fraction of each pixel covered by each span, along one axis.
+
+    Parameters
+    ----------
+    starts : np.ndarray
+        The start of each span, in window coordinates.
+    ends : np.ndarray
+        The end of each span, in window coordinates.
+    edges : np.ndarray
+        The window coordinates of the pixel edges along the axis.
+    scale : float
+        The number of pixels per window pixel along the axis.
+
+    Returns
+    -------
+    np.ndarray
+        The coverage, with shape (len(starts), number of pixels) and values between 0 and 1.
+
+    Raises
+    ------
+    None
+    """
+    @staticmethod
+    def coverage(starts, ends, edges: np.ndarray, scale: float) -> np.ndarray:
+        starts = np.asarray(starts, dtype=np.float32)[:, None]
+        ends = np.asarray(ends, dtype=np.float32)[:, None]
+        overlap = np.minimum(ends, edges[1:]) - np.maximum(starts, edges[:-1])
+        return (np.maximum(overlap, 0) * scale).astype(np.float32)
+
+    """
+    Blends a rectangle of one brightness over a frame, weighted by the fraction of each pixel it covers.
+    Only the pixels inside the rectangle's bounding box are changed.
+
+    Parameters
+    ----------
+    canvas : np.ndarray
+        The float frame to draw into.
+    x, y : float
+        The top left corner of the rectangle, in window coordinates.
+    width, height : float
+        The size of the rectangle, in window coordinates.
+    value : float
+        The brightness of the rectangle.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def blend_box(self, canvas: np.ndarray, x: float, y: float, width: float, height: float, value: float) -> None:
+        # The pixels the rectangle touches, clipped to the frame
+        first_column = max(int(x * self.scale[0]), 0)
+        last_column = min(int((x + width) * self.scale[0]) + 1, self.size[0])
+        first_row = max(int(y * self.scale[1]), 0)
+        last_row = min(int((y + height) * self.scale[1]) + 1, self.size[1])
+        if first_column >= last_column or first_row >= last_row:
+            return
+
+        x_coverage = self.coverage([x], [x + width], self.x_edges[first_column:last_column + 1], self.scale[0])[0]
+        y_coverage = self.coverage([y], [y + height], self.y_edges[first_row:last_row + 1], self.scale[1])[0]
+        alpha = y_coverage[:, None] * x_coverage
+
+        pixels = canvas[first_row:last_row, first_column:last_column]
+        pixels += alpha * (value - pixels)
+
+    """
+    Blends a circle of one brightness over a frame, drawn as the square with the same area.
+
+    Parameters
+    ----------
+    canvas : np.ndarray
+        The float frame to draw into.
+    x, y : float
+        The centre of the circle, in window coordinates.
+    radius : float
+        The radius of the circle.
+    value : float
+        The brightness of the circle.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def blend_circle(self, canvas: np.ndarray, x: float, y: float, radius: float, value: float) -> None:
+        side = radius * np.sqrt(np.pi)
+        self.blend_box(canvas, x - side / 2, y - side / 2, side, side, value)
+
+    """
+    Blends one white rectangle over each frame of a batch, weighted by the fraction of each pixel it covers.
+    Only a window of pixels around each rectangle is read and written, big enough for the largest rectangle,
+    so the cost does not depend on the size of the frames.
+
+    Parameters
+    ----------
+    canvas : np.ndarray
+        The float frames to draw into, with shape (number of frames, height, width).
+    x, y : np.ndarray
+        The top left corner of the rectangle of each frame, in window coordinates.
+    width, height : float | np.ndarray
+        The size of the rectangles, in window coordinates.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def blend_boxes(self, canvas: np.ndarray, x, y, width, height) -> None:
+        frames = np.arange(len(canvas))[:, None, None]
+        columns = self.window(x, width, self.scale[0], self.size[0])
+        rows = self.window(y, height, self.scale[1], self.size[1])
+
+        # The coverage of the pixels in the windows
+        x_coverage = np.maximum(np.minimum((x + width)[:, None], self.x_edges[columns + 1]) - np.maximum(x[:, None], self.x_edges[columns]), 0)
+        y_coverage = np.maximum(np.minimum((y + height)[:, None], self.y_edges[rows + 1]) - np.maximum(y[:, None], self.y_edges[rows]), 0)
+        alpha = (y_coverage * self.scale[1])[:, :, None] * (x_coverage * self.scale[0])[:, None, :]
+
+        pixels = canvas[frames, rows[:, :, None], columns[:, None, :]]
+        canvas[frames, rows[:, :, None], columns[:, None, :]] = pixels + alpha * (255 - pixels)
+
+    """
+    Returns the pixels along one axis that each span touches, as a window of the same length for every span.
+    The window starts at the first pixel of the span, or earlier if the span is at the end of the frame.
+
+    Parameters
+    ----------
+    starts : np.ndarray
+        The start of each span, in window coordinates.
+    lengths : float | np.ndarray
+        The length of the spans, in window coordinates.
+    scale : float
+        The number of pixels per window pixel along the axis.
+    pixel_count : int
+        The number of pixels along the axis.
+
+    Returns
+    -------
+    np.ndarray
+        The pixel indices, with shape (len(starts), window length).
+
+    Raises
+    ------
+    None
+    """
+    @staticmethod
+    def window(starts: np.ndarray, lengths, scale: float, pixel_count: int) -> np.ndarray:
+        # A span of length l touches at most ceil(l * scale) + 1 pixels
+        length = min(int(np.ceil(np.max(lengths) * scale)) + 1, pixel_count)
+        first = np.clip(np.floor(starts * scale), 0, pixel_count - length).astype(np.int64)
+        return first[:, None] + np.arange(length)
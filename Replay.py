@@ -0,0 +1,454 @@
+import struct
+from GameManager import GameManager
+
+# File header: magic bytes, format version, seed, window size and the final score of the game
+MAGIC = b"BRKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBQHQ")
+
+"""
+Appends an unsigned integer to a buffer as a varint: 7 bits per byte, with the high bit set on every byte except the last.
+Small numbers take a single byte.
+
+Parameters
+----------
+buffer : bytearray
+    The buffer to append to.
+value : int
+    The number to append.
+
+Returns
+-------
+None
+
+Raises
+------
+ValueError
+    If value is negative.
+"""
+def write_varint(buffer: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("value must not be negative")
+
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+"""
+Reads a varint from a buffer.
+
+Parameters
+----------
+data : bytes
+    The buffer to read from.
+offset : int
+    The position of the varint in the buffer.
+
+Returns
+-------
+value, offset : tuple[int, int]
+    The number, and the position after the varint.
+
+Raises
+------
+ValueError
+    If the buffer ends in the middle of the varint.
+"""
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+
+    while True:
+        if offset >= len(data):
+            raise ValueError("Replay ends in the middle of a number")
+
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return value, offset
+
+"""
+Maps a signed integer to an unsigned one so that numbers close to 0 stay small: 0, -1, 1, -2, 2, ... become 0, 1, 2, 3, 4, ...
+
+Parameters
+----------
+value : int
+    The signed number, between -2**63 and 2**63 - 1.
+
+Returns
+-------
+int
+    The unsigned number.
+
+Raises
+------
+None
+"""
+def zigzag_encode(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+"""
+Reverses zigzag_encode.
+
+Parameters
+----------
+value : int
+    The unsigned number.
+
+Returns
+-------
+int
+    The signed number.
+
+Raises
+------
+None
+"""
+def zigzag_decode(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+"""
+Returns the bits of a float as a signed 64-bit integer.
+Frame times that are close together have bit patterns that are close together, so their differences are small.
+
+Parameters
+----------
+value : float
+    The number.
+
+Returns
+-------
+int
+    The bits of the number as a float64.
+
+Raises
+------
+None
+"""
+def float_bits(value: float) -> int:
+    return struct.unpack("<q", struct.pack("<d", value))[0]
+
+"""
+Reverses float_bits.
+
+Parameters
+----------
+bits : int
+    The bits of a float64.
+
+Returns
+-------
+float
+    The number.
+
+Raises
+------
+None
+"""
+def bits_float(bits: int) -> float:
+    return struct.unpack("<d", struct.pack("<q", bits))[0]
+
+
+class ReplayRecorder:
+    """
+    Records a game so it can be played again: the seed of the game's random number generator, and the time delta and player input of every update.
+    Everything random in the game comes from the seeded generator, so the seed and the updates are enough to play the game out the same way.
+
+    The updates are stored as runs of identical updates. With a fixed time step the time delta never changes and the input only changes
+    when the player presses or releases a key, so a game of many thousands of updates takes a few hundred runs.
+    Each run is written as its length, the change in the bits of the time delta since the previous run and the input flags,
+    with the numbers as varints, so most runs take 3 bytes.
+
+    Attributes
+    ----------
+    seed : int
+        The seed of the game.
+    window_size : int
+        The size of the game window.
+    runs : list[list[int, float, int]]
+        The recorded updates, as [count, dt, inputs] runs.
+    frames : int
+        The number of recorded updates.
+
+    Methods
+    -------
+    record(dt: float, inputs: int) -> None
+        Records one update.
+    to_bytes(score: int) -> bytes
+        Encodes the replay.
+    save(path: str | Path, score: int) -> None
+        Saves the replay to a file.
+    """
+
+    def __init__(self, seed: int, window_size: int):
+        if seed < 0 or seed >= 2 ** 64:
+            raise ValueError("seed must be between 0 and 2**64 - 1")
+
+        self.seed = seed
+        self.window_size = window_size
+        self.runs = []
+        self.frames = 0
+
+    """
+    Records one update. Extends the last run if the time delta and input are the same, otherwise starts a new run.
+
+    Parameters
+    ----------
+    dt : float
+        The time delta of the update.
+    inputs : int
+        The player's input, as PlayerInput flags.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def record(self, dt: float, inputs: int) -> None:
+        self.frames += 1
+
+        if len(self.runs) > 0:
+            run = self.runs[-1]
+            if run[1] == dt and run[2] == inputs:
+                run[0] += 1
+                return
+
+        self.runs.append([1, dt, inputs])
+
+    """
+    Encodes the replay: the header, followed by the runs.
+
+    Parameters
+    ----------
+    score : int
+        The final score of the game, used to verify it when the replay is played.
+
+    Returns
+    -------
+    bytes
+        The encoded replay.
+
+    Raises
+    ------
+    None
+    """
+    def to_bytes(self, score: int) -> bytes:
+        buffer = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.window_size, score))
+
+        previous_bits = 0
+        for count, dt, inputs in self.runs:
+            bits = float_bits(dt)
+            write_varint(buffer, count)
+            write_varint(buffer, zigzag_encode(bits - previous_bits))
+            buffer.append(inputs)
+            previous_bits = bits
+
+        return bytes(buffer)
+
+    """
+    Saves the replay to a file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The file to save to.
+    score : int
+        The final score of the game.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def save(self, path, score: int) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(score))
+
+
+class ReplayPlayer:
+    """
+    Plays a recorded game again, by creating a headless game with the recorded seed and updating it with the recorded time deltas and input.
+    Used to verify highscores and to reproduce bugs.
+
+    Attributes
+    ----------
+    seed : int
+        The seed of the game.
+    window_size : int
+        The size of the game window.
+    score : int
+        The final score of the recorded game.
+    runs : list[tuple[int, float, int]]
+        The recorded updates, as (count, dt, inputs) runs.
+
+    Methods
+    -------
+    from_bytes(data: bytes) -> ReplayPlayer
+        Decodes a replay.
+    load(path: str | Path) -> ReplayPlayer
+        Loads a replay from a file.
+    frames() -> Iterator[tuple[float, int]]
+        Yields the time delta and input of every recorded update.
+    play(**kwargs) -> GameManager
+        Plays the recorded game in a new headless game.
+    verify() -> bool
+        Checks that playing the replay gives the recorded score.
+    """
+
+    def __init__(self, seed: int, window_size: int, score: int, runs: list):
+        self.seed = seed
+        self.window_size = window_size
+        self.score = score
+        self.runs = runs
+
+    """
+    Decodes a replay.
+
+    Parameters
+    ----------
+    data : bytes
+        The encoded replay, from ReplayRecorder.to_bytes.
+
+    Returns
+    -------
+    ReplayPlayer
+        The player for the replay.
+
+    Raises
+    ------
+    ValueError
+        If the data is not a replay, or has an unsupported version.
+    """
+    @staticmethod
+    def from_bytes(data: bytes) -> "ReplayPlayer":
+        if len(data) < HEADER.size:
+            raise ValueError("Data is too short to be a replay")
+
+        magic, version, seed, window_size, score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Data is not a replay")
+        if version != VERSION:
+            raise ValueError(f'Unsupported replay version: {version}')
+
+        runs = []
+        offset = HEADER.size
+        bits = 0
+        while offset < len(data):
+            count, offset = read_varint(data, offset)
+            delta, offset = read_varint(data, offset)
+            if offset >= len(data):
+                raise ValueError("Replay ends in the middle of a run")
+
+            bits += zigzag_decode(delta)
+            runs.append((count, bits_float(bits), data[offset]))
+            offset += 1
+
+        return ReplayPlayer(seed, window_size, score, runs)
+
+    """
+    Loads a replay from a file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The file to load.
+
+    Returns
+    -------
+    ReplayPlayer
+        The player for the replay.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a replay, or has an unsupported version.
+    """
+    @staticmethod
+    def load(path) -> "ReplayPlayer":
+        with open(path, 'rb') as f:
+            return ReplayPlayer.from_bytes(f.read())
+
+    """
+    Yields the time delta and input of every recorded update, in order.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    Iterator[tuple[float, int]]
+        The time delta and input flags of each update.
+
+    Raises
+    ------
+    None
+    """
+    def frames(self):
+        for count, dt, inputs in self.runs:
+            for _ in range(count):
+                yield dt, inputs
+
+    """
+    Plays the recorded game in a new headless game, as fast as possible.
+
+    Parameters
+    ----------
+    **kwargs
+        Other arguments for the GameManager, e.g. ball_backend.
+
+    Returns
+    -------
+    GameManager
+        The game after the last recorded update.
+
+    Raises
+    ------
+    None
+    """
+    def play(self, **kwargs) -> GameManager:
+        game_manager = GameManager.create_headless(self.seed, self.window_size, **kwargs)
+
+        for dt, inputs in self.frames():
+            game_manager.step(dt, inputs)
+
+        return game_manager
+
+    """
+    Checks that playing the replay gives the recorded score, e.g. to verify a highscore.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    bool
+        True if the score of the played game matches the recorded score, False otherwise.
+
+    Raises
+    ------
+    None
+    """
+    def verify(self) -> bool:
+        return self.play().total_points == self.score
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        replay = ReplayPlayer.load(path)
+        frames = sum(count for count, dt, inputs in replay.runs)
+        result = "verified" if replay.verify() else "MISMATCH"
+        print(f'{path}: seed {replay.seed}, {frames} updates in {len(replay.runs)} runs, score {replay.score}: {result}')
@@ -0,0 +1,375 @@
+import math
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from BrickGrid import BrickGrid
+from GameManager import GameManager
+
+# The most balls written to the shared state per game. ball_count holds the real number of balls, which can be higher.
+MAX_BALLS = 64
+
+# Position, velocity direction, speed and radius of a ball
+BALL_FIELDS = ("x", "y", "vx", "vy", "speed", "radius")
+
+# The fields of a game record that hold a single value, in the order SharedGame.write writes them
+SCALAR_FIELDS = ("paddle_x", "paddle_y", "paddle_width", "paddle_height", "lives", "level", "level_points", "total_points",
+                 "elapsed_time", "game_started", "lost_game", "ball_count", "brick_count")
+
+"""
+Returns the layout of the shared state of one game, as a NumPy structured dtype.
+Every game has one record, so the state of all games is one array with a field per value, e.g. state["lives"] has the lives of every game.
+
+The bricks are stored as the number of hits each cell of the brick grid has left, with the rows counted from the top of the screen.
+0 means there is no brick.
+
+Parameters
+----------
+rows : int
+    The number of rows of brick cells.
+columns : int
+    The number of columns of brick cells.
+
+Returns
+-------
+np.dtype
+    The layout of a game record.
+
+Raises
+------
+None
+"""
+def game_dtype(rows: int, columns: int) -> np.dtype:
+    return np.dtype([
+        ("paddle_x", np.float64), ("paddle_y", np.float64), ("paddle_width", np.float64), ("paddle_height", np.float64),
+        ("lives", np.int32), ("level", np.int32), ("level_points", np.int64), ("total_points", np.int64),
+        ("elapsed_time", np.float64), ("game_started", np.bool_), ("lost_game", np.bool_),
+        ("ball_count", np.int32), ("brick_count", np.int32),
+        ("balls", np.float64, (MAX_BALLS, len(BALL_FIELDS))),
+        ("bricks", np.int32, (rows, columns)),
+    ])
+
+
+class SharedGame:
+    """
+    A headless game in a worker process, and its record in the shared state.
+    After every step the game writes its state into its record. The bricks are only written again if a brick was added,
+    removed or damaged, a row was pushed, or the grid was replaced, and then only the changed cells are written if the grid is the same.
+
+    Attributes
+    ----------
+    game_manager : GameManager
+        The game.
+    index : int
+        The index of the game's record in the shared state.
+    scalars : np.ndarray
+        View of the fields of the shared state that hold a single value, so they can be written in one assignment.
+    balls : np.ndarray
+        View of the game's balls in the shared state.
+    bricks : np.ndarray
+        View of the game's bricks in the shared state.
+    brick_grid : BrickGrid | None
+        The grid the bricks were last written from.
+    top_row : int | None
+        The top row of the grid when the bricks were last written.
+
+    Methods
+    -------
+    write() -> None
+        Writes the state of the game into its record.
+    write_bricks() -> None
+        Writes the bricks that changed since the last write.
+    """
+
+    def __init__(self, game_manager, state: np.ndarray, index: int):
+        self.game_manager = game_manager
+        self.index = index
+        self.scalars = state[list(SCALAR_FIELDS)]
+        self.balls = state["balls"][index]
+        self.bricks = state["bricks"][index]
+        self.brick_grid = None
+        self.top_row = None
+
+    """
+    Writes the state of the game into its record: the paddle, balls, bricks, scores and lives.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def write(self) -> None:
+        game_manager = self.game_manager
+        paddle = game_manager.paddle
+        balls = game_manager.balls
+
+        self.write_bricks()
+
+        self.scalars[self.index] = (paddle.x, paddle.y, paddle.width, paddle.height, game_manager.lives,
+                                    game_manager.level_manager.current_level, game_manager.level_points, game_manager.total_points,
+                                    game_manager.elapsed_time, game_manager.game_started, game_manager.lost_game,
+                                    len(balls), len(game_manager.bricks))
+
+        ball_count = min(len(balls), MAX_BALLS)
+        if ball_count > 0:
+            self.balls[:ball_count] = [(ball.x, ball.y, ball.vx, ball.vy, ball.speed, ball.radius) for ball in balls[:ball_count]]
+
+    """
+    Writes the bricks that changed since the last write. All bricks are written if a row was pushed or the grid was replaced,
+    since every cell has moved. Otherwise only the cells the grid marked as changed are written.
+    Only this worker reads the changed cells of the grid, since headless games are not drawn.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def write_bricks(self) -> None:
+        brick_grid = self.game_manager.bricks
+        bricks = self.bricks
+        rows, columns = bricks.shape
+        dirty_cells = brick_grid.take_dirty_cells()
+
+        if brick_grid is not self.brick_grid or brick_grid.top_row != self.top_row:
+            bricks[:] = 0
+            for brick in brick_grid:
+                column, row = brick_grid.cell_of(brick)
+                if row < rows and column < columns:
+                    bricks[row, column] = brick.durability - brick.hits
+
+            self.brick_grid = brick_grid
+            self.top_row = brick_grid.top_row
+
+        else:
+            for column, row_id in dirty_cells:
+                row = row_id - brick_grid.top_row
+                if 0 <= row < rows and column < columns:
+                    brick = brick_grid.get(column, row)
+                    bricks[row, column] = 0 if brick is None else brick.durability - brick.hits
+
+
+"""
+Runs the games of one worker: creates the headless games, writes their first state and then steps them every time
+a message with their actions arrives, until an empty message arrives.
+Every message is answered with an empty message once all games have been stepped and their state written.
+
+Parameters
+----------
+connection : multiprocessing.connection.Connection
+    The worker's end of the pipe to the controller.
+memory_name : str
+    The name of the shared memory block with the state of all games.
+num_games : int
+    The number of games in the shared state.
+rows, columns : int
+    The size of the brick arrays in the shared state.
+first_game : int
+    The index of the worker's first game.
+last_game : int
+    The index after the worker's last game.
+seed : int
+    The seed of game 0. Game i gets seed + i.
+window_size : int
+    The size of the game window.
+dt : float
+    The time each step updates the games by, in seconds.
+kwargs : dict
+    Other arguments for the GameManagers, e.g. ball_backend.
+
+Returns
+-------
+None
+
+Raises
+------
+None
+"""
+def run_worker(connection, memory_name: str, num_games: int, rows: int, columns: int, first_game: int, last_game: int,
+               seed: int, window_size: int, dt: float, kwargs: dict) -> None:
+    memory = shared_memory.SharedMemory(name=memory_name)
+    state = np.ndarray((num_games,), dtype=game_dtype(rows, columns), buffer=memory.buf)
+
+    games = [SharedGame(GameManager.create_headless(seed + index, window_size, **kwargs), state, index)
+             for index in range(first_game, last_game)]
+    for game in games:
+        game.write()
+    connection.send_bytes(b"")
+
+    while True:
+        actions = connection.recv_bytes()
+        if len(actions) == 0:
+            break
+
+        for game, inputs in zip(games, actions):
+            game.game_manager.step(dt, inputs)
+            game.write()
+        connection.send_bytes(b"")
+
+    # The views of the shared memory have to be released before it can be closed
+    del games, state
+    memory.close()
+    connection.close()
+
+
+class SharedWorkers:
+    """
+    Headless games spread over a pool of worker processes, for simulations that are too large for one core.
+    Each worker owns a slice of the games and writes their state into a shared memory block after every step,
+    so the controller reads the state of every game directly from the block, without pickling or copying.
+    Stepping is coordinated with one pipe per worker, which only carries the action bytes of the worker's games and an empty reply.
+
+    The games are normal GameManagers, so they follow the rules of the game exactly, including modifiers.
+    Lost games stay lost until they are sent PlayerInput.RESTART.
+
+    Attributes
+    ----------
+    num_games : int
+        The number of games.
+    window_size : int
+        The size of the game window.
+    dt : float
+        The time each step updates the games by, in seconds.
+    slices : list[tuple[int, int]]
+        The first game and the game after the last game of each worker.
+    memory : shared_memory.SharedMemory | None
+        The shared memory block with the state of all games.
+    state : np.ndarray | None
+        The state of all games, one record per game. See game_dtype for the fields.
+    connections : list[multiprocessing.connection.Connection]
+        The controller's ends of the pipes to the workers.
+    processes : list[multiprocessing.Process]
+        The worker processes.
+
+    Methods
+    -------
+    step(actions: np.ndarray) -> None
+        Steps every game by one step with its action.
+    close() -> None
+        Stops the workers and frees the shared memory.
+    """
+
+    def __init__(self, num_games: int, workers: int = None, seed: int = 0, window_size: int = 500, dt: float = 1 / 240, **kwargs):
+        if num_games <= 0:
+            raise ValueError("num_games must be greater than 0")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError("workers must be greater than 0")
+        if dt <= 0:
+            raise ValueError("dt must be greater than 0")
+
+        self.num_games = num_games
+        self.window_size = window_size
+        self.dt = dt
+
+        # Bricks can be pushed down to the bottom of the screen
+        rows = math.ceil(window_size / BrickGrid.CELL_HEIGHT)
+        columns = math.ceil(window_size / BrickGrid.CELL_WIDTH)
+        dtype = game_dtype(rows, columns)
+
+        self.memory = shared_memory.SharedMemory(create=True, size=num_games * dtype.itemsize)
+        self.state = np.ndarray((num_games,), dtype=dtype, buffer=self.memory.buf)
+
+        # Split the games as evenly as possible, with no more workers than games
+        workers = min(workers, num_games)
+        bounds = [round(i * num_games / workers) for i in range(workers + 1)]
+        self.slices = list(zip(bounds[:-1], bounds[1:]))
+
+        self.connections = []
+        self.processes = []
+        for first_game, last_game in self.slices:
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(worker_connection, self.memory.name, num_games, rows, columns, first_game, last_game, seed, window_size, dt, kwargs),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        # Wait until every worker has written the first state of its games
+        for connection in self.connections:
+            connection.recv_bytes()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    """
+    Steps every game by one step with its action, and waits until every worker has written the new state of its games.
+    The workers step their games at the same time.
+
+    Parameters
+    ----------
+    actions : np.ndarray
+        The input of every game, as PlayerInput flags.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If there is not one action per game.
+    """
+    def step(self, actions) -> None:
+        actions = np.asarray(actions, dtype=np.uint8)
+        if actions.shape != (self.num_games,):
+            raise ValueError("actions must have one action per game")
+
+        # Send the actions to every worker before waiting for any of them
+        for connection, (first_game, last_game) in zip(self.connections, self.slices):
+            connection.send_bytes(actions[first_game:last_game].tobytes())
+        for connection in self.connections:
+            connection.recv_bytes()
+
+    """
+    Stops the workers and frees the shared memory. The state can not be read after this.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def close(self) -> None:
+        if self.memory is None:
+            return
+
+        for connection in self.connections:
+            connection.send_bytes(b"")
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+
+        # The view of the shared memory has to be released before it can be closed
+        self.state = None
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
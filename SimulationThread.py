@@ -0,0 +1,216 @@
+import threading
+import time
+from FrameSnapshot import FrameSnapshot
+
+class SimulationThread(threading.Thread):
+    """
+    Thread that updates the game at a fixed rate, independently of how fast the game is drawn.
+    After every step a FrameSnapshot of the game is published. The last two snapshots are kept as a pair (double buffering),
+    and a new pair replaces the old one in a single assignment, so the render thread always gets two complete snapshots
+    and never reads the game while it is being updated.
+
+    The render thread passes the pressed keys in the keys attribute, and they are applied before every step.
+    Code on other threads that has to change the game (e.g. the end screen) must hold the lock.
+
+    Attributes
+    ----------
+    game_manager : GameManager
+        The game being updated.
+    input_handler : Callable[[ScancodeWrapper], None]
+        Function that applies the pressed keys to the game, called before every step.
+    step_rate : int
+        The number of steps per second.
+    step_dt : float
+        The length of a step in seconds.
+    max_lag : float
+        The longest time the thread catches up on after falling behind (e.g. when the process was paused). Older steps are skipped.
+    keys : ScancodeWrapper | None
+        The keys pressed in the latest rendered frame.
+    lock : threading.Lock
+        Held while the game is updated. Can be shared with the code on other threads that changes the game.
+    stop_event : threading.Event
+        Set to stop the thread.
+    snapshots : tuple[FrameSnapshot, FrameSnapshot, float]
+        The snapshots of the last two steps and the time (from time.perf_counter) the current one was published, as (previous, current, time).
+    steps : int
+        The number of steps since the thread was started.
+    bricks : tuple[BrickState, ...] | None
+        The bricks of the last snapshot. Shared by the next snapshot if no brick changed.
+    brick_grid : BrickGrid | None
+        The grid the bricks were captured from.
+    top_row : int | None
+        The top row of the grid when the bricks were captured.
+
+    Methods
+    -------
+    run() -> None
+        Updates the game at the fixed rate until the thread is stopped.
+    step() -> None
+        Applies the pressed keys, updates the game by one step and publishes a snapshot.
+    capture_bricks() -> tuple[BrickState, ...]
+        Returns the bricks for the next snapshot, capturing them again only if they changed.
+    latest() -> tuple[FrameSnapshot, FrameSnapshot, float]
+        Returns the last two snapshots and how far the render time is between them.
+    stop() -> None
+        Stops the thread and waits for it to finish.
+    """
+
+    def __init__(self, game_manager, input_handler, step_rate: int = 240, max_lag: float = 0.25, lock=None):
+        if step_rate <= 0:
+            raise ValueError("step_rate must be greater than 0")
+
+        super().__init__(name="Simulation", daemon=True)
+
+        self.game_manager = game_manager
+        self.input_handler = input_handler
+        self.step_rate = step_rate
+        self.step_dt = 1 / step_rate
+        self.max_lag = max_lag
+        self.keys = None
+        self.lock = lock if lock is not None else threading.Lock()
+        self.stop_event = threading.Event()
+
+        self.bricks = None
+        self.brick_grid = None
+        self.top_row = None
+
+        current = FrameSnapshot.capture(game_manager, self.capture_bricks())
+        self.snapshots = (current, current, time.perf_counter())
+        self.steps = 0
+
+    """
+    Updates the game at the fixed rate until the thread is stopped.
+    The steps are scheduled on a fixed timeline, so a late step is followed by shorter waits until the thread has caught up.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def run(self) -> None:
+        next_step = time.perf_counter()
+
+        while not self.stop_event.is_set():
+            now = time.perf_counter()
+
+            if now < next_step:
+                # Wait for the next step without holding the lock
+                self.stop_event.wait(next_step - now)
+                continue
+
+            # Skip the steps that cannot be caught up on
+            if now - next_step > self.max_lag:
+                next_step = now
+
+            self.step()
+            next_step += self.step_dt
+
+    """
+    Applies the pressed keys, updates the game by one step and publishes a snapshot.
+    Nothing is updated while the game is over, since the end screen is handled by the render thread.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def step(self) -> None:
+        with self.lock:
+            game_manager = self.game_manager
+            if game_manager.lost_game:
+                return
+
+            game_manager.dt = self.step_dt
+            if self.keys is not None:
+                self.input_handler(self.keys)
+            game_manager.update()
+
+            snapshot = FrameSnapshot.capture(game_manager, self.capture_bricks())
+
+        # Publish the new pair of snapshots in one assignment
+        self.snapshots = (self.snapshots[1], snapshot, time.perf_counter())
+        self.steps += 1
+
+    """
+    Returns the bricks for the next snapshot. The bricks are only captured again if a brick was added, removed or damaged,
+    a row was pushed, or the grid was replaced. Otherwise the bricks of the last snapshot are reused.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    tuple[BrickState, ...]
+        The bricks in the game.
+
+    Raises
+    ------
+    None
+    """
+    def capture_bricks(self) -> tuple:
+        brick_grid = self.game_manager.bricks
+
+        # Only this thread reads the changed cells of the grid, the render thread draws from the snapshots
+        changed = len(brick_grid.take_dirty_cells()) > 0
+
+        if changed or self.bricks is None or brick_grid is not self.brick_grid or brick_grid.top_row != self.top_row:
+            self.bricks = FrameSnapshot.capture_bricks(brick_grid)
+            self.brick_grid = brick_grid
+            self.top_row = brick_grid.top_row
+
+        return self.bricks
+
+    """
+    Returns the last two snapshots and how far the render time is between them.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    previous, current, alpha : tuple[FrameSnapshot, FrameSnapshot, float]
+        The snapshots of the last two steps, and the interpolation factor from 0 (previous) to 1 (current).
+
+    Raises
+    ------
+    None
+    """
+    def latest(self) -> tuple:
+        previous, current, published_at = self.snapshots
+        alpha = min((time.perf_counter() - published_at) / self.step_dt, 1)
+        return previous, current, alpha
+
+    """
+    Stops the thread and waits for it to finish.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.join()
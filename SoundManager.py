@@ -52,3 +52,75 @@ class SoundManager:
         mixer.music.play(-1, 0.0)
         self.playing_music = True
         self.extravaganza = False
+
+
+class NullSoundManager:
+    # Sound manager that plays nothing, for games that run without an audio device (e.g. headless simulations).
+    # Does not initialise the mixer or load any files.
+
+    def __init__(self):
+        self.playing_music = False   # Indicates if music is currently playing
+        self.extravaganza = False   # Indicates if extravaganza music is currently playing
+
+    def start_music(self):
+        self.playing_music = True
+
+    def stop_music(self):
+        self.playing_music = False
+
+    def play_paddle_hit_sound(self):
+        pass
+
+    def play_brick_hit_sound(self):
+        pass
+
+    def play_new_row_sound(self):
+        pass
+
+    def play_wall_hit_sound(self):
+        pass
+
+    def start_extravaganza(self):
+        self.playing_music = True
+        self.extravaganza = True
+
+    def stop_extravaganza(self):
+        self.playing_music = True
+        self.extravaganza = False
+
+
+class RecordingSoundManager(NullSoundManager):
+    # Sound manager that plays nothing, but records the name of every sound that would have been played, in order.
+    # Useful to check what happened in a headless game.
+
+    def __init__(self):
+        super().__init__()
+        self.events = []   # Names of the sounds and music changes, in the order they happened
+
+    def start_music(self):
+        super().start_music()
+        self.events.append("start_music")
+
+    def stop_music(self):
+        super().stop_music()
+        self.events.append("stop_music")
+
+    def play_paddle_hit_sound(self):
+        self.events.append("paddle_hit")
+
+    def play_brick_hit_sound(self):
+        self.events.append("brick_hit")
+
+    def play_new_row_sound(self):
+        self.events.append("new_row")
+
+    def play_wall_hit_sound(self):
+        self.events.append("wall_hit")
+
+    def start_extravaganza(self):
+        super().start_extravaganza()
+        self.events.append("start_extravaganza")
+
+    def stop_extravaganza(self):
+        super().stop_extravaganza()
+        self.events.append("stop_extravaganza")
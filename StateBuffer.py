@@ -0,0 +1,314 @@
+import struct
+from Ball import Ball
+from BallBatch import BallBatch
+from Brick import Brick
+from BrickGrid import BrickGrid
+from Paddle import Paddle
+from Modifier import Modifier
+
+# The layout of a state buffer. All numbers are little-endian, and every string (colors and modifier names) is stored once,
+# in a string table, and referred to by its index.
+MAGIC = b"BRKS"
+VERSION = 1
+HEADER = struct.Struct("<4sBH")   # Magic, version, number of strings
+RANDOM_STATE = struct.Struct("<i625I?d")   # Version, Mersenne Twister state, whether a gauss value is cached, the cached gauss value
+GAME = struct.Struct("<ddqqiB" "iiddd" "dddddH" "HqIIHIHHH")
+BALL = struct.Struct("<dddddd??H")
+BRICK_KIND = struct.Struct("<ddHi")   # Width, height, color and durability, shared by the bricks of the same kind
+BRICK = struct.Struct("<dHHdHH")   # x, column, row, offset from the top of the row, kind and hits
+MODIFIER = struct.Struct("<ddHHdHd?d?")
+MODIFIER_COUNT = struct.Struct("<HII")
+
+# Flags of the game state, stored as bits of a single byte
+FLAGS = ("game_started", "won_game", "lost_game", "death_disabled", "name_entered")
+
+
+class StringTable:
+    """
+    The strings in a state buffer, e.g. colors and modifier names. Each string is stored once and referred to by its index.
+
+    Attributes
+    ----------
+    strings : list[str]
+        The strings, in the order they were added.
+    indices : dict[str, int]
+        The index of each string.
+
+    Methods
+    -------
+    index(string: str) -> int
+        Returns the index of a string, adding it to the table if it is new.
+    to_bytes() -> bytes
+        Encodes the strings.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    """
+    Returns the index of a string, adding it to the table if it is new.
+
+    Parameters
+    ----------
+    string : str
+        The string.
+
+    Returns
+    -------
+    int
+        The index of the string.
+
+    Raises
+    ------
+    None
+    """
+    def index(self, string: str) -> int:
+        index = self.indices.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(string)
+            self.indices[string] = index
+        return index
+
+    """
+    Encodes the strings, each as its length in bytes followed by its UTF-8 bytes.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    bytes
+        The encoded strings.
+
+    Raises
+    ------
+    None
+    """
+    def to_bytes(self) -> bytes:
+        buffer = bytearray()
+        for string in self.strings:
+            encoded = string.encode()
+            buffer.append(len(encoded))
+            buffer += encoded
+        return bytes(buffer)
+
+
+"""
+Packs the state of a game into a flat buffer: the paddle, balls, bricks, dropped and active modifiers, level manager,
+scores, timers and the state of the random number generator.
+The settings of the game (window size, collision modes, drop rates, etc.), the modifier list and the sound manager are not part of the state.
+
+Parameters
+----------
+game_manager : GameManager
+    The game to pack.
+
+Returns
+-------
+bytes
+    The packed state.
+
+Raises
+------
+None
+"""
+def pack_state(game_manager) -> bytes:
+    strings = StringTable()
+    parts = []
+
+    # Random number generator
+    version, internal_state, gauss_next = game_manager.random.getstate()
+    parts.append(RANDOM_STATE.pack(version, *internal_state, gauss_next is not None, gauss_next or 0.0))
+
+    # Game, level manager and paddle
+    flags = 0
+    for bit, name in enumerate(FLAGS):
+        if getattr(game_manager, name):
+            flags |= 1 << bit
+
+    level_manager = game_manager.level_manager
+    paddle = game_manager.paddle
+    bricks = game_manager.bricks
+    modifier_names = sorted(set(game_manager.modifiers_dropped) | set(game_manager.modifiers_caught))
+
+    # The bricks are stored with the cell they are in, so they can be put back without searching for their cell.
+    # Their size, color and durability are stored once per kind of brick.
+    top_row = bricks.top_row
+    cell_width = bricks.CELL_WIDTH
+    kinds = {}
+    brick_parts = []
+    for brick in bricks:
+        kind_key = (brick.width, brick.height, brick.color, brick.durability)
+        kind = kinds.get(kind_key)
+        if kind is None:
+            kind = kinds[kind_key] = len(kinds)
+        brick_parts.append(BRICK.pack(brick.x, int(brick.x // cell_width), brick.row - top_row, brick.offset_y, kind, brick.hits))
+
+    parts.append(GAME.pack(
+        game_manager.dt, game_manager.elapsed_time, game_manager.level_points, game_manager.total_points, game_manager.lives, flags,
+        level_manager.current_level, level_manager.hit_multiplier, level_manager.ball_speed, level_manager.max_time, level_manager.time_spent,
+        paddle.x, paddle.y, paddle.width, paddle.base_width, paddle.height, strings.index(paddle.color),
+        bricks.columns, bricks.top_row, bricks.row_count, len(game_manager.balls), len(kinds), len(bricks),
+        len(game_manager.dropped_modifiers), len(game_manager.active_modifiers), len(modifier_names)
+    ))
+
+    for ball in game_manager.balls:
+        parts.append(BALL.pack(ball.x, ball.y, ball.vx, ball.vy, ball.radius, ball.speed, ball.is_dead, ball.death_disabled,
+                               strings.index(ball.color)))
+
+    for width, height, color, durability in kinds:
+        parts.append(BRICK_KIND.pack(width, height, strings.index(color), durability))
+    parts += brick_parts
+
+    for modifier in game_manager.dropped_modifiers + game_manager.active_modifiers:
+        time_remaining = modifier.time_remaining
+        parts.append(MODIFIER.pack(modifier.x, modifier.y, strings.index(modifier.name), strings.index(modifier.type), modifier.radius,
+                                   strings.index(modifier.color), modifier.fall_speed, time_remaining is not None, time_remaining or 0.0,
+                                   modifier.is_active))
+
+    for name in modifier_names:
+        parts.append(MODIFIER_COUNT.pack(strings.index(name), game_manager.modifiers_dropped.get(name, 0),
+                                         game_manager.modifiers_caught.get(name, 0)))
+
+    # The string table is written before the rest, so it can be read first
+    return HEADER.pack(MAGIC, VERSION, len(strings.strings)) + strings.to_bytes() + b"".join(parts)
+
+"""
+Restores the state of a game from a buffer made by pack_state.
+New paddle, ball, brick and modifier objects are created, so the game does not share any objects with the game the state was packed from.
+The brick a dropped modifier came from is not part of the state, since it is only used when the modifier is dropped.
+
+Parameters
+----------
+game_manager : GameManager
+    The game to restore the state into.
+data : bytes
+    The packed state.
+
+Returns
+-------
+None
+
+Raises
+------
+ValueError
+    If the data is not a state buffer, or has an unsupported version.
+"""
+def unpack_state(game_manager, data: bytes) -> None:
+    if len(data) < HEADER.size:
+        raise ValueError("Data is too short to be a state buffer")
+
+    magic, version, string_count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Data is not a state buffer")
+    if version != VERSION:
+        raise ValueError(f'Unsupported state buffer version: {version}')
+
+    # String table
+    offset = HEADER.size
+    strings = []
+    for _ in range(string_count):
+        length = data[offset]
+        strings.append(data[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+
+    # Random number generator
+    random_state = RANDOM_STATE.unpack_from(data, offset)
+    offset += RANDOM_STATE.size
+    has_gauss, gauss_next = random_state[-2:]
+    game_manager.random.setstate((random_state[0], random_state[1:-2], gauss_next if has_gauss else None))
+
+    # Game, level manager and paddle
+    (game_manager.dt, game_manager.elapsed_time, game_manager.level_points, game_manager.total_points, game_manager.lives, flags,
+     current_level, hit_multiplier, ball_speed, max_time, time_spent,
+     paddle_x, paddle_y, paddle_width, paddle_base_width, paddle_height, paddle_color,
+     columns, top_row, row_count, ball_count, kind_count, brick_count, dropped_count, active_count, modifier_name_count) = GAME.unpack_from(data, offset)
+    offset += GAME.size
+
+    for bit, name in enumerate(FLAGS):
+        setattr(game_manager, name, bool(flags & (1 << bit)))
+
+    level_manager = game_manager.level_manager
+    level_manager.current_level = current_level
+    level_manager.hit_multiplier = hit_multiplier
+    level_manager.ball_speed = ball_speed
+    level_manager.max_time = max_time
+    level_manager.time_spent = time_spent
+
+    paddle = Paddle(paddle_x, paddle_y)
+    paddle.width = paddle_width
+    paddle.base_width = paddle_base_width
+    paddle.height = paddle_height
+    paddle.color = strings[paddle_color]
+    game_manager.paddle = paddle
+
+    # Balls
+    end = offset + ball_count * BALL.size
+    balls = []
+    for x, y, vx, vy, radius, speed, is_dead, death_disabled, color in BALL.iter_unpack(data[offset:end]):
+        ball = Ball(x, y, vx, vy, radius, strings[color], speed=speed)
+        ball.is_dead = is_dead
+        ball.death_disabled = death_disabled
+        balls.append(ball)
+    game_manager.balls = BallBatch(balls) if game_manager.ball_backend == "batch" else balls
+    offset = end
+
+    # Bricks. The grid is empty, so its top row can be set before its rows are added.
+    end = offset + kind_count * BRICK_KIND.size
+    kinds = [(width, height, strings[color], durability) for width, height, color, durability in BRICK_KIND.iter_unpack(data[offset:end])]
+    offset = end
+
+    end = offset + brick_count * BRICK.size
+    grid = BrickGrid(columns)
+    grid.top_row = top_row
+    grid.add_rows(row_count)
+    for x, column, row, offset_y, kind, hits in BRICK.iter_unpack(data[offset:end]):
+        width, height, color, durability = kinds[kind]
+        brick = Brick(x, offset_y, color, width, height, durability)
+        brick.hits = hits
+        grid.place(brick, column, row)
+    game_manager.bricks = grid
+    game_manager.brick_broadphase = None   # Rebuilt from the new grid the next time it is used
+    offset = end
+
+    # Dropped and active modifiers
+    end = offset + (dropped_count + active_count) * MODIFIER.size
+    modifiers = []
+    for x, y, name, type, radius, color, fall_speed, has_time, time_remaining, is_active in MODIFIER.iter_unpack(data[offset:end]):
+        # Created without __init__, which would pick a random color
+        modifier = Modifier.__new__(Modifier)
+        modifier.x = x
+        modifier.y = y
+        modifier.name = strings[name]
+        modifier.type = strings[type]
+        modifier.radius = radius
+        modifier.color = strings[color]
+        modifier.fall_speed = fall_speed
+        modifier.time_remaining = time_remaining if has_time else None
+        modifier.is_active = is_active
+        modifier.brick = None
+        game_manager.modifier_factory.assign_id(modifier)
+        modifiers.append(modifier)
+    game_manager.dropped_modifiers = modifiers[:dropped_count]
+    game_manager.active_modifiers = modifiers[dropped_count:]
+    offset = end
+
+    # Modifier statistics
+    end = offset + modifier_name_count * MODIFIER_COUNT.size
+    game_manager.modifiers_dropped = {}
+    game_manager.modifiers_caught = {}
+    for name, dropped, caught in MODIFIER_COUNT.iter_unpack(data[offset:end]):
+        if dropped > 0:
+            game_manager.modifiers_dropped[strings[name]] = dropped
+        if caught > 0:
+            game_manager.modifiers_caught[strings[name]] = caught
+
+    # Play the extravaganza music if an Extravaganza modifier is active, and stop it otherwise
+    extravaganza = any(modifier.name == "Extravaganza" for modifier in game_manager.active_modifiers)
+    if extravaganza and not game_manager.sound_manager.extravaganza:
+        game_manager.sound_manager.start_extravaganza()
+    elif not extravaganza and game_manager.sound_manager.extravaganza:
+        game_manager.sound_manager.stop_extravaganza()
@@ -0,0 +1,127 @@
+import pygame
+from collections import OrderedDict
+
+class TextCache:
+    """
+    Cache for fonts and rendered text.
+    Every font is loaded once and kept in a registry, and rendered text surfaces are kept in a least recently used cache,
+    so text that does not change between frames (e.g. "Lives: 3") is only rendered once.
+
+    Attributes
+    ----------
+    font_path : str
+        The font file used for all text.
+    max_size : int
+        The maximum number of rendered text surfaces kept in the cache. The least recently used surface is removed first.
+    fonts : dict[int, pygame.font.Font]
+        The loaded fonts, keyed by font size.
+    surfaces : OrderedDict[tuple[str, int, str], pygame.Surface]
+        The rendered text surfaces, keyed by (text, size, color), from least to most recently used.
+    hits : int
+        The number of times a rendered text surface was found in the cache.
+    misses : int
+        The number of times text had to be rendered.
+
+    Methods
+    -------
+    font(size: int) -> pygame.font.Font
+        Returns the font of the given size, loading it the first time it is used.
+    render(text: str, size: int, color: str) -> pygame.Surface
+        Returns the rendered text, rendering it only if it is not in the cache.
+    clear() -> None
+        Removes all rendered text surfaces from the cache.
+    """
+
+    def __init__(self, font_path: str = 'freesansbold.ttf', max_size: int = 256):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+
+        self.font_path = font_path
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    """
+    Returns the font of the given size, loading it the first time it is used.
+
+    Parameters
+    ----------
+    size : int
+        The font size.
+
+    Returns
+    -------
+    pygame.font.Font
+        The font.
+
+    Raises
+    ------
+    None
+    """
+    def font(self, size: int) -> pygame.font.Font:
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_path, size)
+            self.fonts[size] = font
+        return font
+
+    """
+    Returns the rendered text, rendering it only if it is not in the cache.
+
+    Parameters
+    ----------
+    text : str
+        The text to render.
+    size : int
+        The font size.
+    color : str
+        The color of the text.
+
+    Returns
+    -------
+    pygame.Surface
+        The rendered (antialiased) text. The surface is shared, so it should not be changed.
+
+    Raises
+    ------
+    None
+    """
+    def render(self, text: str, size: int, color: str) -> pygame.Surface:
+        key = (text, size, color)
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            # Mark the surface as most recently used
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+
+        # Remove the least recently used surface if the cache is full
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    """
+    Removes all rendered text surfaces from the cache. The loaded fonts and the counters are kept.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def clear(self) -> None:
+        self.surfaces.clear()
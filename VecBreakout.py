@@ -0,0 +1,554 @@
+import math
+import numpy as np
+from BallBatch import edge_bounce
+from BrickGrid import BrickGrid
+from LevelManager import LevelManager
+from PlayerInput import PlayerInput
+
+class VecBreakout:
+    """
+    Many independent games stored as NumPy arrays, stepped all at once, e.g. to train a paddle bot.
+    Every game follows the same rules as a GameManager with a single ball and no modifiers:
+    the paddle moves and the ball is launched the same way as in GameManager.apply_input,
+    the ball bounces off the edges with edge_bounce, off the paddle with the angle of Ball.paddle_hit and off the first brick it overlaps,
+    in the same order as BrickGrid.query, and the level points are calculated the same way as in GameManager.calculate_score.
+    Since there are no modifiers, nothing in the games is random, so the games only differ by their actions.
+
+    There is one slot per game in each array, and the bricks are stored as the number of hits each cell of the brick grid has left,
+    so a step does the same number of NumPy operations no matter how many games there are.
+    A game that is lost is restarted at the end of the step, so every step can be done with an action for every game.
+
+    Attributes
+    ----------
+    MAX_POINTS : int
+        Maximum points for each level, the same as GameManager.MAX_POINTS.
+    MAX_BALL_SPEED : int
+        Speed cap for the ball, the same as GameManager.MAX_BALL_SPEED.
+    PADDLE_SPEED : int
+        The speed of the paddle in pixels per second, the same as Paddle.move.
+    PADDLE_WIDTH, PADDLE_HEIGHT : int
+        The size of the paddle.
+    BALL_RADIUS : int
+        The radius of the ball.
+    MAX_ANGLE : int
+        The maximum bounce angle off the paddle, in degrees.
+    BRICK_WIDTH, BRICK_HEIGHT : float
+        The size of the bricks.
+    BRICK_FIRST_ROW : int
+        The grid row of the first row of bricks.
+    BRICK_ROWS : int
+        The number of rows of bricks.
+    num_envs : int
+        The number of games.
+    window_size : int
+        The size of the game window.
+    dt : float
+        The time each step updates the games by, in seconds.
+    columns : int
+        The number of columns of bricks.
+    bricks_per_level : int
+        The number of bricks at the start of a level.
+    observation_size : int
+        The number of values in the observation of a game.
+    base_ball_speed, ball_speed_step, time_per_level, hit_multiplier_step : int
+        The level progression, taken from a LevelManager.
+    paddle_x : np.ndarray
+        The x-coordinate of the left edge of each paddle.
+    paddle_y : float
+        The y-coordinate of the top edge of the paddles.
+    ball_x, ball_y, ball_vx, ball_vy, ball_speed : np.ndarray
+        The position, velocity direction and speed of each ball.
+    ball_radius : np.ndarray
+        The radius of each ball.
+    ball_dead : np.ndarray
+        Flags for the balls that have escaped through the bottom edge.
+    death_disabled : np.ndarray
+        Flags for the balls that bounce off the bottom edge. Always False, since there are no modifiers.
+    bricks : np.ndarray
+        The number of hits each brick has left, with shape (num_envs, BRICK_ROWS, columns). 0 means there is no brick.
+    brick_count : np.ndarray
+        The number of bricks left in each game.
+    game_started : np.ndarray
+        Flags for the games whose ball has been launched.
+    lives : np.ndarray
+        The number of lives left in each game.
+    level, hit_multiplier, level_ball_speed, max_time, time_spent : np.ndarray
+        The state of the level manager of each game.
+    elapsed_time : np.ndarray
+        The time each game has been played for.
+    level_points : np.ndarray
+        The points of the current level of each game.
+    total_points : np.ndarray
+        The points of the cleared levels of each game.
+    last_score : np.ndarray
+        The score of the last game that was lost in each slot, or -1 if none has been lost yet.
+
+    Methods
+    -------
+    reset() -> np.ndarray
+        Restarts every game.
+    step(actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]
+        Updates every game by one step.
+    observe() -> np.ndarray
+        Returns the observation of every game.
+    """
+
+    MAX_POINTS = 100000
+    MAX_BALL_SPEED = 1500
+    PADDLE_SPEED = 300
+    PADDLE_WIDTH = 50
+    PADDLE_HEIGHT = 10
+    BALL_RADIUS = 5
+    MAX_ANGLE = 45
+    BRICK_WIDTH = 437 / 22
+    BRICK_HEIGHT = 7
+    BRICK_FIRST_ROW = 2
+    BRICK_ROWS = 8
+
+    def __init__(self, num_envs: int, window_size: int = 500, dt: float = 1 / 240, level_manager: LevelManager = None):
+        if num_envs <= 0:
+            raise ValueError("num_envs must be greater than 0")
+        if window_size <= 0:
+            raise ValueError("window_size must be greater than 0")
+        if dt <= 0:
+            raise ValueError("dt must be greater than 0")
+
+        self.num_envs = num_envs
+        self.window_size = window_size
+        self.dt = dt
+
+        # The same brick layout as GameManager.generate_bricks: one brick per grid cell, in rows 2 to 9
+        self.columns = math.ceil(window_size / BrickGrid.CELL_WIDTH)
+        self.bricks_per_level = self.BRICK_ROWS * self.columns
+
+        # Paddle x, ball x, y, vx, vy, whether the game has started, and the hits left of every brick
+        self.observation_size = 6 + self.bricks_per_level
+
+        # Only the progression of the level manager is used. The level state of each game is kept in the arrays.
+        if level_manager is None:
+            level_manager = LevelManager()
+        self.base_ball_speed = level_manager.base_ball_speed
+        self.ball_speed_step = level_manager.ball_speed_step
+        self.time_per_level = level_manager.time_per_level
+        self.hit_multiplier_step = level_manager.hit_multiplier_step
+
+        self.paddle_x = np.zeros(num_envs)
+        self.paddle_y = window_size - 20
+        self.ball_x = np.zeros(num_envs)
+        self.ball_y = np.zeros(num_envs)
+        self.ball_vx = np.zeros(num_envs)
+        self.ball_vy = np.zeros(num_envs)
+        self.ball_speed = np.zeros(num_envs)
+        self.ball_radius = np.full(num_envs, float(self.BALL_RADIUS))
+        self.ball_dead = np.zeros(num_envs, dtype=bool)
+        self.death_disabled = np.zeros(num_envs, dtype=bool)
+        self.bricks = np.zeros((num_envs, self.BRICK_ROWS, self.columns), dtype=np.int32)
+        self.brick_count = np.zeros(num_envs, dtype=np.int32)
+        self.game_started = np.zeros(num_envs, dtype=bool)
+        self.lives = np.zeros(num_envs, dtype=np.int32)
+        self.level = np.zeros(num_envs, dtype=np.int32)
+        self.hit_multiplier = np.zeros(num_envs, dtype=np.int32)
+        self.level_ball_speed = np.zeros(num_envs)
+        self.max_time = np.zeros(num_envs)
+        self.time_spent = np.zeros(num_envs)
+        self.elapsed_time = np.zeros(num_envs)
+        self.level_points = np.zeros(num_envs, dtype=np.int64)
+        self.total_points = np.zeros(num_envs, dtype=np.int64)
+        self.last_score = np.full(num_envs, -1, dtype=np.int64)
+
+        self.reset()
+
+    """
+    Restarts every game, the same as GameManager.reset_game_state: 3 lives, level 1, no points and a new wall of bricks.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    np.ndarray
+        The observation of every game, see observe.
+
+    Raises
+    ------
+    None
+    """
+    def reset(self) -> np.ndarray:
+        self.restart_games(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    """
+    Updates every game by one step with its action: the same as GameManager.step with the action as input.
+    Games that are lost in the step are restarted, and their observation is the first observation of the new game.
+
+    The reward of a game is the fraction of the level's bricks destroyed in the step,
+    plus the level points as a fraction of MAX_POINTS when the level is cleared, so a level is worth between 1 and 2,
+    depending on how fast it was cleared.
+
+    Parameters
+    ----------
+    actions : np.ndarray
+        The input of every game, as PlayerInput flags. LEFT and RIGHT move the paddle, and LAUNCH launches the ball.
+
+    Returns
+    -------
+    observation, reward, done : tuple[np.ndarray, np.ndarray, np.ndarray]
+        The observation of every game after the step (see observe), the reward of every game,
+        and flags for the games that were lost in the step.
+
+    Raises
+    ------
+    ValueError
+        If there is not one action per game.
+    """
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError("actions must have one action per game")
+
+        dt = self.dt
+
+        # Move the paddles if they are not at the edge of the screen, using the edges from before either move
+        paddle_left_edge = self.paddle_x.copy()
+        paddle_right_edge = self.paddle_x + self.PADDLE_WIDTH
+        left = ((actions & PlayerInput.LEFT) != 0) & self.game_started & (paddle_left_edge > 0)
+        right = ((actions & PlayerInput.RIGHT) != 0) & self.game_started & (paddle_right_edge < self.window_size)
+        self.paddle_x -= left * (self.PADDLE_SPEED * dt)
+        self.paddle_x += right * (self.PADDLE_SPEED * dt)
+
+        # Launch the balls straight up
+        launch = ((actions & PlayerInput.LAUNCH) != 0) & ~self.game_started
+        self.ball_vx[launch] = 0
+        self.ball_vy[launch] = -1
+        self.game_started |= launch
+
+        # Increase the time of the games that have started
+        self.elapsed_time += self.game_started * dt
+        self.time_spent += self.game_started * dt
+
+        # Move the balls. Balls that escaped in the last step cost a life.
+        self.ball_x += self.ball_speed * self.ball_vx * dt
+        self.ball_y += self.ball_speed * self.ball_vy * dt
+
+        dead = self.ball_dead.copy()
+        if dead.any():
+            self.lose_life(dead)
+
+        wall_hits, escaped = edge_bounce(self.ball_x, self.ball_y, self.ball_vx, self.ball_vy, self.ball_radius, self.death_disabled,
+                                         self.window_size)
+        self.ball_dead |= escaped
+
+        # Collisions with the paddle and the bricks
+        on_paddle = self.handle_paddle_collisions()
+        destroyed, cleared = self.handle_brick_collisions(~on_paddle)
+
+        # Level points banked by the games that cleared their level, from the level points of the last step
+        banked = np.where(cleared, self.level_points, 0)
+        if cleared.any():
+            self.win(cleared)
+
+        # Cap ball speed
+        np.minimum(self.ball_speed, self.MAX_BALL_SPEED, out=self.ball_speed)
+
+        self.level_points = self.calculate_score()
+
+        reward = destroyed / self.bricks_per_level + banked / self.MAX_POINTS
+
+        # Restart the lost games
+        done = self.lives <= 0
+        if done.any():
+            self.last_score[done] = self.total_points[done] + self.level_points[done]
+            self.restart_games(done)
+
+        return self.observe(), reward, done
+
+    """
+    Returns the observation of every game: the x-coordinate of the paddle's centre, the position and velocity of the ball,
+    whether the ball has been launched, and the fraction of hits left of every brick, row by row.
+    Positions are divided by the window size and velocities by MAX_BALL_SPEED.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    np.ndarray
+        The observations, with shape (num_envs, observation_size) and dtype float32.
+
+    Raises
+    ------
+    None
+    """
+    def observe(self) -> np.ndarray:
+        observation = np.empty((self.num_envs, self.observation_size), dtype=np.float32)
+        observation[:, 0] = (self.paddle_x + self.PADDLE_WIDTH / 2) / self.window_size
+        observation[:, 1] = self.ball_x / self.window_size
+        observation[:, 2] = self.ball_y / self.window_size
+        observation[:, 3] = self.ball_vx * self.ball_speed / self.MAX_BALL_SPEED
+        observation[:, 4] = self.ball_vy * self.ball_speed / self.MAX_BALL_SPEED
+        observation[:, 5] = self.game_started
+        observation[:, 6:] = (self.bricks / self.hit_multiplier[:, None, None]).reshape(self.num_envs, -1)
+        return observation
+
+    """
+    Bounces the balls that overlap their paddle, the same as GameManager.handle_paddle_collision and Ball.paddle_hit.
+    Balls that have not been launched are not bounced.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    np.ndarray
+        Flags for the balls that overlap their paddle. These balls are not checked against the bricks.
+
+    Raises
+    ------
+    None
+    """
+    def handle_paddle_collisions(self) -> np.ndarray:
+        radius = self.ball_radius
+        on_paddle = ((self.ball_x + radius >= self.paddle_x) & (self.ball_x - radius <= self.paddle_x + self.PADDLE_WIDTH) &
+                     (self.ball_y + radius >= self.paddle_y) & (self.ball_y - radius <= self.paddle_y + self.PADDLE_HEIGHT))
+        hit = on_paddle & ((self.ball_vy > 0) | (self.ball_vx > 0))
+
+        if hit.any():
+            # -1 is the far left edge of the paddle, +1 the far right edge and 0 the middle
+            paddle_midpoint = self.paddle_x[hit] + self.PADDLE_WIDTH / 2
+            paddle_position = (self.ball_x[hit] - paddle_midpoint) / (self.PADDLE_WIDTH / 2)
+            angle = 90 - self.MAX_ANGLE * paddle_position
+            angle_rad = np.radians(angle)
+
+            # Straight up if the angle is 0, the same as Ball.paddle_hit
+            straight = angle == 0
+            self.ball_vx[hit] = np.where(straight, 0, np.cos(angle_rad))
+            self.ball_vy[hit] = np.where(straight, -self.ball_speed[hit], -np.sin(angle_rad))
+
+        return on_paddle
+
+    """
+    Damages the first brick each ball overlaps and bounces the ball vertically, the same as GameManager.handle_brick_collision.
+    The cells the ball's bounding box overlaps are checked column by column, the same order as BrickGrid.query returns the bricks in,
+    so the same brick is hit as in a GameManager.
+
+    Parameters
+    ----------
+    active : np.ndarray
+        Flags for the balls to check.
+
+    Returns
+    -------
+    destroyed, cleared : tuple[np.ndarray, np.ndarray]
+        Flags for the games where a brick was destroyed, and for the games where it was the last brick.
+
+    Raises
+    ------
+    None
+    """
+    def handle_brick_collisions(self, active: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        cell_width = BrickGrid.CELL_WIDTH
+        cell_height = BrickGrid.CELL_HEIGHT
+        radius = self.ball_radius
+        left = self.ball_x - radius
+        right = self.ball_x + radius
+        top = self.ball_y - radius
+        bottom = self.ball_y + radius
+
+        # The range of grid cells the bounding boxes overlap, clipped to the grid
+        first_column = np.maximum(np.floor(left / cell_width), 0).astype(np.int64)
+        last_column = np.minimum(np.floor(right / cell_width), self.columns - 1).astype(np.int64)
+        first_row = np.maximum(np.floor(top / cell_height), 0).astype(np.int64)
+        last_row = np.minimum(np.floor(bottom / cell_height), self.BRICK_FIRST_ROW + self.BRICK_ROWS - 1).astype(np.int64)
+
+        envs = np.arange(self.num_envs)
+        hit = np.zeros(self.num_envs, dtype=bool)
+        hit_row = np.zeros(self.num_envs, dtype=np.int64)
+        hit_column = np.zeros(self.num_envs, dtype=np.int64)
+
+        # A bounding box overlaps at most this many columns and rows of cells
+        span_columns = int(2 * self.BALL_RADIUS // cell_width) + 2
+        span_rows = int(2 * self.BALL_RADIUS // cell_height) + 2
+
+        for column_offset in range(span_columns):
+            column = first_column + column_offset
+            for row_offset in range(span_rows):
+                row = first_row + row_offset
+                brick_row = row - self.BRICK_FIRST_ROW
+
+                candidate = active & ~hit & (column <= last_column) & (row <= last_row) & (brick_row >= 0)
+                hits_left = self.bricks[envs, np.clip(brick_row, 0, self.BRICK_ROWS - 1), np.clip(column, 0, self.columns - 1)]
+
+                brick_x = column * cell_width
+                brick_y = row * cell_height
+                overlap = ((right >= brick_x) & (left <= brick_x + self.BRICK_WIDTH) &
+                           (bottom >= brick_y) & (top <= brick_y + self.BRICK_HEIGHT))
+
+                new_hit = candidate & (hits_left > 0) & overlap
+                hit |= new_hit
+                hit_row[new_hit] = brick_row[new_hit]
+                hit_column[new_hit] = column[new_hit]
+
+        destroyed = np.zeros(self.num_envs, dtype=bool)
+        if hit.any():
+            # Damage the bricks and bounce the balls
+            hit_envs = envs[hit]
+            self.bricks[hit_envs, hit_row[hit], hit_column[hit]] -= 1
+            self.ball_vy[hit] = -self.ball_vy[hit]
+
+            destroyed[hit_envs] = self.bricks[hit_envs, hit_row[hit], hit_column[hit]] == 0
+            self.brick_count -= destroyed
+
+        return destroyed, destroyed & (self.brick_count == 0)
+
+    """
+    Calculates the level points of every game, the same as GameManager.calculate_score.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    np.ndarray
+        The level points.
+
+    Raises
+    ------
+    None
+    """
+    def calculate_score(self) -> np.ndarray:
+        score = np.round(self.MAX_POINTS * (1 - (self.time_spent / self.max_time))).astype(np.int64)
+        return np.maximum(score, 0)
+
+    """
+    Takes a life from the given games and puts a new ball on their paddle, the same as GameManager.reset when a ball is lost.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Flags for the games that lost a life.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def lose_life(self, mask: np.ndarray) -> None:
+        self.lives -= mask
+        self.reset_objects(mask)
+
+    """
+    Moves the given games to the next level, the same as GameManager.win: the level points are added to the total points,
+    the level manager increases the level, and a new wall of bricks, paddle and ball are created.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Flags for the games that cleared their level.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def win(self, mask: np.ndarray) -> None:
+        self.total_points += np.where(mask, self.level_points, 0)
+
+        # The same as LevelManager.increase_level
+        self.level += mask
+        self.hit_multiplier += mask * self.hit_multiplier_step
+        self.level_ball_speed += mask * self.ball_speed_step
+        self.max_time += mask * self.time_per_level
+        self.time_spent[mask] = 0
+
+        self.reset_bricks(mask)
+        self.reset_objects(mask)
+
+    """
+    Restarts the given games, the same as GameManager.reset_game_state followed by new objects.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Flags for the games to restart.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def restart_games(self, mask: np.ndarray) -> None:
+        self.lives[mask] = 3
+        self.elapsed_time[mask] = 0
+        self.total_points[mask] = 0
+        self.level_points[mask] = self.MAX_POINTS
+
+        # The same as LevelManager.reset
+        self.level[mask] = 1
+        self.hit_multiplier[mask] = 1
+        self.level_ball_speed[mask] = self.base_ball_speed + self.ball_speed_step
+        self.max_time[mask] = self.time_per_level
+        self.time_spent[mask] = 0
+
+        self.reset_bricks(mask)
+        self.reset_objects(mask)
+
+    """
+    Creates a new wall of bricks in the given games, the same as GameManager.generate_bricks.
+    The durability of the bricks is the hit multiplier of the game's level.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Flags for the games to create bricks for.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def reset_bricks(self, mask: np.ndarray) -> None:
+        self.bricks[mask] = self.hit_multiplier[mask, None, None]
+        self.brick_count[mask] = self.bricks_per_level
+
+    """
+    Puts the paddle of the given games back in the middle and a new ball on it, the same as GameManager.generate_objects.
+    The ball gets the ball speed of the game's level, and waits to be launched.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Flags for the games to reset the paddle and ball of.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    None
+    """
+    def reset_objects(self, mask: np.ndarray) -> None:
+        self.paddle_x[mask] = self.window_size / 2 - self.PADDLE_WIDTH / 2
+        self.ball_x[mask] = self.window_size / 2
+        self.ball_y[mask] = self.paddle_y - self.BALL_RADIUS
+        self.ball_vx[mask] = 0
+        self.ball_vy[mask] = 0
+        self.ball_speed[mask] = self.level_ball_speed[mask]
+        self.ball_dead[mask] = False
+        self.game_started[mask] = False
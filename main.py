@@ -1,158 +1,117 @@
 import pygame
 from GameManager import GameManager
-from Modifier import Modifier
-from datetime import timedelta
-from collections import defaultdict
-import math
+from Modifier import create_default_modifiers
+from PlayerInput import PlayerInput
+from FixedTimestep import FixedTimestep
+from FrameSnapshot import FrameSnapshot
+from BrickLayer import BrickLayer
+from TextCache import TextCache
+from Hud import Hud
+from SimulationThread import SimulationThread
+from Replay import ReplayRecorder
+from Controller import Autopilot
 from pathlib import Path
+from datetime import datetime
+import argparse
 import json
+import random
+import threading
 
 # Get highscores.json file path.
 HIGHSCORES_PATH = Path(__file__).resolve().parent / "highscores.json"
 
+# Folder the replays of finished games are saved to.
+REPLAYS_PATH = Path(__file__).resolve().parent / "replays"
+
 class Main:
     
-    def __init__(self):
+    def __init__(self, dirty_rendering=False, threaded=False, controller=None):
 
         self.game_manager = None   # Initialises in setup method.
         self.window_size = 500   # Size of the window in pixels.
         self.canvas = None   # Initialises in main method.
         self.exit = False   # Main loop exit flag.
-        self.fps_list = []   # List to store FPS values for the last 30 frames.
+        self.step_rate = 240   # Number of simulation steps per second. Rendering runs at whatever rate the display allows.
+        self.timestep = FixedTimestep(self.step_rate)   # Turns frame times into fixed simulation steps.
+        self.frame_dt = 0.02   # Time the last frame took. Set to 0.02 to avoid division by zero error when calculating FPS.
+        self.keys = None   # Keys pressed this frame. Updated in handle_events.
+        self.previous_frame = None   # Positions before the last simulation step, used for interpolation.
+        self.current_frame = None   # Positions after the last simulation step, used for interpolation.
+        self.frame = None   # Interpolated positions that are drawn this frame.
+        self.brick_layer = None   # Pre-rendered bricks. Initialises in setup method.
+        self.text_cache = TextCache('freesansbold.ttf')   # Loaded fonts and rendered text, shared by all text on screen.
+        self.hud = Hud(self.text_cache, self.window_size)   # Top bar and active modifier list.
+        self.dirty_rendering = dirty_rendering   # If True, only the parts of the screen that changed are redrawn and presented, instead of the whole screen.
+        self.drawn_rects = []   # Areas of the canvas drawn to this frame (paddle, balls, modifiers and text).
+        self.previous_rects = None   # Areas drawn to last frame, which have to be cleared. None if the whole screen has to be redrawn.
+        self.threaded = threaded   # If True, the game is updated on its own thread and this thread only handles input and drawing.
+        self.simulation = None   # Thread that updates the game in threaded mode. Initialises in main method.
+        self.game_lock = threading.Lock()   # Held while the game is changed, so the simulation thread and this thread do not change it at once.
+        self.recorder = None   # Records the current game, so it can be replayed. Initialises in start_recording method.
+        self.controller = controller   # If set, e.g. to an Autopilot, the controller plays the game instead of the keyboard.
 
     # Will initialise the beginning of the game, create all essential objects etc.
     def setup(self):
 
-        # Initialise modifiers
-        modifiers = []
-        modifiers.append(Modifier("Fast Ball", "negative", duration=5))
-        modifiers.append(Modifier("Wide Paddle", "positive", duration=10))
-        modifiers.append(Modifier("Extra Ball", "positive"))
-        modifiers.append(Modifier("Extravaganza", "special", duration=5))
-        modifiers.append(Modifier("Extra Brick Row", "negative"))
+        # Initialise game manager. The modifiers are created when the recording starts.
+        self.game_manager = GameManager([], self.window_size)
 
-        # Initialise game manager
-        self.game_manager = GameManager(modifiers, self.window_size)
+        # Seed the game and start recording it
+        self.start_recording()
 
         # Set up initial game state
         self.game_manager.generate_bricks()
         self.game_manager.generate_objects()
 
+        # Initialise the brick layer, which also holds the black background
+        self.brick_layer = BrickLayer((self.window_size, self.window_size))
+
     def draw(self):
-        self.canvas.fill((0, 0, 0))
+        # Interpolate the positions of moving objects between the last two simulation steps
+        if self.simulation is not None:
+            # Draw from the snapshots published by the simulation thread, the game itself is not read
+            previous_frame, current_frame, alpha = self.simulation.latest()
+            self.frame = current_frame.interpolate(previous_frame, alpha)
+        elif self.previous_frame is not None and self.current_frame is not None:
+            self.frame = self.current_frame.interpolate(self.previous_frame, self.timestep.alpha)
+        else:
+            self.frame = FrameSnapshot.capture(self.game_manager)
 
         # Draw game elements (Bricks, paddle, balls, etc.)
         self.draw_game_elements()
 
-        # Draw UI text at the top of the screen
-        self.draw_top_ui()
-
-        # Draw modifier information
-        self.draw_modifier_info()
+        # Draw UI text at the top of the screen and modifier information.
+        # Only the text that changed since the last frame is rendered again.
+        self.hud.update(self.frame, self.frame_dt)
+        self.drawn_rects.extend(self.hud.draw(self.canvas))
 
         # Draw big level text if new level is reached
-        if self.game_manager.level_manager.time_spent == 0:
+        if self.frame.time_spent == 0:
             self.draw_level_text()
 
-        pygame.display.flip()
-
-    def draw_top_left_info(self):
-        font = pygame.font.Font('freesansbold.ttf', 12)
-
-        # Create level info
-        level_text = font.render(f'Level: {self.game_manager.level_manager.current_level}', True, "white")
-        level_rect = level_text.get_rect()
-        level_rect.topleft = (5, 4)
-
-        # Create lives info
-        lives_text = font.render(f'Lives: {self.game_manager.lives}', True, "white")
-        lives_rect = lives_text.get_rect()
-        lives_rect.center = (self.window_size / 4, 11)
-
-        self.canvas.blit(lives_text, lives_rect)
-        self.canvas.blit(level_text, level_rect)
-
-    def draw_top_right_info(self):
-        # Calculate FPS using average from last 30 frames
-        self.fps_list.append(1 / self.game_manager.dt)
-        if len(self.fps_list) > 30:
-            self.fps_list.pop(0)
-        fps = round(sum(self.fps_list) / len(self.fps_list), 1)
-
-        font = pygame.font.Font('freesansbold.ttf', 12)
-
-        # Format time from seconds (elapsed_time)
-        formatted_time = str(timedelta(seconds=math.floor(self.game_manager.elapsed_time))).removeprefix('0:')
-
-        # Create FPS text
-        fps_text = font.render(f'FPS: {fps}', True, "white")
-        fps_rect = fps_text.get_rect()
-        fps_rect.center = (self.window_size / 4 * 3, 11)
-
-        # Create timer
-        timer = font.render(f'{formatted_time}', True, "white")
-        timer_rect = timer.get_rect()
-        timer_rect.topright = (self.window_size - 5, 4)
-
-        self.canvas.blit(timer, timer_rect)
-        self.canvas.blit(fps_text, fps_rect)
-
-    def draw_score_info(self):
-        font = pygame.font.Font('freesansbold.ttf', 12)
-        score_text = font.render(str(self.game_manager.level_points + self.game_manager.total_points), True, "white")
-        score_rect = score_text.get_rect()
-        score_rect.center = (self.window_size / 2, 11)
-        self.canvas.blit(score_text, score_rect)
-
-    def draw_top_ui(self):
-
-        # Draw top left info (level and lives)
-        self.draw_top_left_info()
-
-        # Draw top right info (FPS and timer)
-        self.draw_top_right_info()
+        if self.dirty_rendering and self.previous_rects is not None:
+            # Present only the areas that were cleared or drawn to this frame
+            pygame.display.update(self.previous_rects + self.brick_layer.dirty_rects + self.drawn_rects)
+        else:
+            pygame.display.flip()
 
-        # Draw score info
-        self.draw_score_info()
+        self.previous_rects = self.drawn_rects
 
     def draw_level_text(self):
         # Big level text
-        font = pygame.font.Font('freesansbold.ttf', 50)
-        level_text = font.render(f'Level {self.game_manager.level_manager.current_level}', True, "white")
+        level_text = self.text_cache.render(f'Level {self.frame.level}', 50, "white")
         level_rect = level_text.get_rect()
         level_rect.center = (self.window_size / 2, self.window_size / 2)
-        self.canvas.blit(level_text, level_rect)
+        self.drawn_rects.append(self.canvas.blit(level_text, level_rect))
 
         # Small text below
-        small_font = pygame.font.Font('freesansbold.ttf', 15)
-        small_text = small_font.render('Press up to start', True, "white")
+        small_text = self.text_cache.render('Press up to start', 15, "white")
         small_rect = small_text.get_rect()
         small_rect.center = (self.window_size / 2, self.window_size / 2 + 40)
-        self.canvas.blit(small_text, small_rect)
-
-    def draw_modifier_info(self):
-        font = pygame.font.Font('freesansbold.ttf', 12)
-
-        # Group active modifiers by their name using a defaultdict
-        modifier_counts = defaultdict(list)
-        for modifier in self.game_manager.active_modifiers:
-            modifier_counts[modifier.name].append(modifier)
-
-        # Iterate through each modifier type and display its info
-        for i, (name, modifiers) in enumerate(modifier_counts.items()):
-            count = len(modifiers)   # Number of active instances of the modifier
-            time_remaining = min(mod.time_remaining for mod in modifiers)   # Shortest remaining time
-
-            # Format the display name, showing count if there is more than 1
-            display_name = f'{name} (x{count})' if count > 1 else name
-
-            # Create the text with the display name and time remaining
-            modifier_text = font.render(f'{display_name}: {time_remaining:.1f}s', True, "white")
-            modifier_rect = modifier_text.get_rect()
-            modifier_rect.bottomleft = (10, 150 + i * 15)
-            self.canvas.blit(modifier_text, modifier_rect)
+        self.drawn_rects.append(self.canvas.blit(small_text, small_rect))
 
     def draw_game_elements(self):
+        self.drawn_rects = []
 
         # Draw bricks
         self.draw_bricks()
@@ -167,31 +126,52 @@ class Main:
         self.draw_dropped_modifiers()
 
     def draw_bricks(self):
-        for brick in self.game_manager.bricks:
-            # Create a brick with transparency based on durability
-            surface = pygame.Surface((brick.width, brick.height))
-            surface.fill(brick.color)
-            surface.set_alpha(255 * ((brick.durability - brick.hits) / brick.durability))
-            self.canvas.blit(surface, (brick.x, brick.y))
+        # Redraw the bricks that changed since the last frame.
+        # In threaded mode the bricks come from the snapshot, since the grid can change while it is drawn.
+        if self.frame.bricks is not None:
+            self.brick_layer.update_from_snapshot(self.frame.bricks)
+        else:
+            self.brick_layer.update(self.game_manager.bricks)
+
+        if self.dirty_rendering and self.previous_rects is not None:
+            # Only copy the layer where objects were drawn last frame, and where bricks changed
+            for rect in self.previous_rects + self.brick_layer.dirty_rects:
+                self.canvas.blit(self.brick_layer.surface, rect, rect)
+        else:
+            # Draw the whole layer. The layer covers the whole canvas, so this also clears the previous frame.
+            self.canvas.blit(self.brick_layer.surface, (0, 0))
 
     def draw_paddle(self):
-        # Draw a white paddle based on the paddle object's attributes
-        pygame.draw.rect(self.canvas, "white", pygame.Rect(
-            self.game_manager.paddle.x,
-            self.game_manager.paddle.y,
-            self.game_manager.paddle.width,
-            self.game_manager.paddle.height
-        ))
+        # Draw a white paddle at its interpolated position
+        self.drawn_rects.append(pygame.draw.rect(self.canvas, "white", pygame.Rect(*self.frame.paddle)))
 
     def draw_balls(self):
-        # Draw all balls in the game
-        for ball in self.game_manager.balls:
-            pygame.draw.circle(self.canvas, "white", ball.pos, ball.radius)
+        # Draw all balls in the game at their interpolated positions
+        for x, y, radius in self.frame.balls.values():
+            self.drawn_rects.append(pygame.draw.circle(self.canvas, "white", (x, y), radius))
 
     def draw_dropped_modifiers(self):
-        # Draw all dropped (falling) modifiers in the game
-        for modifier in self.game_manager.dropped_modifiers:
-            pygame.draw.circle(self.canvas, modifier.color, (modifier.x, modifier.y), modifier.radius)
+        # Draw all dropped (falling) modifiers in the game at their interpolated positions
+        for x, y, radius, color in self.frame.modifiers.values():
+            self.drawn_rects.append(pygame.draw.circle(self.canvas, color, (x, y), radius))
+
+    # Seeds the game with a new seed and starts recording it. Called when a new game starts.
+    # The game is seeded the same way as a headless game, so a ReplayPlayer can play it again from the seed.
+    def start_recording(self):
+        seed = random.randrange(2 ** 64)
+        self.game_manager.random.seed(seed)
+        self.game_manager.modifiers = create_default_modifiers(self.game_manager.random)
+        self.recorder = ReplayRecorder(seed, self.window_size)
+
+    # Saves the replay of the current game, named after the time it was saved and its seed.
+    def save_replay(self):
+        if self.recorder is None or self.recorder.frames == 0:
+            return
+
+        REPLAYS_PATH.mkdir(exist_ok=True)
+        path = REPLAYS_PATH / f'{datetime.now():%Y%m%d-%H%M%S}-{self.recorder.seed:016x}.replay'
+        self.recorder.save(path, self.game_manager.total_points)
+        self.recorder = None
 
     def get_highscores(self):
         with open(HIGHSCORES_PATH, 'r', encoding='utf-8') as f:
@@ -225,6 +205,7 @@ class Main:
         self.game_manager.sound_manager.stop_music()
 
         self.canvas.fill('black')
+        self.previous_rects = None   # The whole screen has to be redrawn when the game is restarted
         
         # Display game over text and restart hint
         self.display_gameover_text()
@@ -235,14 +216,11 @@ class Main:
         pygame.display.flip()
 
     def display_gameover_text(self):
-        font = pygame.font.Font('freesansbold.ttf', 30)
-        small_font = pygame.font.Font('freesansbold.ttf', 15)
-
-        text = font.render(f'Game Over. Score: {self.game_manager.total_points}', True, 'red')
+        text = self.text_cache.render(f'Game Over. Score: {self.game_manager.total_points}', 30, 'red')
         text_rect = text.get_rect()
         text_rect.center = (self.window_size / 2, self.window_size / 2 - 100)
 
-        restart_text = small_font.render('Press Space to restart', True, 'white')
+        restart_text = self.text_cache.render('Press Space to restart', 15, 'white')
         restart_text_rect = restart_text.get_rect()
         restart_text_rect.center = (self.window_size / 2, self.window_size / 2 - 65)
 
@@ -251,23 +229,19 @@ class Main:
 
     def display_highscores(self):
 
-        # Create fonts
-        title_font = pygame.font.Font('freesansbold.ttf', 20)
-        font = pygame.font.Font('freesansbold.ttf', 15)
-
         # Get highscores from json file
         highscores = self.get_highscores()
         sorted_highscores = sorted(highscores.items(), key=lambda i: i[1], reverse=True)
 
         # Create highscores title text
-        title = title_font.render('Highscores:', True, 'white')
+        title = self.text_cache.render('Highscores:', 20, 'white')
         title_rect = title.get_rect()
         title_rect.center = (self.window_size / 2, self.window_size / 2 - 30)
         self.canvas.blit(title, title_rect)
 
         # Display a list of the top 5 scores
         for i, (name, score) in enumerate(sorted_highscores):
-            line = font.render(f'{i+1}. {name}: {score}', True, 'white')
+            line = self.text_cache.render(f'{i+1}. {name}: {score}', 15, 'white')
             rect = line.get_rect()
             rect.center = (self.window_size / 2, self.window_size / 2 + i * 20)
             self.canvas.blit(line, rect)
@@ -275,19 +249,19 @@ class Main:
     def get_name(self):
         name = ''
         active = True
-        font = pygame.font.Font('freesansbold.ttf', 20)
 
         while active:
             self.canvas.fill('black')
+            self.previous_rects = None   # The whole screen has to be redrawn when the game is restarted
 
             # Display name prompt
-            prompt = font.render('New Highscore! Enter your name:', True, 'white')
+            prompt = self.text_cache.render('New Highscore! Enter your name:', 20, 'white')
             prompt_rect = prompt.get_rect()
             prompt_rect.center = (self.window_size / 2, self.window_size / 2 - 20)
             self.canvas.blit(prompt, prompt_rect)
 
             # Draw typing area
-            name_surface = font.render(name + '|', True, 'white')
+            name_surface = self.text_cache.render(name + '|', 20, 'white')
             name_surface_rect = name_surface.get_rect()
             name_surface_rect.center = (self.window_size / 2, self.window_size / 2)
             self.canvas.blit(name_surface, name_surface_rect)
@@ -328,6 +302,11 @@ class Main:
  
         # SETUP GAME OBJECTS
         self.setup()
+
+        # Start updating the game on its own thread in threaded mode
+        if self.threaded:
+            self.simulation = SimulationThread(self.game_manager, self.react_to_user_input, self.step_rate, lock=self.game_lock)
+            self.simulation.start()
  
         # GAME LOOP
         while not self.exit:
@@ -335,26 +314,64 @@ class Main:
             # Handle game over state
             if self.game_manager.lost_game:
 
-                # If the game is over, check if the player has entered their name
-                # If not, handle the endgame logic
-                if not self.game_manager.name_entered:
-                    self.handle_endgame()
+                # The simulation thread does not update a game that is over, but it can still be finishing its last step
+                with self.game_lock:
+
+                    # If the game is over, check if the player has entered their name
+                    # If not, handle the endgame logic
+                    if not self.game_manager.name_entered:
+                        self.save_replay()
+                        self.handle_endgame()
+                        continue
+
+                    # If the player has entered their name, display the end screen
+                    self.display_endscreen()
+                    self.handle_events()
+                    self.react_to_user_input(self.keys)
+
+                    # A new game was started
+                    if not self.game_manager.lost_game:
+                        self.start_recording()
                     continue
-                
-                # If the player has entered their name, display the end screen
-                self.display_endscreen()
-                self.handle_events()
-                continue
-            
-            # Update the game state and draw the game
-            self.game_manager.update()
-            self.draw()
 
-            # Handle events and user input
+            # Handle events and get the pressed keys
             self.handle_events()
 
-            pygame.display.update()
-            self.game_manager.dt = clock.tick(999) / 1000   # Frame rate capped at 999 FPS
+            if self.simulation is not None:
+                # The simulation thread updates the game, using the keys pressed in the latest frame
+                self.simulation.keys = self.keys
+            else:
+                # Update the game state in fixed steps, using the pressed keys in every step
+                steps = self.timestep.advance(self.frame_dt)
+                for step in range(steps):
+                    # Keep the positions before the last step for interpolation
+                    if step == steps - 1:
+                        self.previous_frame = FrameSnapshot.capture(self.game_manager)
+
+                    self.game_manager.dt = self.timestep.step_dt
+                    self.react_to_user_input(self.keys)
+                    self.game_manager.update()
+
+                    # Stop once the game is lost. The replay does not record the steps of a game that is over,
+                    # and the time left in this frame must not be simulated when a new game starts.
+                    if self.game_manager.lost_game:
+                        self.timestep.reset()
+                        break
+
+                if steps > 0:
+                    self.current_frame = FrameSnapshot.capture(self.game_manager)
+
+            # Draw the game (draw presents the frame, so the display does not have to be updated again)
+            self.draw()
+
+            self.frame_dt = clock.tick(999) / 1000   # Frame rate capped at 999 FPS
+
+        # Stop the simulation thread
+        if self.simulation is not None:
+            self.simulation.stop()
+
+        # Save the replay of a game that was not finished
+        self.save_replay()
                 
     # Runs every frame. What will happen each frame
     def handle_events(self):
@@ -362,39 +379,30 @@ class Main:
             if event.type == pygame.QUIT:
                 self.exit = True
  
-        keys = pygame.key.get_pressed()
- 
-        self.react_to_user_input(keys)
+        self.keys = pygame.key.get_pressed()
 
     def react_to_user_input(self, keysPressed):
-        # Get the x-coordinates for the paddle edges
-        paddle_left_edge = self.game_manager.paddle.x
-        paddle_right_edge = self.game_manager.paddle.x + self.game_manager.paddle.width
-
-        if keysPressed[pygame.K_a] or keysPressed[pygame.K_LEFT]:
-            if self.game_manager.game_started:
-                # Move paddle if it is not at the edge of the screen
-                if paddle_left_edge > 0:
-                    self.game_manager.paddle.move('left', self.game_manager.dt)
-
-        if keysPressed[pygame.K_d] or keysPressed[pygame.K_RIGHT]:
-            if self.game_manager.game_started:
-                # Move paddle if it is not at the edge of the screen
-                if paddle_right_edge < self.window_size:
-                    self.game_manager.paddle.move('right', self.game_manager.dt)
-
-        if keysPressed[pygame.K_w] or keysPressed[pygame.K_UP]:
-            if not self.game_manager.game_started:
-                # Start game
-                self.game_manager.balls[0].begin()
-                self.game_manager.game_started = True
-
-        if keysPressed[pygame.K_SPACE]:
-            # Restart game
-            self.game_manager.reset(restart_game=True)
+        if self.controller is not None:
+            inputs = self.controller.get_input(self.game_manager)
+        else:
+            inputs = PlayerInput.from_keys(keysPressed)
+
+        # Record the input of every update of the game. Input on the end screen is not part of the game.
+        if self.recorder is not None and not self.game_manager.lost_game:
+            self.recorder.record(self.game_manager.dt, inputs)
+
+        # Move the paddle, start or restart the game based on the pressed keys
+        self.game_manager.apply_input(inputs)
  
  
  
-main = Main()
+# Read the options from the command line
+parser = argparse.ArgumentParser(description="Breakout game.")
+parser.add_argument("--dirty-rendering", action="store_true", help="Only redraw and present the parts of the screen that changed")
+parser.add_argument("--threaded", action="store_true", help="Update the game on its own thread, separate from input and drawing")
+parser.add_argument("--autopilot", action="store_true", help="Let the autopilot play the game, starting a new game when one is lost")
+args = parser.parse_args()
+
+main = Main(dirty_rendering=args.dirty_rendering, threaded=args.threaded, controller=Autopilot(restart=True) if args.autopilot else None)
  
 main.main()
\ No newline at end of file
@@ -0,0 +1,37 @@
+import math
+from Ball import Ball
+from BallCollider import BallCollider
+
+
+def test_head_on_collision_reverses_directions_and_keeps_speeds():
+    ball = Ball(100, 100, 1, 0, 5, "white", speed=400)
+    other = Ball(108, 100, -1, 0, 5, "white", speed=300)
+
+    assert BallCollider().resolve(ball, other)
+
+    # Both balls bounce straight back, each at its own speed
+    assert (ball.vx, ball.vy, ball.speed) == (-1, 0, 400)
+    assert (other.vx, other.vy, other.speed) == (1, 0, 300)
+
+    # The balls are pushed apart until they touch
+    assert math.isclose(other.x - ball.x, ball.radius + other.radius)
+
+
+def test_ball_hit_from_the_side_keeps_moving():
+    # The first ball moves straight at the second, which moves across the line between them.
+    # Swapping the velocity components along that line would stop the first ball.
+    ball = Ball(100, 108, 0, -1, 5, "white", speed=400)
+    other = Ball(100, 100, 1, 0, 5, "white", speed=400)
+
+    assert BallCollider().resolve(ball, other)
+
+    assert (ball.vx, ball.vy, ball.speed) == (0, 1, 400)
+    assert (other.vx, other.vy, other.speed) == (1, 0, 400)
+
+
+def test_separating_balls_do_not_bounce():
+    ball = Ball(100, 100, -1, 0, 5, "white", speed=400)
+    other = Ball(108, 100, 1, 0, 5, "white", speed=400)
+
+    assert not BallCollider().resolve(ball, other)
+    assert (ball.vx, other.vx) == (-1, 1)